@@ -0,0 +1,12 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for elephant.
+
+The benchmarks follow the conventions of airspeed velocity (asv): methods
+starting with `time_` are timed and methods starting with `peakmem_` have
+their peak memory use measured.  They can be run with asv, or without it
+with `python -m benchmarks`.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Run the benchmarks without asv.
+
+Usage::
+
+    $ python -m benchmarks [--sizes small medium] [--filter regex] [--json]
+
+Every `time_` method is run `--repeat` times and the best wall time is
+reported.  For every `peakmem_` method, the peak memory allocated through
+Python during one call is reported, as measured by `tracemalloc`.  Only
+the standard library is needed, so this works offline.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import argparse
+import importlib
+import itertools
+import json
+import re
+import timeit
+import tracemalloc
+
+from .generate import SIZE_NAMES
+
+# The benchmark modules, relative to this package.
+MODULES = ['bench_conversion', 'bench_statistics', 'bench_neo_tools',
+           'bench_pandas_bridge', 'bench_spike_train_generation',
+           'bench_import']
+
+
+def iter_benchmarks(sizes):
+    """Yield the name, parameters, and bound method of every benchmark.
+
+    Only parameter combinations with a `size` in `sizes` are included.
+    """
+    for modname in MODULES:
+        module = importlib.import_module('.' + modname, __package__)
+        for clsname, cls in sorted(vars(module).items()):
+            if not isinstance(cls, type) or not hasattr(cls, 'params'):
+                continue
+            params = cls.params
+            if len(cls.param_names) == 1:
+                params = [params]
+            for args in itertools.product(*params):
+                if 'size' in cls.param_names:
+                    if args[cls.param_names.index('size')] not in sizes:
+                        continue
+                methods = sorted(name for name in dir(cls)
+                                 if name.startswith(('time_', 'peakmem_')))
+                yield modname, clsname, cls, args, methods
+
+
+def run_benchmark(instance, name, args, repeat=3):
+    """Run one benchmark method and return its result.
+
+    The result is the best time in seconds for `time_` methods and the
+    peak allocated memory in bytes for `peakmem_` methods.
+    """
+    func = getattr(instance, name)
+    if name.startswith('time_'):
+        return min(timeit.repeat(lambda: func(*args), number=1,
+                                 repeat=repeat))
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', nargs='+', default=['small', 'medium'],
+                        choices=SIZE_NAMES,
+                        help='the data sizes to run (default small medium)')
+    parser.add_argument('--filter', default='',
+                        help='only run benchmarks whose full name matches '
+                             'this regular expression')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='the number of times to run each time_ '
+                             'benchmark (default 3)')
+    parser.add_argument('--json', action='store_true',
+                        help='print the results as JSON')
+    opts = parser.parse_args(argv)
+
+    pattern = re.compile(opts.filter)
+    results = []
+    for modname, clsname, cls, args, methods in iter_benchmarks(opts.sizes):
+        methods = [name for name in methods if pattern.search(
+            '.'.join([modname, clsname, name]))]
+        if not methods:
+            continue
+        instance = cls()
+        try:
+            # like asv, `setup` is optional
+            getattr(instance, 'setup', lambda *args: None)(*args)
+        except NotImplementedError:
+            continue
+        for name in methods:
+            value = run_benchmark(instance, name, args, repeat=opts.repeat)
+            result = {'name': '.'.join([modname, clsname, name]),
+                      'params': list(args),
+                      'value': value,
+                      'unit': 's' if name.startswith('time_') else 'bytes'}
+            results.append(result)
+            if not opts.json:
+                print('%-70s %-16s %12.6g %s' % (
+                    result['name'], ','.join(str(arg) for arg in args),
+                    value, result['unit']))
+
+    if opts.json:
+        print(json.dumps(results, indent=1))
+
+
+if __name__ == '__main__':
+    main()
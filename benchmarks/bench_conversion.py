@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for elephant.conversion.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import quantities as pq
+
+from elephant.conversion import binarize
+from elephant.neo_tools import get_all_spiketrains
+
+from .generate import SIZE_NAMES, get_block
+
+
+class Binarize(object):
+    params = SIZE_NAMES
+    param_names = ['size']
+
+    def setup(self, size):
+        self.spiketrain = get_all_spiketrains(get_block(size))[0]
+        self.times = self.spiketrain.magnitude
+
+    def time_binarize(self, size):
+        binarize(self.spiketrain, sampling_rate=1000 * pq.Hz)
+
+    def time_binarize_return_times(self, size):
+        binarize(self.spiketrain, sampling_rate=1000 * pq.Hz,
+                 return_times=True)
+
+    def time_binarize_array(self, size):
+        binarize(self.times, sampling_rate=1000.)
+
+    def peakmem_binarize(self, size):
+        binarize(self.spiketrain, sampling_rate=1000 * pq.Hz)
+
+
+class SmallTrainBinarize(object):
+    """Trains of a few spikes, where handling units dominates the time."""
+
+    params = [1, 10, 100]
+    param_names = ['n_spikes']
+
+    def setup(self, n_spikes):
+        train = get_all_spiketrains(get_block('medium'))[0]
+        self.spiketrain = train[:n_spikes]
+        self.times = self.spiketrain.magnitude
+
+    def time_binarize(self, n_spikes):
+        binarize(self.spiketrain, sampling_rate=1 * pq.kHz)
+
+    def time_binarize_rescale(self, n_spikes):
+        binarize(self.spiketrain, sampling_rate=1 * pq.kHz,
+                 t_start=100 * pq.ms, t_stop=5000 * pq.ms)
+
+    def time_binarize_array(self, n_spikes):
+        binarize(self.times, sampling_rate=1000., t_start=0., t_stop=10.)
+
+    def peakmem_binarize(self, n_spikes):
+        binarize(self.spiketrain, sampling_rate=1 * pq.kHz)
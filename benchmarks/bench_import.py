@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the import time of elephant.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import subprocess
+import sys
+
+
+class Import(object):
+    """Import a module in a new interpreter, so nothing is cached."""
+
+    params = ['elephant', 'elephant.statistics']
+    param_names = ['module']
+
+    def time_import(self, module):
+        subprocess.check_call([sys.executable, '-c', 'import ' + module])
+
+    def time_import_baseline(self, module):
+        """Starting the interpreter alone, as a lower bound."""
+        subprocess.check_call([sys.executable, '-c', 'pass'])
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for elephant.neo_tools.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+from elephant.neo_tools import (extract_neo_attrs, get_all_epochs,
+                                get_all_events, get_all_spiketrains,
+                                neo_to_snapshot)
+
+from .generate import SIZE_NAMES, get_block, nest
+
+
+class Traversal(object):
+    params = (SIZE_NAMES, [1, 4])
+    param_names = ['size', 'depth']
+
+    def setup(self, size, depth):
+        self.container = nest([get_block(size)], depth)
+
+    def time_get_all_spiketrains(self, size, depth):
+        get_all_spiketrains(self.container)
+
+    def time_get_all_spiketrains_lazy(self, size, depth):
+        get_all_spiketrains(self.container, lazy=True)
+
+    def time_get_all_events(self, size, depth):
+        get_all_events(self.container)
+
+    def time_get_all_epochs(self, size, depth):
+        get_all_epochs(self.container)
+
+    def peakmem_get_all_spiketrains(self, size, depth):
+        get_all_spiketrains(self.container)
+
+    def peakmem_get_all_events(self, size, depth):
+        get_all_events(self.container)
+
+    def peakmem_get_all_epochs(self, size, depth):
+        get_all_epochs(self.container)
+
+
+class ExtractNeoAttrs(object):
+    params = SIZE_NAMES
+    param_names = ['size']
+
+    def setup(self, size):
+        self.block = get_block(size)
+        self.spiketrains = get_all_spiketrains(self.block)
+
+    def time_extract_neo_attrs(self, size):
+        for train in self.spiketrains:
+            extract_neo_attrs(train)
+
+    def time_extract_neo_attrs_noparents(self, size):
+        for train in self.spiketrains:
+            extract_neo_attrs(train, parents=False)
+
+    def time_neo_to_snapshot(self, size):
+        neo_to_snapshot(self.block)
+
+    def peakmem_extract_neo_attrs(self, size):
+        for train in self.spiketrains:
+            extract_neo_attrs(train)
+
+    def peakmem_neo_to_snapshot(self, size):
+        neo_to_snapshot(self.block)
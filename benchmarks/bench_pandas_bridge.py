@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for elephant.pandas_bridge.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+try:
+    import elephant.pandas_bridge as ep
+except ImportError:
+    HAVE_PANDAS = False
+else:
+    HAVE_PANDAS = True
+
+from .generate import SIZE_NAMES, get_block
+
+
+class PandasBridge(object):
+    params = SIZE_NAMES
+    param_names = ['size']
+
+    def setup(self, size):
+        if not HAVE_PANDAS:
+            # asv skips benchmarks whose setup raises NotImplementedError
+            raise NotImplementedError('requires pandas')
+        self.block = get_block(size)
+        self.spiketrains = ep.multi_spiketrains_to_dataframe(self.block)
+        self.epochs = ep.multi_epochs_to_dataframe(self.block)
+        self.events = ep.multi_events_to_dataframe(self.block)
+
+    def time_multi_spiketrains_to_dataframe(self, size):
+        ep.multi_spiketrains_to_dataframe(self.block)
+
+    def time_multi_spiketrains_to_dataframe_tidy(self, size):
+        ep.multi_spiketrains_to_dataframe(self.block, tidy=True)
+
+    def time_multi_spiketrains_to_dataframe_float32(self, size):
+        ep.multi_spiketrains_to_dataframe(self.block, dtype='float32')
+
+    def time_multi_events_to_dataframe(self, size):
+        ep.multi_events_to_dataframe(self.block)
+
+    def time_multi_epochs_to_dataframe(self, size):
+        ep.multi_epochs_to_dataframe(self.block)
+
+    def time_slice_spiketrain(self, size):
+        ep.slice_spiketrain(self.spiketrains, t_start=1., t_stop=5.)
+
+    def time_dataframe_to_spiketrains(self, size):
+        ep.dataframe_to_spiketrains(self.spiketrains)
+
+    def time_assign_spikes_to_epochs(self, size):
+        ep.assign_spikes_to_epochs(self.spiketrains, self.epochs)
+
+    def time_align_spiketrains_to_events(self, size):
+        ep.align_spiketrains_to_events(self.spiketrains, self.events,
+                                       t_pre=.1, t_post=.5)
+
+    def time_grouped_mean_firing_rate(self, size):
+        ep.grouped_mean_firing_rate(self.spiketrains, groupby='condition')
+
+    def peakmem_multi_spiketrains_to_dataframe(self, size):
+        ep.multi_spiketrains_to_dataframe(self.block)
+
+    def peakmem_multi_spiketrains_to_dataframe_tidy(self, size):
+        ep.multi_spiketrains_to_dataframe(self.block, tidy=True)
+
+    def peakmem_multi_events_to_dataframe(self, size):
+        ep.multi_events_to_dataframe(self.block)
+
+    def peakmem_multi_epochs_to_dataframe(self, size):
+        ep.multi_epochs_to_dataframe(self.block)
+
+    def peakmem_slice_spiketrain(self, size):
+        ep.slice_spiketrain(self.spiketrains, t_start=1., t_stop=5.)
+
+    def peakmem_dataframe_to_spiketrains(self, size):
+        ep.dataframe_to_spiketrains(self.spiketrains)
+
+    def peakmem_assign_spikes_to_epochs(self, size):
+        ep.assign_spikes_to_epochs(self.spiketrains, self.epochs)
+
+    def peakmem_align_spiketrains_to_events(self, size):
+        ep.align_spiketrains_to_events(self.spiketrains, self.events,
+                                       t_pre=.1, t_post=.5)
+
+    def peakmem_grouped_mean_firing_rate(self, size):
+        ep.grouped_mean_firing_rate(self.spiketrains, groupby='condition')
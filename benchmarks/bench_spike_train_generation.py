@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for elephant.spike_train_generation.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import numpy as np
+import quantities as pq
+from neo.core import AnalogSignal
+
+from elephant.spike_train_generation import (homogeneous_gamma_process,
+                                             homogeneous_poisson_process,
+                                             inhomogeneous_poisson_process)
+
+from .generate import SIZE_NAMES, SIZES
+
+
+class Generation(object):
+    params = SIZE_NAMES
+    param_names = ['size']
+
+    def setup(self, size):
+        self.n, duration = SIZES[size]
+        self.t_stop = duration * pq.s
+        rates = 10 + 10 * np.sin(np.linspace(0, 2 * np.pi, int(duration)))
+        self.rate = AnalogSignal(rates, units='Hz', sampling_period=1 * pq.s)
+
+    def time_poisson(self, size):
+        homogeneous_poisson_process(10 * pq.Hz, self.t_stop, n=self.n,
+                                    random_state=0)
+
+    def time_poisson_array(self, size):
+        homogeneous_poisson_process(10 * pq.Hz, self.t_stop, n=self.n,
+                                    as_array=True, random_state=0)
+
+    def time_gamma_dead_time(self, size):
+        homogeneous_gamma_process(3, 10 * pq.Hz, self.t_stop, n=self.n,
+                                  dead_time=2 * pq.ms, random_state=0)
+
+    def time_inhomogeneous_dead_time(self, size):
+        inhomogeneous_poisson_process(self.rate, n=self.n,
+                                      dead_time=2 * pq.ms, as_array=True,
+                                      random_state=0)
+
+    def peakmem_poisson_array(self, size):
+        homogeneous_poisson_process(10 * pq.Hz, self.t_stop, n=self.n,
+                                    as_array=True, random_state=0)
+
+    def peakmem_gamma_dead_time(self, size):
+        homogeneous_gamma_process(3, 10 * pq.Hz, self.t_stop, n=self.n,
+                                  dead_time=2 * pq.ms, random_state=0)
+
+    def peakmem_inhomogeneous_dead_time(self, size):
+        inhomogeneous_poisson_process(self.rate, n=self.n,
+                                      dead_time=2 * pq.ms, as_array=True,
+                                      random_state=0)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for elephant.statistics.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import numpy as np
+import quantities as pq
+
+from elephant.neo_tools import get_all_spiketrains
+from elephant.statistics import cv, fanofactor, isi, mean_firing_rate
+
+from .generate import SIZE_NAMES, get_block
+
+
+class Statistics(object):
+    params = SIZE_NAMES
+    param_names = ['size']
+
+    def setup(self, size):
+        self.spiketrains = get_all_spiketrains(get_block(size))
+
+    def time_isi(self, size):
+        for train in self.spiketrains:
+            isi(train)
+
+    def time_mean_firing_rate(self, size):
+        for train in self.spiketrains:
+            mean_firing_rate(train)
+
+    def time_cv(self, size):
+        for train in self.spiketrains:
+            cv(isi(train))
+
+    def time_fanofactor(self, size):
+        fanofactor(self.spiketrains)
+
+    def peakmem_isi(self, size):
+        for train in self.spiketrains:
+            isi(train)
+
+    def peakmem_mean_firing_rate(self, size):
+        for train in self.spiketrains:
+            mean_firing_rate(train)
+
+    def peakmem_cv(self, size):
+        for train in self.spiketrains:
+            cv(isi(train))
+
+    def peakmem_fanofactor(self, size):
+        fanofactor(self.spiketrains)
+
+
+class SmallTrain(object):
+    """Trains of a few spikes, where handling units dominates the time."""
+
+    params = [1, 10, 100]
+    param_names = ['n_spikes']
+
+    def setup(self, n_spikes):
+        train = get_all_spiketrains(get_block('medium'))[0]
+        self.spiketrain = train[:n_spikes]
+        self.times = self.spiketrain.magnitude
+        self.t_start = 100 * pq.ms
+        self.t_stop = 5 * pq.s
+
+    def time_mean_firing_rate(self, n_spikes):
+        mean_firing_rate(self.spiketrain)
+
+    def time_mean_firing_rate_rescale(self, n_spikes):
+        mean_firing_rate(self.spiketrain, t_start=self.t_start,
+                         t_stop=self.t_stop)
+
+    def time_mean_firing_rate_array(self, n_spikes):
+        mean_firing_rate(self.times, t_start=0., t_stop=5.)
+
+    def time_mean_firing_rate_baseline(self, n_spikes):
+        """The NumPy operations alone, as a lower bound."""
+        np.sum((self.times >= .1) & (self.times <= 5.)) / 4.9
+
+    def peakmem_mean_firing_rate(self, n_spikes):
+        mean_firing_rate(self.spiketrain)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic data for the benchmarks.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+from neo.core import (Block, Epoch, Event, RecordingChannelGroup, Segment,
+                      Unit)
+import numpy as np
+import quantities as pq
+
+from elephant.spike_train_generation import homogeneous_poisson_process
+
+
+def make_block(n_units=10, n_segments=1, rate=10., duration=10., seed=0):
+    """Create a `neo.Block` with Poisson spiketrains.
+
+    The Block has one `neo.RecordingChannelGroup` with `n_units`
+    `neo.Unit` objects, and `n_segments` `neo.Segment` objects.  Every Unit
+    has one SpikeTrain in every Segment.  Every Segment also has one
+    `neo.Event` and one `neo.Epoch` with one element per second.
+
+    Parameters
+    ----------
+
+    n_units : int, optional
+              The number of units.  Default is 10.
+    n_segments : int, optional
+                 The number of segments.  Default is 1.
+    rate : float, optional
+           The firing rate of every spiketrain, in Hz.  Default is 10.
+    duration : float, optional
+               The duration of every segment, in seconds.  Default is 10.
+    seed : int, optional
+           The seed of the random number generator.  Default is 0.
+
+    Returns
+    -------
+
+    neo Block
+
+    """
+    random_state = np.random.RandomState(seed)
+    block = Block(name='block %s' % seed)
+    rcg = RecordingChannelGroup(name='rcg')
+    block.recordingchannelgroups.append(rcg)
+    for iunit in range(n_units):
+        rcg.units.append(Unit(name='unit %s' % iunit, unit_index=iunit))
+
+    ticks = np.arange(int(duration))
+    labels = np.array(['tick %s' % (tick % 4) for tick in ticks], dtype='U')
+    for iseg in range(n_segments):
+        seg = Segment(name='segment %s' % iseg, index=iseg)
+        block.segments.append(seg)
+        seg.events.append(Event(times=ticks * pq.s, labels=labels,
+                                name='ticks'))
+        seg.epochs.append(Epoch(times=ticks * pq.s,
+                                durations=np.ones(len(ticks)) * pq.s,
+                                labels=labels, name='seconds'))
+        trains = homogeneous_poisson_process(rate * pq.Hz, duration * pq.s,
+                                             n=n_units,
+                                             random_state=random_state)
+        for unit, train in zip(rcg.units, trains):
+            train.name = unit.name
+            train.annotate(condition=iseg % 2)
+            seg.spiketrains.append(train)
+            unit.spiketrains.append(train)
+
+    block.create_many_to_one_relationship()
+    return block
+
+
+def nest(obj, depth=1):
+    """Wrap an object in nested lists and dicts.
+
+    This makes containers that the `neo_tools` traversal functions have to
+    search recursively.
+
+    Parameters
+    ----------
+
+    obj : any
+          The object to wrap.
+    depth : int, optional
+            The number of levels of nesting.  Levels alternate between
+            lists and dicts.  Default is 1, return `obj` unchanged.
+
+    Returns
+    -------
+
+    list, dict, or type of `obj`
+
+    """
+    for level in range(depth - 1):
+        obj = [obj] if level % 2 == 0 else {'level': obj}
+    return obj
+
+
+# The named benchmark sizes, as the number of units and the duration of each
+# segment in seconds, from small test data to production scale.
+SIZES = {'small': (10, 10.),
+         'medium': (100, 100.),
+         'large': (1000, 100.),
+         'production': (1000, 1000.)}
+
+# The names of the sizes, in increasing order, for use as asv parameters.
+SIZE_NAMES = ['small', 'medium', 'large', 'production']
+
+# The blocks already created by `get_block`.
+_BLOCKS = {}
+
+
+def get_block(size, n_segments=2):
+    """Get the `neo.Block` for a named size, creating it only once.
+
+    Parameters
+    ----------
+
+    size : str
+           One of the keys of `SIZES`.
+    n_segments : int, optional
+                 The number of segments.  Default is 2.
+
+    Returns
+    -------
+
+    neo Block
+
+    """
+    key = (size, n_segments)
+    if key not in _BLOCKS:
+        n_units, duration = SIZES[size]
+        _BLOCKS[key] = make_block(n_units=n_units, n_segments=n_segments,
+                                  duration=duration)
+    return _BLOCKS[key]
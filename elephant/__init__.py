@@ -6,12 +6,52 @@ docstring goes here.
 :license: Modified BSD, see LICENSE.txt for details.
 """
 
-from . import statistics
-from . import conversion
-from . import neo_tools
+import importlib
+import sys
 
+# The submodules available as attributes of this package.  On Python 3.7 and
+# newer they are only imported when first accessed, so `import elephant` does
+# not pay for importing scipy, neo, or pandas.
+_SUBMODULES = ('statistics', 'conversion', 'neo_tools', 'pandas_bridge',
+               'parallel', 'pipeline', 'spike_train_array',
+               'spike_train_generation', 'spike_train_surrogates')
 
-try:
-    from . import pandas_bridge
-except ImportError:
-    pass
+# The submodules that are only available if their optional dependencies are
+# installed.
+_OPTIONAL_SUBMODULES = ('pandas_bridge',)
+
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name not in _SUBMODULES:
+            raise AttributeError('module %r has no attribute %r' %
+                                 (__name__, name))
+        try:
+            module = importlib.import_module('.' + name, __name__)
+        except ImportError:
+            if name not in _OPTIONAL_SUBMODULES:
+                raise
+            raise AttributeError('module %r has no attribute %r' %
+                                 (__name__, name))
+        globals()[name] = module
+        return module
+
+    def __dir__():
+        return sorted(set(globals()) | set(_SUBMODULES))
+else:
+    from . import statistics
+    from . import conversion
+    from . import neo_tools
+    from . import parallel
+    from . import spike_train_array
+    from . import spike_train_generation
+    from . import spike_train_surrogates
+
+    # the pipeline uses syntax that is only available in Python 3.6 and newer
+    if sys.version_info >= (3, 6):
+        from . import pipeline
+
+    try:
+        from . import pandas_bridge
+    except ImportError:
+        pass
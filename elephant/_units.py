@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Fast unit handling for the numeric functions.
+
+Going through `quantities` for every rescale and comparison is slow compared
+to the actual computation on small arrays.  These functions reduce every
+input to a plain magnitude in a common set of units, using conversion
+factors that are only computed once per pair of units, so the numeric
+kernels can run on bare NumPy arrays and units only need to be reattached
+to the result.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import quantities as pq
+
+from elephant.profiling import stage
+
+# The conversion factors already computed by `rescale_factor`, keyed by the
+# pair of units.
+_FACTORS = {}
+
+# The inverses of units already computed by `inverse_units`.
+_INVERSES = {}
+
+# The maximum number of entries kept in each of the caches.
+_CACHE_MAX = 1024
+
+
+def _units_key(units):
+    """Get a hashable key for units given as a string or a quantity."""
+    return getattr(units, 'dimensionality', units)
+
+
+def _cache_set(cache, key, value):
+    """Store a value in a cache, emptying the cache first if it is full."""
+    if len(cache) >= _CACHE_MAX:
+        cache.clear()
+    cache[key] = value
+    return value
+
+
+def rescale_factor(from_units, to_units):
+    """Get the factor that converts values in `from_units` to `to_units`.
+
+    Parameters
+    ----------
+
+    from_units : str or quantities Quantity or Dimensionality
+                 The units to convert from.
+    to_units : str or quantities Quantity or Dimensionality
+               The units to convert to.
+
+    Returns
+    -------
+
+    float
+        The factor to multiply magnitudes in `from_units` by to get
+        magnitudes in `to_units`.
+
+    Notes
+    -----
+
+    Factors are cached for each pair of units, so `quantities` is only used
+    the first time a pair is seen.
+
+    """
+    key = (_units_key(from_units), _units_key(to_units))
+    try:
+        return _FACTORS[key]
+    except KeyError:
+        pass
+    if key[0] == key[1]:
+        factor = 1.
+    else:
+        with stage('unit conversion'):
+            factor = float(pq.Quantity(1., key[0]).rescale(key[1]).magnitude)
+    return _cache_set(_FACTORS, key, factor)
+
+
+def inverse_units(units):
+    """Get the inverse of `units`, such as `1/s` for `s`.
+
+    Parameters
+    ----------
+
+    units : str or quantities Quantity or Dimensionality
+
+    Returns
+    -------
+
+    quantities Dimensionality
+
+    """
+    key = _units_key(units)
+    try:
+        return _INVERSES[key]
+    except KeyError:
+        pass
+    return _cache_set(_INVERSES, key,
+                      (1. / pq.Quantity(1., key)).dimensionality)
+
+
+def magnitude(value, units):
+    """Get the magnitude of `value` in `units`.
+
+    Parameters
+    ----------
+
+    value : quantities Quantity, NumPy array, or scalar
+            The value to convert.  Values without units are taken to
+            already be in `units`, and are returned as-is.
+    units : str or quantities Quantity or Dimensionality
+            The units to convert to.
+
+    Returns
+    -------
+
+    NumPy array or scalar
+        The magnitude of `value` in `units`.  If no conversion is needed,
+        this is the magnitude of `value` without a copy.
+
+    """
+    if not hasattr(value, 'dimensionality'):
+        return value
+    factor = rescale_factor(value.dimensionality, units)
+    if factor == 1.:
+        return value.magnitude
+    return value.magnitude * factor
+
+
+def inverse_magnitude(value, units):
+    """Get the magnitude of `1 / value` in `units`.
+
+    This gives a sampling period from a sampling rate, for example, without
+    any arithmetic on quantities.
+
+    Parameters
+    ----------
+
+    value : quantities Quantity, NumPy array, or scalar
+            The value to invert.  Values without units are taken to be in
+            the inverse of `units`.
+    units : str or quantities Quantity or Dimensionality
+            The units of the result.
+
+    Returns
+    -------
+
+    NumPy array or scalar
+
+    """
+    if not hasattr(value, 'dimensionality'):
+        return 1. / value
+    factor = rescale_factor(inverse_units(value.dimensionality), units)
+    return factor / value.magnitude
@@ -0,0 +1,530 @@
+# -*- coding: utf-8 -*-
+"""
+An optional on-disk cache for the results of analysis functions.
+
+Functions decorated with `cached` look up their result in the active
+`DiskCache` before computing it.  The cache key is a hash of the function
+name, the bytes of every input array, the units, `t_start` and `t_stop` of
+every input, and all other parameters, so a result is found again for equal
+inputs in a later session, but never for changed data.  Results are stored
+as `.npy` files, and cache hits return read-only memory-mapped arrays
+without copying the data.
+
+Caching is off unless a cache is activated with `set_cache`, or the
+`ELEPHANT_CACHE_DIR` environment variable is set before elephant is
+imported (with an optional size limit in bytes in `ELEPHANT_CACHE_SIZE`)::
+
+    >>> set_cache('/tmp/elephant_cache', max_size=10 * 2 ** 30)
+    >>> binarize(spiketrain, sampling_rate=1 * pq.kHz)  # computed
+    >>> binarize(spiketrain, sampling_rate=1 * pq.kHz)  # memory-mapped
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+from functools import wraps
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import quantities as pq
+
+# The version of the format of the cache entries.  Changing it invalidates
+# all existing entries.
+CACHE_VERSION = 2
+
+# The environment variables that activate a cache when elephant is imported.
+CACHE_DIR_ENV = 'ELEPHANT_CACHE_DIR'
+CACHE_SIZE_ENV = 'ELEPHANT_CACHE_SIZE'
+
+# The name of the file describing a cache entry.
+_META_NAME = 'meta.json'
+
+# The active `DiskCache`, or `None` if caching is off.
+_ACTIVE = None
+
+
+def _new_hash():
+    """Get a new hash object, using the fastest algorithm available."""
+    if hasattr(hashlib, 'blake2b'):
+        return hashlib.blake2b(digest_size=20)
+    return hashlib.sha1()
+
+
+class _Uncacheable(Exception):
+    """Raised for inputs or results that cannot be cached."""
+
+
+def _units_string(value):
+    """Get the units of a quantity as a string."""
+    return value.dimensionality.string
+
+
+def _hash_value(hasher, value):
+    """Add a value to a hash.
+
+    Parameters
+    ----------
+
+    hasher : hashlib hash object
+             The hash to update.
+    value : any
+            The value to hash.  Arrays are hashed by their dtype, shape and
+            bytes, along with their units, `t_start` and `t_stop`, if any.
+            Lists, tuples and dicts are hashed recursively.
+
+    Raises
+    ------
+
+    _Uncacheable
+        If `value`, or a value inside it, is not of a supported type.
+
+    """
+    update = hasher.update
+    if value is None or isinstance(value, (bool, int, float, complex,
+                                           str, bytes, type(u''))):
+        update(repr((type(value).__name__, value)).encode('utf8'))
+    elif isinstance(value, (np.ndarray, np.generic)):
+        data = np.ascontiguousarray(value)
+        if data.dtype.hasobject:
+            raise _Uncacheable('object arrays are not cached')
+        update(repr(('array', data.dtype.str,
+                     np.shape(value))).encode('utf8'))
+        update(data.reshape(-1).view('uint8').data)
+        if hasattr(value, 'dimensionality'):
+            update(_units_string(value).encode('utf8'))
+        for attr in ('t_start', 't_stop', 'sampling_rate'):
+            if hasattr(value, attr):
+                update(attr.encode('utf8'))
+                _hash_value(hasher, getattr(value, attr))
+    elif isinstance(value, (list, tuple)):
+        update(repr((type(value).__name__, len(value))).encode('utf8'))
+        for item in value:
+            _hash_value(hasher, item)
+    elif isinstance(value, dict):
+        update(repr(('dict', len(value))).encode('utf8'))
+        for key in sorted(value):
+            _hash_value(hasher, key)
+            _hash_value(hasher, value[key])
+    elif hasattr(value, 'offsets') and hasattr(value, 'values'):
+        # a RaggedArray or SpikeTrainArray
+        update(type(value).__name__.encode('utf8'))
+        for attr in ('values', 'offsets', 't_starts', 't_stops'):
+            if hasattr(value, attr):
+                _hash_value(hasher, getattr(value, attr))
+        _hash_value(hasher, None if value.units is None else
+                    value.units.dimensionality.string)
+    else:
+        raise _Uncacheable('values of type %s are not cached' % type(value))
+
+
+def cache_key(name, args, kwargs):
+    """Get the cache key for a call of a function.
+
+    Parameters
+    ----------
+
+    name : str
+           The name of the function.
+    args : tuple
+           The positional arguments of the call.
+    kwargs : dict
+             The keyword arguments of the call.
+
+    Returns
+    -------
+
+    str
+        The hexadecimal hash of the call.
+
+    Raises
+    ------
+
+    _Uncacheable
+        If any argument is not of a supported type.
+
+    """
+    hasher = _new_hash()
+    _hash_value(hasher, (CACHE_VERSION, name, args, kwargs))
+    return hasher.hexdigest()
+
+
+def _result_arrays(result):
+    """Split a result into arrays to store, and a description to rebuild it.
+
+    Raises
+    ------
+
+    _Uncacheable
+        If `result` is not an array, a scalar, or a tuple of them.
+
+    """
+    if isinstance(result, tuple):
+        items = result
+    else:
+        items = (result,)
+    arrays = []
+    meta = []
+    for item in items:
+        if type(item) is pq.Quantity:
+            units = _units_string(item)
+            arr = item.magnitude
+        elif (type(item) is np.ndarray or
+              isinstance(item, (np.generic, bool, int, float))):
+            units = None
+            arr = np.asarray(item)
+        else:
+            raise _Uncacheable('results of type %s are not cached' %
+                               type(item))
+        arrays.append(arr)
+        meta.append({'units': units,
+                     'mmap': arr.ndim > 0 and arr.size > 0,
+                     'generic': not isinstance(item, np.ndarray)})
+    return arrays, {'tuple': isinstance(result, tuple), 'items': meta}
+
+
+def _rebuild_result(arrays, meta):
+    """Rebuild a result from its arrays and description."""
+    items = []
+    for arr, info in zip(arrays, meta['items']):
+        if info['generic']:
+            arr = arr[()]
+        if info['units'] is not None:
+            arr = pq.Quantity(arr, units=info['units'], copy=False)
+        items.append(arr)
+    if meta['tuple']:
+        return tuple(items)
+    return items[0]
+
+
+class DiskCache(object):
+    """A content-addressed cache of results stored in a directory.
+
+    Each entry is a subdirectory named after its key, holding one `.npy`
+    file per array of the result and a small JSON description.
+
+    Parameters
+    ----------
+
+    path : str
+           The directory of the cache.  It is created if it does not exist.
+    max_size : int, optional
+               The maximum total size of the entries, in bytes.  When
+               storing a result makes the cache larger, the least recently
+               used entries are removed.  If `None` (default), there is no
+               limit.
+
+    """
+
+    def __init__(self, path, max_size=None):
+        self.path = os.path.abspath(path)
+        self.max_size = max_size
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key)
+
+    def get(self, key):
+        """Get the result stored under a key.
+
+        Parameters
+        ----------
+
+        key : str
+              The key, as from `cache_key`.
+
+        Returns
+        -------
+
+        The result, with non-empty arrays memory-mapped read-only, or `None`
+        if there is no entry for `key`.
+
+        """
+        entry = self._entry_path(key)
+        metapath = os.path.join(entry, _META_NAME)
+        try:
+            with open(metapath) as fobj:
+                meta = json.load(fobj)
+            arrays = [np.load(os.path.join(entry, '%s.npy' % i),
+                              mmap_mode='r' if info['mmap'] else None)
+                      for i, info in enumerate(meta['items'])]
+        except (IOError, OSError, ValueError):
+            return None
+        # mark the entry as recently used
+        try:
+            os.utime(metapath, None)
+        except OSError:
+            pass
+        return _rebuild_result(arrays, meta)
+
+    def set(self, key, result):
+        """Store a result under a key, then enforce `max_size`.
+
+        Parameters
+        ----------
+
+        key : str
+              The key, as from `cache_key`.
+        result : array, scalar, or tuple of arrays and scalars
+                 The result to store.
+
+        Raises
+        ------
+
+        _Uncacheable
+            If `result` is not of a supported type.
+
+        """
+        arrays, meta = _result_arrays(result)
+        tmpdir = tempfile.mkdtemp(dir=self.path, prefix='.tmp')
+        try:
+            for i, arr in enumerate(arrays):
+                np.save(os.path.join(tmpdir, '%s.npy' % i), arr)
+            with open(os.path.join(tmpdir, _META_NAME), 'w') as fobj:
+                json.dump(meta, fobj)
+            try:
+                os.rename(tmpdir, self._entry_path(key))
+            except OSError:
+                # another process stored the same entry first
+                shutil.rmtree(tmpdir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise
+        self.evict()
+
+    def entries(self):
+        """Get the key, size in bytes and last use of every entry.
+
+        Returns
+        -------
+
+        list of tuples
+            `(key, size, last_used)` for every entry, least recently used
+            first.
+
+        """
+        res = []
+        for key in os.listdir(self.path):
+            entry = self._entry_path(key)
+            if key.startswith('.') or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, name))
+                           for name in os.listdir(entry))
+                last_used = os.path.getmtime(os.path.join(entry, _META_NAME))
+            except OSError:
+                continue
+            res.append((key, size, last_used))
+        return sorted(res, key=lambda item: item[2])
+
+    def size(self):
+        """Get the total size of the entries, in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_size=None):
+        """Remove least recently used entries until the cache is small enough.
+
+        Parameters
+        ----------
+
+        max_size : int, optional
+                   The size to shrink the cache to, in bytes.  Default is
+                   `self.max_size`.  If both are `None`, nothing is removed.
+
+        """
+        if max_size is None:
+            max_size = self.max_size
+        if max_size is None:
+            return
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= max_size:
+                break
+            self.remove(key)
+            total -= size
+
+    def remove(self, key):
+        """Remove the entry for a key, if there is one.
+
+        Removing an entry that is memory-mapped is safe on POSIX systems,
+        where the mapped data stays available until it is released.
+        """
+        shutil.rmtree(self._entry_path(key), ignore_errors=True)
+
+    def invalidate(self, func, *args, **kwargs):
+        """Remove the entry for a call of a cached function.
+
+        Parameters
+        ----------
+
+        func : function
+               The function, decorated with `cached`.
+        Any other arguments are the arguments of the call.  They can be
+        passed by position or by name, and defaults can be left out, as the
+        entry is the same however the call passed them.
+
+        Raises
+        ------
+
+        TypeError
+            If `func` is not decorated with `cached`, or the arguments do
+            not match its signature.
+
+        """
+        call_key = getattr(func, 'cache_key', None)
+        if call_key is None:
+            raise TypeError('%s is not decorated with cached' %
+                            _func_name(func))
+        self.remove(call_key(args, kwargs))
+
+    def clear(self):
+        """Remove every entry."""
+        for key, _, _ in self.entries():
+            self.remove(key)
+
+
+def _func_name(func):
+    """Get the name that identifies a function in cache keys."""
+    return '%s.%s' % (func.__module__, func.__name__)
+
+
+def _argument_binder(func):
+    """Get a function mapping the arguments of a call to parameter names.
+
+    The returned function takes the positional and keyword arguments of a
+    call of `func` and returns a dictionary with the value of every
+    parameter, including defaults, so the same call gives the same
+    dictionary however its arguments are passed.  It raises a TypeError if
+    the arguments do not match the signature of `func`.
+    """
+    if not hasattr(inspect, 'signature'):
+        # Python 2
+        return lambda args, kwargs: inspect.getcallargs(func, *args,
+                                                        **kwargs)
+    signature = inspect.signature(func)
+
+    def bind(args, kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return dict(bound.arguments)
+
+    return bind
+
+
+def set_cache(path, max_size=None):
+    """Activate a cache for all cached functions.
+
+    Parameters
+    ----------
+
+    path : str or None
+           The directory of the cache, or `None` to turn caching off.
+    max_size : int, optional
+               The maximum total size of the cache, in bytes, as for
+               `DiskCache`.
+
+    Returns
+    -------
+
+    DiskCache or None
+        The activated cache.
+
+    """
+    global _ACTIVE
+    _ACTIVE = None if path is None else DiskCache(path, max_size=max_size)
+    return _ACTIVE
+
+
+def get_cache():
+    """Get the active `DiskCache`, or `None` if caching is off."""
+    return _ACTIVE
+
+
+def invalidate(func, *args, **kwargs):
+    """Remove the entry for a call of a cached function from the active cache.
+
+    This does nothing if caching is off.  See `DiskCache.invalidate`.
+    """
+    if _ACTIVE is not None:
+        _ACTIVE.invalidate(func, *args, **kwargs)
+
+
+def clear_cache():
+    """Remove every entry from the active cache, if there is one."""
+    if _ACTIVE is not None:
+        _ACTIVE.clear()
+
+
+def cached(func):
+    """Decorate a function so its results are stored in the active cache.
+
+    While caching is off, this only checks one flag before calling `func`.
+    Calls with arguments that cannot be hashed, or results that are not
+    arrays, scalars or tuples of them, are computed without the cache.
+
+    The key of a call is built from the value of every parameter, with
+    defaults filled in, so `f(x, 5)`, `f(x, bin_size=5)` and, if 5 is the
+    default, `f(x)` share one entry.
+
+    Parameters
+    ----------
+
+    func : function
+           The function to decorate.  Its results must only depend on its
+           arguments.
+
+    Returns
+    -------
+
+    function
+        The decorated function.  Its `cache_key` attribute takes the
+        positional and keyword arguments of a call and returns its key.
+
+    """
+    name = _func_name(func)
+    bind = _argument_binder(func)
+
+    def call_key(args, kwargs):
+        return cache_key(name, (), bind(args, kwargs))
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        cache = _ACTIVE
+        if cache is None:
+            return func(*args, **kwargs)
+        try:
+            key = call_key(args, kwargs)
+        except (_Uncacheable, TypeError):
+            # invalid calls raise their usual error from `func`
+            return func(*args, **kwargs)
+        result = cache.get(key)
+        if result is not None:
+            return result
+        result = func(*args, **kwargs)
+        try:
+            cache.set(key, result)
+        except _Uncacheable:
+            pass
+        return result
+
+    wrapper.cache_key = call_key
+    return wrapper
+
+
+def _cache_from_environment():
+    """Activate a cache if `CACHE_DIR_ENV` is set."""
+    path = os.environ.get(CACHE_DIR_ENV)
+    if path:
+        max_size = os.environ.get(CACHE_SIZE_ENV)
+        set_cache(path, max_size=int(max_size) if max_size else None)
+
+
+_cache_from_environment()
@@ -11,7 +11,44 @@ from __future__ import division, print_function
 import numpy as np
 import quantities as pq
 
+from elephant._units import inverse_magnitude, magnitude
+from elephant.caching import cached
+from elephant.profiling import instrument
+from elephant.spike_train_array import RaggedArray
 
+
+def _binarize_segments(times, segind, nseg, edges):
+    """Binarize the spike times of many trains at once.
+
+    Parameters
+    ----------
+
+    times : 1D NumPy array of floats
+            The spike times of all trains.
+    segind : 1D NumPy array of ints
+             The train of each spike time.
+    nseg : int
+           The number of trains.
+    edges : 1D NumPy array of floats
+            The bin edges, as for `np.histogram`.
+
+    Returns
+    -------
+
+    2D NumPy array of bools
+        One row per train and one column per bin.
+
+    """
+    nbins = len(edges) - 1
+    inside = (times >= edges[0]) & (times <= edges[-1])
+    bins = np.searchsorted(edges, times[inside], side='right') - 1
+    res = np.zeros((nseg, nbins), dtype='bool')
+    res[segind[inside], np.minimum(bins, nbins - 1)] = True
+    return res
+
+
+@instrument
+@cached
 def binarize(spiketrain, sampling_rate=None, t_start=None, t_stop=None,
              return_times=None):
     """
@@ -26,6 +63,10 @@ def binarize(spiketrain, sampling_rate=None, t_start=None, t_stop=None,
     a spike in that time bin.  The number of spikes in a time bin is not
     considered.
 
+    Also accepts a `SpikeTrainArray` or other `RaggedArray`, in which case
+    all trains are binarized at once on the same time points, and the
+    boolean array has one row per train.
+
     Optionally also returns an array of time points corresponding to the
     elements of the boolean array.  The units of this array will be the same as
     the units of the SpikeTrain, if any.
@@ -33,7 +74,8 @@ def binarize(spiketrain, sampling_rate=None, t_start=None, t_stop=None,
     Parameters
     ----------
 
-    spiketrain : Neo SpikeTrain or Quantity array or NumPy array
+    spiketrain : Neo SpikeTrain or Quantity array or NumPy array or
+                 SpikeTrainArray
                  The spike times.  Does not have to be sorted.
     sampling_rate : float or Quantity scalar, optional
                     The sampling rate to use for the time points.
@@ -98,37 +140,42 @@ def binarize(spiketrain, sampling_rate=None, t_start=None, t_stop=None,
         if sampling_rate is None:
             raise ValueError('sampling_rate must either be explicitly defined '
                              'or must be an attribute of spiketrain')
-    if t_start is None:
-        t_start = getattr(spiketrain, 't_start', 0)
-    if t_stop is None:
-        t_stop = getattr(spiketrain, 't_stop', np.max(spiketrain))
 
+    # figure out what units, if any, we are dealing with.  For many
+    # trains, use the earliest start and the latest stop.
+    ragged = None
+    if isinstance(spiketrain, RaggedArray):
+        ragged = spiketrain
+        units = ragged.units
+        if t_start is None:
+            t_start = np.min(getattr(ragged, 't_starts', 0))
+        if t_stop is None:
+            t_stop = np.max(getattr(ragged, 't_stops', ragged.values))
+        spiketrain = ragged.values
+    else:
+        units = getattr(spiketrain, 'units', None)
+        if t_start is None:
+            t_start = getattr(spiketrain, 't_start', 0)
+        if t_stop is None:
+            t_stop = getattr(spiketrain, 't_stop', None)
+        spiketrain = getattr(spiketrain, 'magnitude', spiketrain)
+        if t_stop is None:
+            t_stop = np.max(spiketrain)
+
+    # convert everything to the magnitude in the same units, using cached
+    # conversion factors rather than arithmetic on quantities.
     # we don't actually want the sampling rate, we want the sampling period
-    sampling_period = 1./sampling_rate
-
-    # figure out what units, if any, we are dealing with
-    if hasattr(spiketrain, 'units'):
-        units = spiketrain.units
-        spiketrain = spiketrain.magnitude
+    if units is None:
+        for name, value in (('sampling_period', sampling_rate),
+                            ('t_start', t_start), ('t_stop', t_stop)):
+            if hasattr(value, 'units'):
+                raise TypeError('%s cannot be a Quantity if '
+                                'spiketrain is not a quantity' % name)
+        sampling_period = 1./sampling_rate
     else:
-        units = None
-
-    # convert everything to the same units, then get the magnitude
-    if hasattr(sampling_period, 'units'):
-        if units is None:
-            raise TypeError('sampling_period cannot be a Quantity if '
-                            'spiketrain is not a quantity')
-        sampling_period = sampling_period.rescale(units).magnitude
-    if hasattr(t_start, 'units'):
-        if units is None:
-            raise TypeError('t_start cannot be a Quantity if '
-                            'spiketrain is not a quantity')
-        t_start = t_start.rescale(units).magnitude
-    if hasattr(t_stop, 'units'):
-        if units is None:
-            raise TypeError('t_stop cannot be a Quantity if '
-                            'spiketrain is not a quantity')
-        t_stop = t_stop.rescale(units).magnitude
+        sampling_period = inverse_magnitude(sampling_rate, units)
+        t_start = magnitude(t_start, units)
+        t_stop = magnitude(t_stop, units)
 
     # figure out the bin edges
     edges = np.arange(t_start-sampling_period/2, t_stop+sampling_period*3/2,
@@ -142,7 +189,11 @@ def binarize(spiketrain, sampling_rate=None, t_start=None, t_stop=None,
     edges[-1] = t_stop
 
     # this is where we actually get the binarized spike train
-    res = np.histogram(spiketrain, edges)[0].astype('bool')
+    if ragged is None:
+        res = np.histogram(spiketrain, edges)[0].astype('bool')
+    else:
+        res = _binarize_segments(spiketrain, ragged.segment_index,
+                                 len(ragged), edges)
 
     # figure out what to output
     if not return_times:
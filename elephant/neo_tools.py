@@ -8,13 +8,21 @@ docstring goes here.
 
 from __future__ import division, print_function
 
+from functools import partial
 from itertools import chain
+import multiprocessing
 
-from neo.core.container import unique_objs
+from neo.core import Epoch, Event, Segment, SpikeTrain, Unit
+from neo.core.baseneo import BaseNeo
+from neo.core.container import Container, unique_objs
+import numpy as np
 
+from elephant.profiling import instrument
 
+
+@instrument
 def extract_neo_attrs(obj, parents=True, child_first=True,
-                      skip_array=False, skip_none=False):
+                      skip_array=False, skip_none=False, lazy=False):
     """Given a neo object, return a dictionary of attributes and annotations.
 
     Parameters
@@ -35,6 +43,10 @@ def extract_neo_attrs(obj, parents=True, child_first=True,
     skip_none : bool, optional
                 If True (default False), skip annotations and attributes that
                 have a value of `None`.
+    lazy : bool, optional
+           If True (default False), never access attributes that can hold
+           sample data, so objects loaded lazily are not read.
+           This implies `skip_array`.
 
     Returns
     -------
@@ -43,7 +55,15 @@ def extract_neo_attrs(obj, parents=True, child_first=True,
         A dictionary where the keys are annotations or attribute names and
         the values are the corresponding annotation or attribute value.
 
+    Notes
+    -----
+
+    Whether an attribute can hold sample data is determined from the class
+    attribute specification alone, so with `lazy` the array attributes are
+    never looked up on `obj`.
+
     """
+    skip_array = skip_array or lazy
     attrs = obj.annotations.copy()
     for attr in obj._necessary_attrs + obj._recommended_attrs:
         if skip_array and len(attr) >= 3 and attr[2]:
@@ -67,7 +87,7 @@ def extract_neo_attrs(obj, parents=True, child_first=True,
         newattr = extract_neo_attrs(parent, parents=True,
                                     child_first=child_first,
                                     skip_array=skip_array,
-                                    skip_none=skip_none)
+                                    skip_none=skip_none, lazy=lazy)
         if child_first:
             newattr.update(attrs)
             attrs = newattr
@@ -77,7 +97,16 @@ def extract_neo_attrs(obj, parents=True, child_first=True,
     return attrs
 
 
-def _get_all_objs(container, classname):
+def _is_neo_data_obj(obj):
+    """Return True if `obj` is a neo data object rather than a container.
+
+    Only the type of `obj` is inspected, so no data is accessed.
+    """
+    return isinstance(obj, BaseNeo) and not isinstance(obj, Container)
+
+
+@instrument(name='traversal')
+def _get_all_objs(container, classname, lazy=False):
     """Get all `neo` objects of a given type from a container.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -94,6 +123,10 @@ def _get_all_objs(container, classname):
     classname : str
                 The name of the class, with proper capitalization
                 (so `SpikeTrain`, not `Spiketrain` or `spiketrain`)
+    lazy : bool, optional
+           If True (default False), neo objects are only handled through
+           their type and their child containers, so the sample data of
+           neo data objects is never accessed.
 
     Returns
     -------
@@ -104,6 +137,8 @@ def _get_all_objs(container, classname):
     """
     if container.__class__.__name__ == classname:
         return [container]
+    if lazy and _is_neo_data_obj(container):
+        raise ValueError('Cannot handle object of type %s' % type(container))
     classholder = classname.lower() + 's'
     if hasattr(container, classholder):
         vals = getattr(container, classholder)
@@ -115,12 +150,13 @@ def _get_all_objs(container, classname):
         vals = container
     else:
         raise ValueError('Cannot handle object of type %s' % type(container))
-    res = list(chain.from_iterable(_get_all_objs(obj, classname)
+    res = list(chain.from_iterable(_get_all_objs(obj, classname, lazy=lazy)
                                    for obj in vals))
     return unique_objs(res)
 
 
-def get_all_spiketrains(container):
+@instrument
+def get_all_spiketrains(container, lazy=False):
     """Get all `neo.Spiketrain` objects from a container.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -136,6 +172,9 @@ def get_all_spiketrains(container):
     container : list, tuple, iterable, dict,
                 neo Block, neo Segment, neo Unit, neo RecordingChannelGroup
                 The container for the spiketrains.
+    lazy : bool, optional
+           If True (default False), never access the sample data of any
+           neo data object, so objects loaded lazily are not read.
 
     Returns
     -------
@@ -144,10 +183,11 @@ def get_all_spiketrains(container):
         A list of the unique `neo.SpikeTrain` objects in `container`.
 
     """
-    return _get_all_objs(container, 'SpikeTrain')
+    return _get_all_objs(container, 'SpikeTrain', lazy=lazy)
 
 
-def get_all_events(container):
+@instrument
+def get_all_events(container, lazy=False):
     """Get all `neo.Event` objects from a container.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -162,6 +202,9 @@ def get_all_events(container):
 
     container : list, tuple, iterable, dict, neo Block, neo Segment
                 The container for the events.
+    lazy : bool, optional
+           If True (default False), never access the sample data of any
+           neo data object, so objects loaded lazily are not read.
 
     Returns
     -------
@@ -170,10 +213,11 @@ def get_all_events(container):
         A list of the unique `neo.Event` objects in `container`.
 
     """
-    return _get_all_objs(container, 'Event')
+    return _get_all_objs(container, 'Event', lazy=lazy)
 
 
-def get_all_epochs(container):
+@instrument
+def get_all_epochs(container, lazy=False):
     """Get all `neo.Epoch` objects from a container.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -188,6 +232,9 @@ def get_all_epochs(container):
 
     container : list, tuple, iterable, dict, neo Block, neo Segment
                 The container for the epochs.
+    lazy : bool, optional
+           If True (default False), never access the sample data of any
+           neo data object, so objects loaded lazily are not read.
 
     Returns
     -------
@@ -196,4 +243,309 @@ def get_all_epochs(container):
         A list of the unique `neo.Epoch` objects in `container`.
 
     """
-    return _get_all_objs(container, 'Epoch')
+    return _get_all_objs(container, 'Epoch', lazy=lazy)
+
+
+def _needs_loader(source):
+    """Whether a source of `_load_block` has to be read by its loader."""
+    if isinstance(source, BaseNeo) or callable(source):
+        return False
+    return hasattr(source, 'strip') or not hasattr(source, '__iter__')
+
+
+def _load_block(source, loader=None):
+    """Get the neo container from one source.
+
+    `source` can be a neo object or any container accepted by
+    `_get_all_objs`, a callable taking no arguments that returns one, or a
+    path (or other value) that `loader` turns into one.
+    """
+    if isinstance(source, BaseNeo):
+        return source
+    if callable(source):
+        return source()
+    if _needs_loader(source):
+        if loader is None:
+            raise TypeError('A loader is needed to read %s' % (source,))
+        return loader(source)
+    return source
+
+
+def _extract_source_attrs(source, classname, loader=None, lazy=False,
+                          **kwargs):
+    """Load a source and extract the attributes of its neo objects.
+
+    This is the unit of work for `parallel_extract_neo_attrs`, so it is
+    a module-level function that can be sent to worker processes.
+    """
+    container = _load_block(source, loader=loader)
+    return [extract_neo_attrs(obj, lazy=lazy, **kwargs)
+            for obj in _get_all_objs(container, classname, lazy=lazy)]
+
+
+@instrument
+def parallel_extract_neo_attrs(sources, classname='SpikeTrain', loader=None,
+                               processes=None, chunksize=1,
+                               parents=True, child_first=True,
+                               skip_array=False, skip_none=False, lazy=False):
+    """Extract the attributes of all neo objects of a type from many sources.
+
+    Each source is loaded, searched for objects of class `classname`, and
+    the attributes and annotations of those objects are extracted using
+    `extract_neo_attrs`.  Sources are handled in parallel by a pool of
+    worker processes.
+
+    Parameters
+    ----------
+
+    sources : list, tuple, or other iterable
+              The sources to process.  Each can be a neo Block or any
+              other container accepted by `get_all_spiketrains`, a callable
+              taking no arguments that returns such a container, or a path
+              (or other value) that `loader` converts to such a container.
+    classname : str, optional
+                The name of the class of object to extract, with proper
+                capitalization.  Default is `'SpikeTrain'`.
+    loader : callable, optional
+             Called with a source that is not a neo object to get the
+             container from it, such as a function reading a file path
+             with a neo IO.  If not specified, only neo objects, containers
+             and callables are accepted.
+    processes : int, optional
+                The number of worker processes.  If not specified, use the
+                number of CPUs.  If 1, everything is done in the current
+                process without starting a pool.
+    chunksize : int, optional
+                The number of sources sent to a worker at a time.
+                Default is 1.
+    parents : bool, optional
+              Also include attributes and annotations from parent neo
+              objects (if any).
+    child_first : bool, optional
+                  If True (default True), values of child attributes are used
+                  over parent attributes in the event of a name conflict.
+                  If False, parent attributes are used.
+                  This parameter does nothing if `parents` is False.
+    skip_array : bool, optional
+                 If True (default False), skip attributes that store non-scalar
+                 array values.
+    skip_none : bool, optional
+                If True (default False), skip annotations and attributes that
+                have a value of `None`.
+    lazy : bool, optional
+           If True (default False), never access the sample data of any
+           neo data object, so objects loaded lazily are not read.
+
+    Returns
+    -------
+
+    list
+        A list of dictionaries, one per object, in the same order as the
+        sources and, within a source, in the order of `_get_all_objs`.
+        The keys are annotations or attribute names and the values are the
+        corresponding annotation or attribute value.
+
+    Notes
+    -----
+
+    When using more than one process, the sources, `loader`, and the
+    extracted values must be picklable.  Callables must therefore be
+    module-level functions or `functools.partial` objects wrapping them.
+    Only the attribute dictionaries, not the neo objects, are sent back
+    from the workers.
+
+    """
+    func = partial(_extract_source_attrs, classname=classname, loader=loader,
+                   lazy=lazy, parents=parents, child_first=child_first,
+                   skip_array=skip_array, skip_none=skip_none)
+    if processes == 1:
+        res = [func(source) for source in sources]
+    else:
+        pool = multiprocessing.Pool(processes=processes)
+        try:
+            res = pool.map(func, sources, chunksize=chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    return list(chain.from_iterable(res))
+
+
+# The neo classes stored in a snapshot, the constructor to rebuild them, and
+# the array attributes stored as concatenated columns, other than `times`.
+_SNAPSHOT_CLASSES = {'SpikeTrain': (SpikeTrain, ()),
+                     'Event': (Event, ('labels',)),
+                     'Epoch': (Epoch, ('durations', 'labels'))}
+
+# The parent containers whose index is stored for each object.
+_SNAPSHOT_PARENTS = (('Segment', 'segment', Segment),
+                     ('Unit', 'unit', Unit))
+
+
+@instrument
+def neo_to_snapshot(container, classnames=('SpikeTrain', 'Event', 'Epoch')):
+    """Flatten the data objects in a container into a compact snapshot.
+
+    All the objects of a class are stored together as a few flat NumPy
+    arrays, so the snapshot can be pickled, cached, or put in shared memory
+    much faster than the neo objects themselves.
+
+    The objects can be any list, dict, or other iterable or mapping containing
+    neo objects, as well as any neo object that can hold them.
+    Objects are searched recursively, so the objects can be nested (such as a
+    list of blocks).
+
+    Parameters
+    ----------
+
+    container : list, tuple, iterable, dict, neo container
+                The container for the objects to store.
+    classnames : list or tuple of str, optional
+                 The classes of objects to store.  Can be any of
+                 `'SpikeTrain'`, `'Event'`, and `'Epoch'` (the default is
+                 all three).
+
+    Returns
+    -------
+
+    dict
+        A dictionary with one key for each name in `classnames`, plus
+        `'Segment'` and `'Unit'`.
+
+        `'Segment'` and `'Unit'` are lists with the attributes and
+        annotations of each parent Segment or Unit, respectively, as
+        returned by `extract_neo_attrs` with `parents=False`.
+
+        The other values are dictionaries with the following keys:
+
+        `times` : float array
+            The times of all objects, concatenated, each in its own units.
+        `offsets` : int array
+            The start of each object in `times`, plus the total length, so
+            object `i` is `times[offsets[i]:offsets[i+1]]`.
+        `units` : str array
+            The units of each object.
+        `segment` : int array
+            The index of the parent of each object in `'Segment'`, or `-1`
+            if it has none.
+        `unit` : int array
+            The same for `'Unit'`.  Only present for SpikeTrains.
+        `attrs` : list of dict
+            The scalar attributes and annotations of each object, as returned
+            by `extract_neo_attrs` with `parents=False`.
+
+        Events also have a `labels` array, and Epochs have `labels` and
+        `durations` arrays, concatenated in the same way as `times`.
+        Durations are in the units of the respective Epoch.
+
+    Notes
+    -----
+
+    If the length of `times`, `durations`, and `labels` are not the same for
+    an object, the longer will be truncated to the length of the shortest.
+
+    Array attributes and annotations other than those listed are not
+    stored.
+
+    """
+    parents = dict((name, []) for name, _, _ in _SNAPSHOT_PARENTS)
+    parent_inds = dict((name, {}) for name, _, _ in _SNAPSHOT_PARENTS)
+
+    def get_parent_ind(obj, name, attr):
+        parent = getattr(obj, attr, None)
+        if parent is None:
+            return -1
+        inds = parent_inds[name]
+        if id(parent) not in inds:
+            inds[id(parent)] = len(parents[name])
+            parents[name].append(extract_neo_attrs(parent, parents=False,
+                                                   skip_array=True))
+        return inds[id(parent)]
+
+    snapshot = {}
+    for classname in classnames:
+        arrattrs = _SNAPSHOT_CLASSES[classname][1]
+        objs = _get_all_objs(container, classname)
+        times = [obj.times.magnitude for obj in objs]
+        units = [str(obj.times.dimensionality) for obj in objs]
+        arrs = dict((attr, [np.asarray(getattr(obj, attr)) for obj in objs])
+                    for attr in arrattrs)
+        if 'durations' in arrs:
+            arrs['durations'] = [obj.durations.rescale(unit).magnitude
+                                 for obj, unit in zip(objs, units)]
+
+        lens = [min([len(itimes)] + [len(arrs[attr][i]) for attr in arrs])
+                for i, itimes in enumerate(times)]
+        res = {'offsets': np.cumsum([0] + lens).astype('int64'),
+               'units': np.array(units, dtype='U'),
+               'attrs': [extract_neo_attrs(obj, parents=False,
+                                           skip_array=True)
+                         for obj in objs]}
+        res['times'] = np.concatenate([itimes[:ilen] for itimes, ilen in
+                                       zip(times, lens)] +
+                                      [np.array([], dtype='float64')])
+        for attr, values in arrs.items():
+            empty = np.array([], dtype='U' if attr == 'labels' else 'float64')
+            res[attr] = np.concatenate([value[:ilen] for value, ilen in
+                                        zip(values, lens)] + [empty])
+        cls = _SNAPSHOT_CLASSES[classname][0]
+        for name, attr, _ in _SNAPSHOT_PARENTS:
+            if name in cls._single_parent_objects:
+                res[attr] = np.array([get_parent_ind(obj, name, attr)
+                                      for obj in objs], dtype='int64')
+        snapshot[classname] = res
+
+    snapshot.update(parents)
+    return snapshot
+
+
+@instrument
+def snapshot_to_neo(snapshot):
+    """Rebuild neo objects from a snapshot created by `neo_to_snapshot`.
+
+    The times of the rebuilt SpikeTrains are views into the `times` array
+    of the snapshot, rather than copies.
+
+    Parameters
+    ----------
+
+    snapshot : dict
+               The snapshot, as returned by `neo_to_snapshot`.
+
+    Returns
+    -------
+
+    dict
+        A dictionary with the same keys as `snapshot`, where each value is
+        a list of the rebuilt neo objects of that class.  The data objects
+        are attached to the rebuilt Segments and Units they had as parents.
+
+    """
+    res = {}
+    for name, _, cls in _SNAPSHOT_PARENTS:
+        res[name] = [cls(**attrs) for attrs in snapshot.get(name, [])]
+
+    for classname, (cls, arrattrs) in _SNAPSHOT_CLASSES.items():
+        if classname not in snapshot:
+            continue
+        data = snapshot[classname]
+        offsets = data['offsets']
+        objs = []
+        for i, attrs in enumerate(data['attrs']):
+            ind = slice(offsets[i], offsets[i+1])
+            kwargs = dict(attrs)
+            for attr in arrattrs:
+                kwargs[attr] = data[attr][ind]
+            if cls is SpikeTrain:
+                kwargs['copy'] = False
+            obj = cls(times=data['times'][ind], units=data['units'][i],
+                      **kwargs)
+            for name, attr, _ in _SNAPSHOT_PARENTS:
+                if attr not in data or data[attr][i] < 0:
+                    continue
+                parent = res[name][data[attr][i]]
+                setattr(obj, attr, parent)
+                getattr(parent, classname.lower() + 's').append(obj)
+            objs.append(obj)
+        res[classname] = objs
+
+    return res
@@ -8,12 +8,33 @@ docstring goes here.
 
 from __future__ import division, print_function, unicode_literals
 
+import json
+
+from neo.core import Epoch, Event, SpikeTrain
 import numpy as np
 import pandas as pd
 import quantities as pq
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as parquet
+except ImportError:
+    HAVE_ARROW = False
+else:
+    HAVE_ARROW = True
+
+from elephant._units import rescale_factor
 from elephant.neo_tools import (extract_neo_attrs, get_all_epochs,
                                 get_all_events, get_all_spiketrains)
+from elephant.profiling import instrument, stage
+
+
+def _default_multiindex(size):
+    """Get a `pandas.MultiIndex` for objects without any attributes.
+
+    The index has a single unnamed level holding the position of each object.
+    """
+    return pd.MultiIndex.from_arrays([np.arange(size)], names=[None])
 
 
 def _multiindex_from_dict(inds):
@@ -28,11 +49,91 @@ def _multiindex_from_dict(inds):
     Returns
     -------
     pandas MultiIndex
+        If `inds` is empty, this is the index from `_default_multiindex`.
     """
+    if not inds:
+        return _default_multiindex(1)
     names, indexes = zip(*sorted(inds.items()))
     return pd.MultiIndex.from_tuples([indexes], names=names)
 
 
+# The sorted names for each set of attribute and annotation names seen by
+# `_multiindex_from_dicts`.
+_SORTED_NAMES = {}
+
+# The maximum number of name sets kept in `_SORTED_NAMES`.
+_SORTED_NAMES_MAX = 1024
+
+
+def _sorted_names(inds):
+    """Get the sorted keys of a dictionary, cached by the set of keys."""
+    key = frozenset(inds)
+    names = _SORTED_NAMES.get(key)
+    if names is None:
+        if len(_SORTED_NAMES) >= _SORTED_NAMES_MAX:
+            _SORTED_NAMES.clear()
+        names = _SORTED_NAMES[key] = sorted(key)
+    return names
+
+
+def _group_by_keys(inds):
+    """Group dictionaries by their set of keys.
+
+    Parameters
+    ----------
+    inds : list of dict
+           The dictionaries to group.
+
+    Returns
+    -------
+    list of lists of int
+        The positions in `inds` of the dictionaries with each set of keys,
+        with the groups in the order they are first found.
+    """
+    groups = {}
+    order = []
+    for i, iinds in enumerate(inds):
+        key = frozenset(iinds)
+        if key not in groups:
+            groups[key] = []
+            order.append(key)
+        groups[key].append(i)
+    return [groups[key] for key in order]
+
+
+def _multiindex_from_dicts(inds):
+    """Given a list of dictionaries, return a `pandas.MultiIndex`.
+
+    This is the same as concatenating the results of `_multiindex_from_dict`
+    for each dictionary, but the index is built in one step.
+
+    Parameters
+    ----------
+    inds : list of dict
+           Dictionaries that all have the same keys, where the keys are
+           annotations or attribute names and the values are the
+           corresponding annotation or attribute value.
+
+    Returns
+    -------
+    pandas MultiIndex
+        An index with one element per dictionary and the levels in sorted
+        order.  If the dictionaries are empty, this is the index from
+        `_default_multiindex`.
+    """
+    names = _sorted_names(inds[0])
+    if not names:
+        return _default_multiindex(len(inds))
+    arrays = []
+    for name in names:
+        # filled one at a time so tuple values are not turned into 2D arrays
+        values = np.empty(len(inds), dtype='O')
+        for i, iinds in enumerate(inds):
+            values[i] = iinds[name]
+        arrays.append(values)
+    return pd.MultiIndex.from_arrays(arrays, names=names)
+
+
 def _sort_inds(obj, axis=0):
     """Put the indexes and index levels of a pandas object in sorted order.
 
@@ -137,11 +238,112 @@ def _convert_value_safe(value):
     return value
 
 
-def spiketrain_to_dataframe(spiketrain, parents=True, child_first=True):
+@instrument(name='unit conversion')
+def _time_magnitude(times, time_units='s', dtype=None, copy=True):
+    """Get the magnitude of a `quantities.Quantity` in given units.
+
+    Parameters
+    ----------
+
+    times : quantities Quantity
+            The times to convert.
+    time_units : str or quantities.Quantity, optional
+                 The units to convert to.  Default is seconds.
+    dtype : str or NumPy dtype, optional
+            The dtype of the result.  Default is the dtype of `times`.
+    copy : bool, optional
+           If True (default), the result never shares memory with `times`.
+           If False, the magnitude of `times` is returned as-is when no
+           conversion is needed.
+
+    Returns
+    -------
+
+    NumPy array
+        The magnitude of `times` in `time_units`.
+
+    Notes
+    -----
+
+    If `times` is already in `time_units`, it is not rescaled, so at most
+    one new array is created.
+
+    """
+    factor = rescale_factor(times.dimensionality, time_units)
+    if factor == 1.:
+        if copy:
+            return np.array(times.magnitude, dtype=dtype)
+        times = times.magnitude
+    else:
+        times = times.magnitude * factor
+    if dtype is None:
+        return times
+    return times.astype(dtype, copy=False)
+
+
+def _label_categories(objs):
+    """Get the categories for the labels of `neo` objects.
+
+    Parameters
+    ----------
+
+    objs : list of neo Event or neo Epoch
+           The objects whose labels should be used.
+
+    Returns
+    -------
+
+    pandas Index
+        The sorted, unique labels of all objects in `objs`.
+
+    """
+    labels = [obj.labels.astype('U') for obj in objs]
+    return pd.Index(np.unique(np.concatenate(labels +
+                                             [np.array([], dtype='U')])))
+
+
+def _labels_to_dataframe(labels, index, columns, categorical=False):
+    """Create a single-column `pandas.DataFrame` of labels.
+
+    Parameters
+    ----------
+
+    labels : NumPy array
+             The labels.
+    index : pandas Index or MultiIndex
+            The row index.
+    columns : pandas MultiIndex or list
+              The column index, with one element.
+    categorical : bool or list-like, optional
+                  If True, store the labels as a `pandas.Categorical` with
+                  the unique labels as categories.  If a list-like, use it as
+                  the categories.  If False (default), store the labels as
+                  strings.
+
+    Returns
+    -------
+
+    pandas DataFrame
+
+    """
+    if categorical is False:
+        return pd.DataFrame(labels[np.newaxis].T, index=index, columns=columns)
+
+    categories = None if categorical is True else categorical
+    labels = pd.Categorical(labels, categories=categories)
+    pdobj = pd.DataFrame({0: labels}, index=index)
+    pdobj.columns = columns
+    return pdobj
+
+
+@instrument
+def spiketrain_to_dataframe(spiketrain, parents=True, child_first=True,
+                            time_units='s', dtype='float64'):
     """Convert a `neo.SpikeTrain` to a `pandas.DataFrame`.
 
     The `pandas.DataFrame` object has a single column, with each element
-    being the spike time converted to a `float` value in seconds.
+    being the spike time converted to a `float` value in seconds (or
+    `time_units`).
 
     The column heading is a `pandas.MultiIndex` with one index
     for each of the scalar attributes and annotations.  The `index`
@@ -155,6 +357,18 @@ def spiketrain_to_dataframe(spiketrain, parents=True, child_first=True):
     parents : bool, optional
               Also include attributes and annotations from parent neo
               objects (if any).
+    child_first : bool, optional
+                  If True (default True), values of child attributes are used
+                  over parent attributes in the event of a name conflict.
+                  If False, parent attributes are used.
+                  This parameter does nothing if `parents` is False.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
 
     Returns
     -------
@@ -180,8 +394,7 @@ def spiketrain_to_dataframe(spiketrain, parents=True, child_first=True):
                                     parents=parents, child_first=child_first)
     columns = _multiindex_from_dict(attrs)
 
-    times = spiketrain.magnitude
-    times = pq.Quantity(times, spiketrain.units).rescale('s').magnitude
+    times = _time_magnitude(spiketrain, time_units=time_units, dtype=dtype)
     times = times[np.newaxis].T
 
     index = pd.Index(np.arange(len(spiketrain)), name='spike_number')
@@ -190,7 +403,9 @@ def spiketrain_to_dataframe(spiketrain, parents=True, child_first=True):
     return _sort_inds(pdobj, axis=1)
 
 
-def event_to_dataframe(event, parents=True, child_first=True):
+@instrument
+def event_to_dataframe(event, parents=True, child_first=True,
+                       categorical=False, time_units='s', dtype='float64'):
     """Convert a `neo.core.Event` to a `pandas.DataFrame`.
 
     The `pandas.DataFrame` object has a single column, with each element
@@ -213,6 +428,19 @@ def event_to_dataframe(event, parents=True, child_first=True):
                   over parent attributes in the event of a name conflict.
                   If False, parent attributes are used.
                   This parameter does nothing if `parents` is False.
+    categorical : bool or list-like, optional
+                  If True, store the labels as a `pandas.Categorical`, which
+                  uses much less memory for repetitive labels.
+                  If a list-like, store them as a `pandas.Categorical` with
+                  these categories.
+                  If False (default), store them as strings.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
 
     Returns
     -------
@@ -239,9 +467,20 @@ def event_to_dataframe(event, parents=True, child_first=True):
     """
     attrs = _extract_neo_attrs_safe(event,
                                     parents=parents, child_first=child_first)
-    columns = _multiindex_from_dict(attrs)
 
-    times = event.times.rescale('s').magnitude
+    pdobj = _event_data(event, categorical=categorical,
+                        time_units=time_units, dtype=dtype)
+    pdobj.columns = _multiindex_from_dict(attrs)
+    return _sort_inds(pdobj, axis=1)
+
+
+def _event_data(event, categorical=False, time_units='s', dtype='float64'):
+    """Convert a `neo.Event` to a `pandas.DataFrame` without column index.
+
+    This is `event_to_dataframe` with a column named `0` instead of the
+    attributes and annotations.
+    """
+    times = _time_magnitude(event.times, time_units=time_units, dtype=dtype)
     labels = event.labels.astype('U')
 
     times = times[:len(labels)]
@@ -249,11 +488,22 @@ def event_to_dataframe(event, parents=True, child_first=True):
 
     index = pd.Index(times, name='times')
 
-    pdobj = pd.DataFrame(labels[np.newaxis].T, index=index, columns=columns)
-    return _sort_inds(pdobj, axis=1)
+    return _labels_to_dataframe(labels, index, [0], categorical=categorical)
+
+
+def _events_data(events, **kwargs):
+    """Convert `neo.Event` objects to a `pandas.DataFrame` without column
+    index.
+
+    Any keyword arguments are passed to `_event_data`.
+    """
+    return pd.concat([_event_data(event, **kwargs) for event in events],
+                     axis=1)
 
 
-def epoch_to_dataframe(epoch, parents=True, child_first=True):
+@instrument
+def epoch_to_dataframe(epoch, parents=True, child_first=True,
+                       categorical=False, time_units='s', dtype='float64'):
     """Convert a `neo.core.Epoch` to a `pandas.DataFrame`.
 
     The `pandas.DataFrame` object has a single column, with each element
@@ -278,6 +528,19 @@ def epoch_to_dataframe(epoch, parents=True, child_first=True):
                   over parent attributes in the event of a name conflict.
                   If False, parent attributes are used.
                   This parameter does nothing if `parents` is False.
+    categorical : bool or list-like, optional
+                  If True, store the labels as a `pandas.Categorical`, which
+                  uses much less memory for repetitive labels.
+                  If a list-like, store them as a `pandas.Categorical` with
+                  these categories.
+                  If False (default), store them as strings.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
 
     Returns
     -------
@@ -305,23 +568,89 @@ def epoch_to_dataframe(epoch, parents=True, child_first=True):
     """
     attrs = _extract_neo_attrs_safe(epoch,
                                     parents=parents, child_first=child_first)
-    columns = _multiindex_from_dict(attrs)
 
-    times = epoch.times.rescale('s').magnitude
-    durs = epoch.durations.rescale('s').magnitude
+    pdobj = _epoch_data(epoch, categorical=categorical,
+                        time_units=time_units, dtype=dtype)
+    pdobj.columns = _multiindex_from_dict(attrs)
+    return _sort_inds(pdobj, axis=1)
+
+
+def _epoch_data(epoch, categorical=False, time_units='s', dtype='float64'):
+    """Convert a `neo.Epoch` to a `pandas.DataFrame` without column index.
+
+    This is `epoch_to_dataframe` with a column named `0` instead of the
+    attributes and annotations.
+    """
+    times = _time_magnitude(epoch.times, time_units=time_units, dtype=dtype)
+    durs = _time_magnitude(epoch.durations, time_units=time_units,
+                           dtype=dtype)
     labels = epoch.labels.astype('U')
 
     minlen = min([len(durs), len(times), len(labels)])
     index = pd.MultiIndex.from_arrays([times[:minlen], durs[:minlen]],
                                       names=['times', 'durations'])
 
-    pdobj = pd.DataFrame(labels[:minlen][np.newaxis].T,
-                         index=index, columns=columns)
-    return _sort_inds(pdobj, axis='all')
+    pdobj = _labels_to_dataframe(labels[:minlen], index, [0],
+                                 categorical=categorical)
+    return _sort_inds(pdobj, axis=0)
 
 
-def _multi_objs_to_dataframe(container, conv_func, get_func,
-                             parents=True, child_first=True):
+def _epochs_data(epochs, **kwargs):
+    """Convert `neo.Epoch` objects to a `pandas.DataFrame` without column
+    index.
+
+    Any keyword arguments are passed to `_epoch_data`.
+    """
+    return pd.concat([_epoch_data(epoch, **kwargs) for epoch in epochs],
+                     axis=1)
+
+
+def _spiketrains_to_padded_array(spiketrains, time_units='s',
+                                 dtype='float64'):
+    """Put the times of `neo.SpikeTrain` objects in a single NaN-padded array.
+
+    Parameters
+    ----------
+
+    spiketrains : list of neo SpikeTrain
+                  The SpikeTrains to convert.
+    time_units : str or quantities.Quantity, optional
+                 The units of the spike times.  Default is seconds.
+    dtype : str or NumPy dtype, optional
+            The dtype of `values`.  Default is `'float64'`.
+
+    Returns
+    -------
+
+    values : 2D NumPy array of floats
+             The spike times in `time_units`, with one column per spiketrain.
+             Columns are padded to the same length with `NaN` values.
+    index : pandas Index
+            The spike numbers, named `spike_number`.
+
+    """
+    maxlen = max(len(train) for train in spiketrains)
+    values = np.empty((maxlen, len(spiketrains)), dtype=dtype)
+    values.fill(np.nan)
+    for i, train in enumerate(spiketrains):
+        values[:len(train), i] = _time_magnitude(train, time_units=time_units,
+                                                 copy=False)
+    index = pd.Index(np.arange(maxlen), name='spike_number')
+    return values, index
+
+
+def _spiketrains_data(spiketrains, **kwargs):
+    """Convert `neo.SpikeTrain` objects to a `pandas.DataFrame` without
+    column index.
+
+    Any keyword arguments are passed to `_spiketrains_to_padded_array`.
+    """
+    values, index = _spiketrains_to_padded_array(spiketrains, **kwargs)
+    return pd.DataFrame(values, index=index)
+
+
+def _multi_objs_to_dataframe(container, data_func, get_func,
+                             parents=True, child_first=True, **kwargs):
     """Convert one or more of a given `neo` object to a `pandas.DataFrame`.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -338,6 +667,12 @@ def _multi_objs_to_dataframe(container, conv_func, get_func,
 
     container : list, tuple, iterable, dict, neo container object
                 The container for the objects to convert.
+    data_func : function
+                The function that converts a list of objects to a
+                `pandas.DataFrame` with one column per object, in order.
+                The column labels it uses are replaced.
+    get_func : function
+               The function that gets the objects from `container`.
     parents : bool, optional
               Also include attributes and annotations from parent neo
               objects (if any).
@@ -346,6 +681,7 @@ def _multi_objs_to_dataframe(container, conv_func, get_func,
                   over parent attributes in the event of a name conflict.
                   If False, parent attributes are used.
                   This parameter does nothing if `parents` is False.
+    Any additional keyword arguments are passed to `data_func`.
 
     Returns
     -------
@@ -353,6 +689,13 @@ def _multi_objs_to_dataframe(container, conv_func, get_func,
     pandas DataFrame
         A DataFrame containing the converted objects.
 
+    Notes
+    -----
+
+    The objects are grouped by their set of attribute and annotation names,
+    and `data_func` and the column index are called once for each group
+    rather than once for each object.
+
     Attributes that contain non-scalar values are skipped.  So are
     annotations or attributes containing a value of `None`.
 
@@ -362,13 +705,91 @@ def _multi_objs_to_dataframe(container, conv_func, get_func,
     the units.
 
     """
-    res = pd.concat([conv_func(obj, parents=parents, child_first=child_first)
-                     for obj in get_func(container)], axis=1)
-    return _sort_inds(res, axis=1)
+    objs = get_func(container)
+    with stage('attribute extraction', len(objs)):
+        attrs = [_extract_neo_attrs_safe(obj, parents=parents,
+                                         child_first=child_first)
+                 for obj in objs]
+
+    frames = []
+    for inds in _group_by_keys(attrs):
+        with stage('dataframe building', len(inds)):
+            res = data_func([objs[i] for i in inds], **kwargs)
+        with stage('column index building', len(inds)):
+            res.columns = _multiindex_from_dicts([attrs[i] for i in inds])
+        frames.append(res)
+
+    with stage('dataframe building', len(frames)):
+        if len(frames) == 1:
+            res = frames[0]
+        else:
+            res = pd.concat(frames, axis=1)
+        return _sort_inds(res, axis=1)
+
+
+def _spiketrains_to_tidy_dataframes(spiketrains,
+                                    parents=True, child_first=True,
+                                    time_units='s', dtype='float64'):
+    """Convert `neo.SpikeTrain` objects to a tidy `pandas.DataFrame`.
+
+    This is the implementation of the `tidy` mode of
+    `multi_spiketrains_to_dataframe`.
+
+    Parameters
+    ----------
+
+    spiketrains : list of neo SpikeTrain
+                  The SpikeTrains to convert.
+    parents : bool, optional
+              Also include attributes and annotations from parent neo
+              objects (if any).
+    child_first : bool, optional
+                  If True (default True), values of child attributes are used
+                  over parent attributes in the event of a name conflict.
+                  If False, parent attributes are used.
+                  This parameter does nothing if `parents` is False.
+    time_units : str or quantities.Quantity, optional
+                 The units of the spike times.  Default is seconds.
+    dtype : str or NumPy dtype, optional
+            The dtype of the spike times.  Default is `'float64'`.
+
+    Returns
+    -------
+
+    spikes : pandas DataFrame
+             A DataFrame with one row per spike and a `times` column.
+    trains : pandas DataFrame
+             A DataFrame with one row per spiketrain and one column per
+             attribute or annotation.
+
+    """
+    attrs = [_extract_neo_attrs_safe(train,
+                                     parents=parents, child_first=child_first)
+             for train in spiketrains]
+    lens = np.array([len(train) for train in spiketrains], dtype='int64')
+    offsets = np.cumsum(lens) - lens
+
+    times = [_time_magnitude(train, time_units=time_units, dtype=dtype,
+                             copy=False)
+             for train in spiketrains]
+    times = np.concatenate(times + [np.array([], dtype=dtype)])
+
+    trainind = np.arange(len(spiketrains), dtype='int64')
+    spikeind = np.arange(lens.sum(), dtype='int64') - np.repeat(offsets, lens)
+    index = pd.MultiIndex.from_arrays([np.repeat(trainind, lens), spikeind],
+                                      names=['train', 'spike_number'])
+    spikes = pd.DataFrame({'times': times}, index=index)
 
+    trains = pd.DataFrame(attrs, index=pd.Index(trainind, name='train'))
+    trains = trains.reindex(columns=sorted(trains.columns))
+    return spikes, trains
 
+
+@instrument
 def multi_spiketrains_to_dataframe(container,
-                                   parents=True, child_first=True):
+                                   parents=True, child_first=True,
+                                   tidy=False, time_units='s',
+                                   dtype='float64'):
     """Convert one or more `neo.SpikeTrain` objects to a `pandas.DataFrame`.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -378,8 +799,8 @@ def multi_spiketrains_to_dataframe(container,
     list of blocks).
 
     The `pandas.DataFrame` object has one column for each spiketrain, with each
-    element being the spike time converted to a `float` value in seconds.
-    columns are padded to the same length with `NaN` values.
+    element being the spike time converted to a `float` value in seconds (or
+    `time_units`).  columns are padded to the same length with `NaN` values.
 
     The column heading is a `pandas.MultiIndex` with one index
     for each of the scalar attributes and annotations of the respective
@@ -400,11 +821,25 @@ def multi_spiketrains_to_dataframe(container,
                   If False, parent attributes are used.
                   This parameter does nothing if `parents` is False.
 
+    tidy : bool, optional
+           If True (default False), return the spikes in a long format with
+           one row per spike, and the attributes and annotations in a
+           separate DataFrame with one row per spiketrain.  See Notes.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
+
     Returns
     -------
 
     pandas DataFrame
         A DataFrame containing the spike times from `container`.
+        If `tidy` is True, this is instead a tuple of two DataFrames,
+        `spikes` and `trains`.
 
     Notes
     -----
@@ -419,14 +854,34 @@ def multi_spiketrains_to_dataframe(container,
     element is the scalar value and the second is the string representation of
     the units.
 
+    With `tidy`, no padding is needed, so memory scales with the total number
+    of spikes rather than the number of spiketrains times the length of the
+    longest one.  `spikes` has a single column, `times`, containing the spike
+    times, and a `pandas.MultiIndex` index with the levels `train`
+    and `spike_number`.  `trains` has one column for each attribute or
+    annotation name, with a value of `NaN` if a spiketrain does not have it,
+    and an index named `train`.  The `train` values are the positions of
+    the spiketrains in the list returned by
+    `elephant.neo_tools.get_all_spiketrains`, and match between the two
+    DataFrames.
+
     """
+    if tidy:
+        return _spiketrains_to_tidy_dataframes(get_all_spiketrains(container),
+                                               parents=parents,
+                                               child_first=child_first,
+                                               time_units=time_units,
+                                               dtype=dtype)
     return _multi_objs_to_dataframe(container,
-                                    spiketrain_to_dataframe,
-                                    get_all_spiketrains,
-                                    parents=parents, child_first=child_first)
+                                    _spiketrains_data, get_all_spiketrains,
+                                    parents=parents, child_first=child_first,
+                                    time_units=time_units, dtype=dtype)
 
 
-def multi_events_to_dataframe(container, parents=True, child_first=True):
+@instrument
+def multi_events_to_dataframe(container, parents=True, child_first=True,
+                              categorical=True, time_units='s',
+                              dtype='float64'):
     """Convert one or more `neo.Event` objects to a `pandas.DataFrame`.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -455,6 +910,19 @@ def multi_events_to_dataframe(container, parents=True, child_first=True):
                   over parent attributes in the event of a name conflict.
                   If False, parent attributes are used.
                   This parameter does nothing if `parents` is False.
+    categorical : bool, optional
+                  If True (default), store the labels as
+                  `pandas.Categorical` columns, which use much less memory
+                  for repetitive labels.  All columns share the same
+                  categories: the sorted unique labels of all the events.
+                  If False, store them as strings.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
 
     Returns
     -------
@@ -480,12 +948,20 @@ def multi_events_to_dataframe(container, parents=True, child_first=True):
     the units.
 
     """
-    return _multi_objs_to_dataframe(container,
-                                    event_to_dataframe, get_all_events,
-                                    parents=parents, child_first=child_first)
-
-
-def multi_epochs_to_dataframe(container, parents=True, child_first=True):
+    objs = get_all_events(container)
+    if categorical is True:
+        categorical = _label_categories(objs)
+    return _multi_objs_to_dataframe(objs,
+                                    _events_data, get_all_events,
+                                    parents=parents, child_first=child_first,
+                                    categorical=categorical,
+                                    time_units=time_units, dtype=dtype)
+
+
+@instrument
+def multi_epochs_to_dataframe(container, parents=True, child_first=True,
+                              categorical=True, time_units='s',
+                              dtype='float64'):
     """Convert one or more `neo.Epoch` objects to a `pandas.DataFrame`.
 
     The objects can be any list, dict, or other iterable or mapping containing
@@ -516,6 +992,19 @@ def multi_epochs_to_dataframe(container, parents=True, child_first=True):
                   over parent attributes in the event of a name conflict.
                   If False, parent attributes are used.
                   This parameter does nothing if `parents` is False.
+    categorical : bool, optional
+                  If True (default), store the labels as
+                  `pandas.Categorical` columns, which use much less memory
+                  for repetitive labels.  All columns share the same
+                  categories: the sorted unique labels of all the epochs.
+                  If False, store them as strings.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
 
     Returns
     -------
@@ -542,12 +1031,286 @@ def multi_epochs_to_dataframe(container, parents=True, child_first=True):
     the units.
 
     """
-    return _multi_objs_to_dataframe(container,
-                                    epoch_to_dataframe, get_all_epochs,
-                                    parents=parents, child_first=child_first)
+    objs = get_all_epochs(container)
+    if categorical is True:
+        categorical = _label_categories(objs)
+    return _multi_objs_to_dataframe(objs,
+                                    _epochs_data, get_all_epochs,
+                                    parents=parents, child_first=child_first,
+                                    categorical=categorical,
+                                    time_units=time_units, dtype=dtype)
+
+
+def _chunk_objs(objs, chunksize=None):
+    """Split a list of `neo` objects into chunks.
+
+    Parameters
+    ----------
+
+    objs : list of neo objects
+           The objects to split.
+    chunksize : int, optional
+                The maximum number of objects in each chunk.
+                If not specified, put the objects from each `neo.Segment`
+                in their own chunk, in the order the segments are first
+                found.  Objects without a segment are put in one chunk.
+
+    Returns
+    -------
+
+    list of lists of neo objects
+
+    """
+    if chunksize is not None:
+        return [objs[i:i+chunksize] for i in range(0, len(objs), chunksize)]
+
+    chunks = {}
+    order = []
+    for obj in objs:
+        key = id(getattr(obj, 'segment', None))
+        if key not in chunks:
+            chunks[key] = []
+            order.append(key)
+        chunks[key].append(obj)
+    return [chunks[key] for key in order]
+
+
+def _iter_multi_objs_to_dataframe(container, multi_func, get_func,
+                                  chunksize=None, **kwargs):
+    """Convert `neo` objects to one `pandas.DataFrame` per chunk.
+
+    Parameters
+    ----------
+
+    container : list, tuple, iterable, dict, neo container object
+                The container for the objects to convert.
+    multi_func : function
+                 The function that converts a list of objects to a
+                 `pandas.DataFrame`.
+    get_func : function
+               The function that gets the objects from `container`.
+    chunksize : int, optional
+                The maximum number of objects in each DataFrame.
+                If not specified, there is one DataFrame per `neo.Segment`.
+    Any additional keyword arguments are passed to `multi_func`.
+
+    Returns
+    -------
+
+    generator of pandas DataFrame
+
+    """
+    for objs in _chunk_objs(get_func(container), chunksize=chunksize):
+        yield multi_func(objs, **kwargs)
+
+
+def iter_multi_spiketrains_to_dataframe(container, chunksize=None,
+                                        parents=True, child_first=True,
+                                        time_units='s', dtype='float64'):
+    """Convert `neo.SpikeTrain` objects to `pandas.DataFrame` in chunks.
+
+    This is the same as `multi_spiketrains_to_dataframe`, except that a
+    separate DataFrame is created for the spiketrains in each `neo.Segment`
+    or for every `chunksize` spiketrains, and these are yielded one at a time.
+    This keeps the memory needed for large containers bounded.
+
+    Parameters
+    ----------
+
+    container : list, tuple, iterable, dict,
+                neo Block, neo Segment, neo Unit, neo RecordingChannelGroup
+                The container for the spiketrains to convert.
+    chunksize : int, optional
+                The maximum number of spiketrains in each DataFrame.
+                If not specified, there is one DataFrame per `neo.Segment`,
+                with spiketrains without a segment put together.
+    parents : bool, optional
+              Also include attributes and annotations from parent neo
+              objects (if any).
+    child_first : bool, optional
+                  If True (default True), values of child attributes are used
+                  over parent attributes in the event of a name conflict.
+                  If False, parent attributes are used.
+                  This parameter does nothing if `parents` is False.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
+
+    Returns
+    -------
+
+    generator of pandas DataFrame
+        The DataFrames containing the spike times from `container`, as
+        returned by `multi_spiketrains_to_dataframe`.
+
+    """
+    return _iter_multi_objs_to_dataframe(container,
+                                         multi_spiketrains_to_dataframe,
+                                         get_all_spiketrains,
+                                         chunksize=chunksize,
+                                         parents=parents,
+                                         child_first=child_first,
+                                         time_units=time_units, dtype=dtype)
+
+
+def iter_multi_events_to_dataframe(container, chunksize=None,
+                                   parents=True, child_first=True,
+                                   categorical=True, time_units='s',
+                                   dtype='float64'):
+    """Convert `neo.Event` objects to `pandas.DataFrame` in chunks.
+
+    This is the same as `multi_events_to_dataframe`, except that a
+    separate DataFrame is created for the events in each `neo.Segment`
+    or for every `chunksize` events, and these are yielded one at a time.
+    This keeps the memory needed for large containers bounded.
+
+    Parameters
+    ----------
+
+    container : list, tuple, iterable, dict, neo Block, neo Segment
+                The container for the events to convert.
+    chunksize : int, optional
+                The maximum number of events in each DataFrame.
+                If not specified, there is one DataFrame per `neo.Segment`,
+                with events without a segment put together.
+    parents : bool, optional
+              Also include attributes and annotations from parent neo
+              objects (if any).
+    child_first : bool, optional
+                  If True (default True), values of child attributes are used
+                  over parent attributes in the event of a name conflict.
+                  If False, parent attributes are used.
+                  This parameter does nothing if `parents` is False.
+    categorical : bool, optional
+                  If True (default), store the labels as
+                  `pandas.Categorical` columns.  All DataFrames share the
+                  same categories: the sorted unique labels of all the
+                  events in `container`.
+                  If False, store them as strings.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
+
+    Returns
+    -------
+
+    generator of pandas DataFrame
+        The DataFrames containing the labels from `container`, as
+        returned by `multi_events_to_dataframe`.
+
+    """
+    if categorical is True:
+        categorical = _label_categories(get_all_events(container))
+    return _iter_multi_objs_to_dataframe(container,
+                                         multi_events_to_dataframe,
+                                         get_all_events,
+                                         chunksize=chunksize,
+                                         parents=parents,
+                                         child_first=child_first,
+                                         categorical=categorical,
+                                         time_units=time_units, dtype=dtype)
+
+
+def iter_multi_epochs_to_dataframe(container, chunksize=None,
+                                   parents=True, child_first=True,
+                                   categorical=True, time_units='s',
+                                   dtype='float64'):
+    """Convert `neo.Epoch` objects to `pandas.DataFrame` in chunks.
+
+    This is the same as `multi_epochs_to_dataframe`, except that a
+    separate DataFrame is created for the epochs in each `neo.Segment`
+    or for every `chunksize` epochs, and these are yielded one at a time.
+    This keeps the memory needed for large containers bounded.
+
+    Parameters
+    ----------
 
+    container : list, tuple, iterable, dict, neo Block, neo Segment
+                The container for the epochs to convert.
+    chunksize : int, optional
+                The maximum number of epochs in each DataFrame.
+                If not specified, there is one DataFrame per `neo.Segment`,
+                with epochs without a segment put together.
+    parents : bool, optional
+              Also include attributes and annotations from parent neo
+              objects (if any).
+    child_first : bool, optional
+                  If True (default True), values of child attributes are used
+                  over parent attributes in the event of a name conflict.
+                  If False, parent attributes are used.
+                  This parameter does nothing if `parents` is False.
+    categorical : bool, optional
+                  If True (default), store the labels as
+                  `pandas.Categorical` columns.  All DataFrames share the
+                  same categories: the sorted unique labels of all the
+                  epochs in `container`.
+                  If False, store them as strings.
+    time_units : str or quantities.Quantity, optional
+                 The units of the stored times.  Default is seconds.
+                 Times that are already in these units are not rescaled.
+    dtype : str or NumPy dtype, optional
+            The floating-point type of the stored times.  Default is
+            `'float64'`.  `'float32'` uses half the memory, with a precision
+            of about 7 significant digits.
+
+    Returns
+    -------
+
+    generator of pandas DataFrame
+        The DataFrames containing the labels from `container`, as
+        returned by `multi_epochs_to_dataframe`.
+
+    """
+    if categorical is True:
+        categorical = _label_categories(get_all_epochs(container))
+    return _iter_multi_objs_to_dataframe(container,
+                                         multi_epochs_to_dataframe,
+                                         get_all_epochs,
+                                         chunksize=chunksize,
+                                         parents=parents,
+                                         child_first=child_first,
+                                         categorical=categorical,
+                                         time_units=time_units, dtype=dtype)
 
-def slice_spiketrain(pdobj, t_start=None, t_stop=None):
+
+def _set_level_value(index, name, value):
+    """Set every value of one level of a `pandas.MultiIndex`.
+
+    Parameters
+    ----------
+    index : pandas MultiIndex
+            The index to change.
+    name : str
+           The name of the level to change.
+    value : any
+            The new value of every element of that level.
+
+    Returns
+    -------
+    pandas MultiIndex
+        A new index, identical to `index` except for the level `name`.
+        The order of elements and levels is unchanged.
+
+    """
+    ilevel = index.names.index(name)
+    levels = list(index.levels)
+    labels = list(index.labels)
+    levels[ilevel] = [value]
+    labels[ilevel] = np.zeros(len(index), dtype='int64')
+    return pd.MultiIndex(levels=levels, labels=labels, names=index.names,
+                         verify_integrity=False)
+
+
+@instrument
+def slice_spiketrain(pdobj, t_start=None, t_stop=None, inplace=False):
     """Slice a `pandas.DataFrame`, changing indices appropriately.
 
     Values outside the sliced range are converted to `NaN` values.
@@ -569,44 +1332,1187 @@ def slice_spiketrain(pdobj, t_start=None, t_stop=None):
              If specified, the returned DataFrame values greater than this set
              to `NaN`.
              Default is `None` (do not use this argument).
+    inplace : bool, optional
+              If True (default False), modify `pdobj` in-place and return
+              `None`.
 
     Returns
     -------
 
-    pdobj : scalar, pandas Series, DataFrame, or Panel
-            The returned data type is the same as the type of `pdobj`
+    pdobj : pandas DataFrame or None
+            A sliced copy of `pdobj`, or `None` if `inplace` is True.
 
     Note
     ----
 
-    The order of the index and/or column levels of the returned object may
-    differ  from the order of the original.
-
     If `t_start` or `t_stop` is specified, all columns indexes will be changed
     to  the respective values, including those already within the new range.
     If `t_start` or `t_stop` is not specified, those column indexes will not
     be changed.
 
-    Returns a copy, even if `t_start` and `t_stop` are both `None`.
+    The values are masked in a single vectorized operation and only the
+    `t_start` and `t_stop` column index levels are rewritten, so the order of
+    the columns and column index levels is the same as in `pdobj`.
+
+    Unless `inplace` is True, `pdobj` is never modified, and a copy is
+    returned even if `t_start` and `t_stop` are both `None`.
 
     """
     if t_start is None and t_stop is None:
-        return pdobj.copy()
+        return None if inplace else pdobj.copy()
 
-    if t_stop is not None:
-        pdobj[pdobj > t_stop] = np.nan
-
-        pdobj = pdobj.T.reset_index(level='t_stop')
-        pdobj['t_stop'] = t_stop
-        pdobj = pdobj.set_index('t_stop', append=True).T
-        pdobj = _sort_inds(pdobj, axis=1)
+    values = pdobj.values
+    mask = np.zeros(values.shape, dtype='bool')
+    with np.errstate(invalid='ignore'):
+        if t_start is not None:
+            mask |= values < t_start
+        if t_stop is not None:
+            mask |= values > t_stop
 
+    columns = pdobj.columns
     if t_start is not None:
-        pdobj[pdobj < t_start] = np.nan
+        columns = _set_level_value(columns, 't_start', t_start)
+    if t_stop is not None:
+        columns = _set_level_value(columns, 't_stop', t_stop)
 
-        pdobj = pdobj.T.reset_index(level='t_start')
-        pdobj['t_start'] = t_start
-        pdobj = pdobj.set_index('t_start', append=True).T
-        pdobj = _sort_inds(pdobj, axis=1)
+    if inplace:
+        pdobj.mask(mask, inplace=True)
+        pdobj.columns = columns
+        return None
 
-    return pdobj
+    values = np.where(mask, np.nan, values)
+    return pd.DataFrame(values, index=pdobj.index, columns=columns)
+
+
+def _dataframe_values(pdobj):
+    """Get the values of a `pandas.DataFrame` and which of them are present.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The DataFrame, as returned by one of the converters in this
+            module.
+
+    Returns
+    -------
+
+    values : 2D NumPy array
+             The values of `pdobj`.  If all columns are categorical, these
+             are instead the category codes, using `categories`.
+    mask : 2D NumPy array of bools
+           True where `values` is not a `NaN` padding value.
+    categories : pandas Index or None
+                 The categories shared by all columns, or `None` if the
+                 columns are not all categorical.
+
+    """
+    ncols = len(pdobj.columns)
+    dtypes = pdobj.dtypes.values
+    categorical = ncols > 0 and all(dtype.name == 'category'
+                                    for dtype in dtypes)
+    if not categorical:
+        values = pdobj.values
+        return values, pd.notnull(values), None
+
+    categories = pdobj.iloc[:, 0].cat.categories
+    if not all(pdobj.iloc[:, i].cat.categories.equals(categories)
+               for i in range(1, ncols)):
+        categories = pd.Index(np.unique(pdobj.stack().values))
+    values = np.column_stack([pd.Categorical(pdobj.iloc[:, i],
+                                             categories=categories).codes
+                              for i in range(ncols)])
+    return values, values >= 0, categories
+
+
+def _is_missing(value):
+    """Return True if `value` is a `None` or `NaN` column index value."""
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+def _quantity_from_value_safe(value, units=None):
+    """Restore a `quantities.Quantity` converted by `_convert_value_safe`.
+
+    Values that are not a `(value, units)` tuple are taken to be in `units`,
+    or returned unchanged if `units` is `None`.  Values that already have
+    units are returned unchanged.
+    """
+    if hasattr(value, 'units'):
+        return value
+    if (isinstance(value, tuple) and len(value) == 2 and
+            hasattr(value[1], 'lower')):
+        return pq.Quantity(value[0], value[1])
+    if units is None:
+        return value
+    return pq.Quantity(value, units)
+
+
+def _multiindex_to_attrs(columns, cls):
+    """Get the attributes and annotations for each column of a DataFrame.
+
+    Parameters
+    ----------
+
+    columns : pandas MultiIndex
+              The column index, as created by the converters in this module.
+    cls : class
+          The neo class the columns belong to.
+
+    Returns
+    -------
+
+    list of dict
+        For each column, the keyword arguments for `cls`.  Index levels with
+        the name of an attribute of `cls` are used for that attribute, with
+        `quantities.Quantity` attributes restored from their tuple form.
+        All other levels become annotations.  Missing values and unnamed
+        levels, such as that of `_default_multiindex`, are skipped.
+
+    """
+    attrtypes = dict((attr[0], attr[1]) for attr in
+                     cls._necessary_attrs + cls._recommended_attrs)
+    names = [None if name is None else str(name) for name in columns.names]
+    res = []
+    for col in columns.tolist():
+        if not isinstance(col, tuple):
+            col = (col,)
+        kwargs = {}
+        for name, value in zip(names, col):
+            if name is None or _is_missing(value):
+                continue
+            if attrtypes.get(name) is pq.Quantity:
+                value = _quantity_from_value_safe(value)
+            kwargs[name] = value
+        res.append(kwargs)
+    return res
+
+
+def _split_dataframe(pdobj):
+    """Remove the `NaN` padding from a `pandas.DataFrame` in one step.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The DataFrame, as returned by one of the converters in this
+            module.
+
+    Returns
+    -------
+
+    values : 1D NumPy array
+             The non-padding values of all columns, concatenated in column
+             order.  For categorical columns, these are the labels.
+    rowind : 1D NumPy array of ints
+             The row of each element of `values`.
+    offsets : 1D NumPy array of ints
+              The start of each column in `values`, plus the total length,
+              so column `i` is `values[offsets[i]:offsets[i+1]]`.
+
+    """
+    values, mask, categories = _dataframe_values(pdobj)
+    rowind = np.nonzero(mask.T)[1]
+    values = values.T[mask.T]
+    if categories is not None:
+        values = categories.values[values]
+    offsets = np.concatenate([[0], np.cumsum(mask.sum(axis=0))])
+    return values, rowind, offsets.astype('int64')
+
+
+@instrument
+def dataframe_to_spiketrains(pdobj, units=None, time_units='s'):
+    """Convert a `pandas.DataFrame` back to `neo.SpikeTrain` objects.
+
+    This is the reverse of `multi_spiketrains_to_dataframe` and
+    `spiketrain_to_dataframe`.  Each column becomes one SpikeTrain, with the
+    `NaN` padding removed.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The DataFrame to convert.
+    units : str or quantities.Quantity, optional
+            The units of the SpikeTrains.  If not specified, the units of the
+            `t_start` (or else `t_stop`) column index level of each column
+            are used, or `time_units` if neither has units.
+    time_units : str or quantities.Quantity, optional
+                 The units of the times in `pdobj`, as given to
+                 `multi_spiketrains_to_dataframe`.  Default is seconds.
+
+    Returns
+    -------
+
+    list of neo SpikeTrain
+        The SpikeTrains, in the same order as the columns of `pdobj`.
+
+    Notes
+    -----
+
+    Column index levels named after a SpikeTrain attribute are used for that
+    attribute, all others become annotations.  So with the default
+    `parents=True` of the forward conversion, attributes of parent objects
+    become annotations of the SpikeTrains.
+
+    `t_start` and `t_stop` values without units, such as those set by
+    `slice_spiketrain`, are taken to be in `time_units`.  If there is no
+    `t_stop` level, the last spike time is used.
+
+    The padding of all columns is removed with a single mask, and the times
+    of all SpikeTrains are views into one array rather than separate copies.
+
+    """
+    times, _, offsets = _split_dataframe(pdobj)
+    attrs = _multiindex_to_attrs(pdobj.columns, SpikeTrain)
+
+    allunits = []
+    for kwargs in attrs:
+        for attr in ('t_start', 't_stop'):
+            if attr in kwargs:
+                kwargs[attr] = _quantity_from_value_safe(kwargs[attr],
+                                                         time_units)
+        if units is not None:
+            allunits.append(units)
+        elif hasattr(kwargs.get('t_start'), 'units'):
+            allunits.append(kwargs['t_start'].units)
+        elif hasattr(kwargs.get('t_stop'), 'units'):
+            allunits.append(kwargs['t_stop'].units)
+        else:
+            allunits.append(time_units)
+
+    factors = np.array([rescale_factor(time_units, iunits)
+                        for iunits in allunits])
+    if (factors != 1).any():
+        times *= np.repeat(factors, np.diff(offsets))
+
+    res = []
+    for i, kwargs in enumerate(attrs):
+        itimes = times[offsets[i]:offsets[i+1]]
+        if 't_stop' not in kwargs:
+            kwargs['t_stop'] = itimes.max() if len(itimes) else 0.
+        res.append(SpikeTrain(itimes, units=allunits[i], copy=False,
+                              **kwargs))
+    return res
+
+
+def _dataframe_to_labeled_objs(pdobj, cls, units='s', time_units='s'):
+    """Convert a `pandas.DataFrame` back to `neo.Event` or `neo.Epoch`.
+
+    This is the implementation of `dataframe_to_events` and
+    `dataframe_to_epochs`.
+    """
+    labels, rowind, offsets = _split_dataframe(pdobj)
+    labels = labels.astype('U')
+    attrs = _multiindex_to_attrs(pdobj.columns, cls)
+    factor = rescale_factor(time_units, units)
+
+    arrs = {}
+    for name in pdobj.index.names:
+        level = pdobj.index.get_level_values(name).values[rowind]
+        arrs[name] = level * factor if factor != 1 else level
+
+    res = []
+    for i, kwargs in enumerate(attrs):
+        ind = slice(offsets[i], offsets[i+1])
+        for name, arr in arrs.items():
+            kwargs[name] = pq.Quantity(arr[ind], units, copy=False)
+        res.append(cls(labels=labels[ind], units=units, **kwargs))
+    return res
+
+
+@instrument
+def dataframe_to_events(pdobj, units='s', time_units='s'):
+    """Convert a `pandas.DataFrame` back to `neo.Event` objects.
+
+    This is the reverse of `multi_events_to_dataframe` and
+    `event_to_dataframe`.  Each column becomes one Event, with the
+    `NaN` padding removed.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The DataFrame to convert, with the labels as values and the
+            times as index.
+    units : str or quantities.Quantity, optional
+            The units of the Events.  Default is seconds.
+    time_units : str or quantities.Quantity, optional
+                 The units of the times in `pdobj`, as given to
+                 `multi_events_to_dataframe`.  Default is seconds.
+
+    Returns
+    -------
+
+    list of neo Event
+        The Events, in the same order as the columns of `pdobj`.
+
+    Notes
+    -----
+
+    Column index levels named after an Event attribute are used for that
+    attribute, all others become annotations.
+
+    Categorical and string labels are both accepted.
+
+    """
+    return _dataframe_to_labeled_objs(pdobj, Event, units=units,
+                                      time_units=time_units)
+
+
+@instrument
+def dataframe_to_epochs(pdobj, units='s', time_units='s'):
+    """Convert a `pandas.DataFrame` back to `neo.Epoch` objects.
+
+    This is the reverse of `multi_epochs_to_dataframe` and
+    `epoch_to_dataframe`.  Each column becomes one Epoch, with the
+    `NaN` padding removed.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The DataFrame to convert, with the labels as values and the
+            times and durations as index.
+    units : str or quantities.Quantity, optional
+            The units of the Epochs.  Default is seconds.
+    time_units : str or quantities.Quantity, optional
+                 The units of the times in `pdobj`, as given to
+                 `multi_epochs_to_dataframe`.  Default is seconds.
+
+    Returns
+    -------
+
+    list of neo Epoch
+        The Epochs, in the same order as the columns of `pdobj`.
+
+    Notes
+    -----
+
+    Column index levels named after an Epoch attribute are used for that
+    attribute, all others become annotations.
+
+    Categorical and string labels are both accepted.
+
+    """
+    return _dataframe_to_labeled_objs(pdobj, Epoch, units=units,
+                                      time_units=time_units)
+
+
+@instrument
+def assign_spikes_to_epochs(spiketrains, epochs, how='left'):
+    """Find the epochs that each spike of a `pandas.DataFrame` falls in.
+
+    This joins the spike times from `multi_spiketrains_to_dataframe` with the
+    time intervals from `multi_epochs_to_dataframe`.
+
+    Parameters
+    ----------
+
+    spiketrains : pandas DataFrame
+                  The spike times, as returned by
+                  `multi_spiketrains_to_dataframe`.
+    epochs : pandas DataFrame
+             The epochs, as returned by `multi_epochs_to_dataframe`, in the
+             same time units as `spiketrains`.
+    how : str, optional
+          If `'left'` (default), spikes that are not in any epoch are kept
+          with missing epoch values.  If `'inner'`, they are dropped.
+
+    Returns
+    -------
+
+    pandas DataFrame
+        A DataFrame with one row for each spike and epoch it falls in.
+        The index is a `pandas.MultiIndex` with the levels `train` (the
+        position of the spiketrain column in `spiketrains`) and
+        `spike_number`.  The columns are:
+
+        `times` : the spike time.
+        `epoch` : the position of the epoch column in `epochs`, or `-1`.
+        `epoch_times` : the start time of the epoch.
+        `epoch_durations` : the duration of the epoch.
+        `labels` : the label of the epoch.
+
+    Notes
+    -----
+
+    A spike falls in an epoch if `times <= spike < times + durations`, so a
+    spike at the boundary of two consecutive epochs is only assigned to the
+    second one.
+
+    Spikes that fall in several overlapping epochs get one row for each of
+    them, ordered by epoch start time.  Otherwise the rows are in the order
+    of the spikes in `spiketrains`.
+
+    All epochs in `epochs` are used for all spiketrains, so the spiketrains
+    and epochs of different segments should be joined separately.
+
+    The spike times are sorted once, and the spikes in each epoch are found
+    with two binary searches over them, so the cost scales with the number
+    of spikes and epochs rather than their product.
+
+    Raises
+    ------
+
+    ValueError
+        If `how` is not `'left'` or `'inner'`.
+
+    """
+    if how not in ('left', 'inner'):
+        raise ValueError('Unknown join type %s' % how)
+
+    times, spikenum, offsets = _split_dataframe(spiketrains)
+    trainind = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+    labels, mask, categories = _dataframe_values(epochs)
+    epochind, rowind = np.nonzero(mask.T)
+    labels = labels.T[mask.T]
+    starts = epochs.index.get_level_values('times').values[rowind]
+    durs = epochs.index.get_level_values('durations').values[rowind]
+
+    order = np.argsort(times, kind='mergesort')
+    lower = np.searchsorted(times[order], starts, side='left')
+    upper = np.searchsorted(times[order], starts + durs, side='left')
+    counts = np.maximum(upper - lower, 0)
+    pairepoch = np.repeat(np.arange(len(starts)), counts)
+    pairspike = order[np.arange(counts.sum()) -
+                      np.repeat(np.cumsum(counts) - counts - lower, counts)]
+
+    if how == 'left':
+        matched = np.zeros(len(times), dtype='bool')
+        matched[pairspike] = True
+        unmatched = np.nonzero(~matched)[0]
+        pairspike = np.concatenate([pairspike, unmatched])
+        pairepoch = np.concatenate([pairepoch,
+                                    -np.ones(len(unmatched), dtype='int64')])
+
+    # an index of -1 selects the missing value appended to each array
+    starts = np.append(starts, np.nan)[pairepoch]
+    sortind = np.lexsort((starts, pairspike))
+    pairspike = pairspike[sortind]
+    pairepoch = pairepoch[sortind]
+
+    if categories is None:
+        labels = np.append(labels.astype('O'), np.nan)[pairepoch]
+    else:
+        labels = pd.Categorical.from_codes(np.append(labels, -1)[pairepoch],
+                                           categories)
+
+    index = pd.MultiIndex.from_arrays([trainind[pairspike],
+                                       spikenum[pairspike]],
+                                      names=['train', 'spike_number'])
+    data = {'times': times[pairspike],
+            'epoch': np.append(epochind, -1)[pairepoch],
+            'epoch_times': starts[sortind],
+            'epoch_durations': np.append(durs, np.nan)[pairepoch],
+            'labels': labels}
+    return pd.DataFrame(data, index=index,
+                        columns=['times', 'epoch', 'epoch_times',
+                                 'epoch_durations', 'labels'])
+
+
+def _window_bounds(times, trainind, ntrains, starts, stops):
+    """Find the spikes of every spiketrain within every window.
+
+    Parameters
+    ----------
+
+    times : 1D NumPy array of floats
+            The spike times of all spiketrains, sorted by spiketrain and then
+            by time.
+    trainind : 1D NumPy array of ints
+               The spiketrain of each spike, in increasing order.
+    ntrains : int
+              The number of spiketrains.
+    starts, stops : 1D NumPy arrays of floats
+                    The start and stop of each window, both inclusive.
+
+    Returns
+    -------
+
+    lower : 1D NumPy array of ints
+            For spiketrain `i` and window `j`, at position
+            `i * len(starts) + j`, the index in `times` of the first spike in
+            the window.
+    upper : 1D NumPy array of ints
+            The index in `times` after the last spike in the window, in the
+            same order as `lower`.
+
+    Notes
+    -----
+
+    This is the same as calling `np.searchsorted` on the times of each
+    spiketrain, but the spikes and window bounds of all spiketrains are
+    sorted together in one step.  At equal times, starts are put before the
+    spikes and stops after them, so both bounds are inclusive.
+
+    """
+    nqueries = ntrains * len(starts)
+    qtrains = np.repeat(np.arange(ntrains), len(starts))
+    order = np.lexsort((
+        np.concatenate([np.zeros(nqueries, dtype='int8'),
+                        np.ones(len(times), dtype='int8'),
+                        np.full(nqueries, 2, dtype='int8')]),
+        np.concatenate([np.tile(starts, ntrains), times,
+                        np.tile(stops, ntrains)]),
+        np.concatenate([qtrains, trainind, qtrains])))
+    isspike = (order >= nqueries) & (order < nqueries + len(times))
+    # the number of spikes sorted before each position is the index in
+    # `times` that a window bound at that position corresponds to
+    before = np.empty(len(order), dtype='int64')
+    before[order] = np.cumsum(isspike) - isspike
+    return before[:nqueries], before[nqueries + len(times):]
+
+
+@instrument
+def align_spiketrains_to_events(spiketrains, events, t_pre, t_post,
+                                event_labels=None):
+    """Cut spike times into trials around events, relative to each event.
+
+    This takes the DataFrames from `multi_spiketrains_to_dataframe` and
+    `multi_events_to_dataframe` and makes one column for every combination
+    of spiketrain and event, containing the spike times within the trial
+    window minus the event time.
+
+    Parameters
+    ----------
+
+    spiketrains : pandas DataFrame
+                  The spike times, as returned by
+                  `multi_spiketrains_to_dataframe`.
+    events : pandas DataFrame
+             The events, as returned by `multi_events_to_dataframe`, in the
+             same time units as `spiketrains`.
+    t_pre : float
+            The time before each event where the trial starts.
+    t_post : float
+             The time after each event where the trial stops.
+    event_labels : list-like, optional
+                   If specified, only use events with one of these labels.
+
+    Returns
+    -------
+
+    pandas DataFrame
+        A DataFrame with the aligned spike times of each trial in a column,
+        padded with `NaN` values.  The index is the spike number within the
+        trial, named `spike_number`.
+
+    Notes
+    -----
+
+    The column heading is a `pandas.MultiIndex` with the levels of the
+    `spiketrains` columns, followed by `event_label` and `trial`.  The
+    trial number is the position of the event among all used events,
+    ordered by time, so each trial number has the same event for every
+    spiketrain.
+
+    Spikes are in a trial if `event - t_pre <= spike <= event + t_post`, and
+    the `t_start` and `t_stop` column levels are set to `-t_pre` and
+    `t_post`, as with `slice_spiketrain`.
+
+    All events in `events` are used for all spiketrains, whatever segment
+    they come from, so with several segments the spiketrains and events of
+    each segment should be aligned separately.
+
+    The spikes are sorted once, and the windows of all events in all
+    spiketrains are found with a single sort of the spikes together with
+    the window bounds, rather than by slicing each trial separately.
+
+    """
+    times, _, offsets = _split_dataframe(spiketrains)
+    ntrains = len(offsets) - 1
+    trainind = np.repeat(np.arange(ntrains), np.diff(offsets))
+    times = times[np.lexsort((times, trainind))]
+
+    labels, rowind, _ = _split_dataframe(events)
+    labels = labels.astype('U')
+    evtimes = events.index.get_level_values('times').values[rowind]
+    if event_labels is not None:
+        keep = np.in1d(labels, np.asarray(event_labels).astype('U'))
+        labels = labels[keep]
+        evtimes = evtimes[keep]
+    evorder = np.argsort(evtimes, kind='mergesort')
+    labels = labels[evorder]
+    evtimes = evtimes[evorder]
+    nevents = len(evtimes)
+
+    with stage('window search', ntrains * nevents):
+        lower, upper = _window_bounds(times, trainind, ntrains,
+                                      evtimes - t_pre, evtimes + t_post)
+    counts = upper - lower
+
+    maxlen = counts.max() if counts.size else 0
+    colind = np.repeat(np.arange(counts.size), counts)
+    rowind = (np.arange(counts.sum()) -
+              np.repeat(np.cumsum(counts) - counts, counts))
+    values = np.empty((maxlen, counts.size), dtype=times.dtype)
+    values.fill(np.nan)
+    values[rowind, colind] = (times[lower[colind] + rowind] -
+                              evtimes[colind % max(nevents, 1)])
+
+    columns = spiketrains.columns
+    for name, value in (('t_start', -t_pre), ('t_stop', t_post)):
+        if name in columns.names:
+            columns = _set_level_value(columns, name, value)
+    evlevels, evcodes = np.unique(labels, return_inverse=True)
+    columns = pd.MultiIndex(
+        levels=list(columns.levels) + [evlevels, np.arange(nevents)],
+        labels=[np.repeat(ilabels, nevents) for ilabels in columns.labels] +
+        [np.tile(evcodes, ntrains), np.tile(np.arange(nevents), ntrains)],
+        names=list(columns.names) + ['event_label', 'trial'],
+        verify_integrity=False)
+
+    index = pd.Index(np.arange(maxlen), name='spike_number')
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def _level_times(columns, name, time_units='s'):
+    """Get the values of a time column index level as floats.
+
+    Parameters
+    ----------
+
+    columns : pandas MultiIndex
+              The column index.
+    name : str
+           The name of the level, such as `t_start` or `t_stop`.
+    time_units : str or quantities.Quantity, optional
+                 The units to convert the values to.  Values without units
+                 are taken to already be in these units.  Default is seconds.
+
+    Returns
+    -------
+
+    NumPy array of floats
+        The value of the level for each column, with `NaN` where the value
+        is missing.
+
+    Notes
+    -----
+
+    Each unique value of the level is only converted once.
+
+    """
+    ilevel = columns.names.index(name)
+    level = [np.nan if _is_missing(value) else
+             float(_quantity_from_value_safe(value, time_units).rescale(
+                 time_units).magnitude)
+             for value in columns.levels[ilevel]]
+    return np.array(level + [np.nan])[columns.labels[ilevel]]
+
+
+def _compact_columns(values):
+    """Move the `NaN` values of each column of an array to its end.
+
+    The order of the other values is unchanged.
+    """
+    order = np.argsort(np.isnan(values), axis=0, kind='mergesort')
+    return values[order, np.arange(values.shape[1])]
+
+
+def _groupby_sum(data, columns, groupby=None):
+    """Sum values of each column of a DataFrame within groups of columns.
+
+    Parameters
+    ----------
+
+    data : dict of 1D NumPy arrays
+           The values to sum, each with one element per column.
+    columns : pandas MultiIndex
+              The column index the values belong to.
+    groupby : str or list of str, optional
+              The column index levels to group by.  If not specified, all
+              columns are in one group.
+
+    Returns
+    -------
+
+    pandas DataFrame or pandas Series
+        The sums, with one column for each key of `data` and one row for
+        each group.  If `groupby` is not specified, a Series with one
+        element for each key of `data`.
+
+    """
+    data = pd.DataFrame(data, index=columns)
+    if groupby is None:
+        return data.sum()
+    return data.groupby(level=groupby).sum()
+
+
+@instrument
+def dataframe_isi(pdobj):
+    """Get the inter-spike intervals of each column of a `pandas.DataFrame`.
+
+    This is the equivalent of `elephant.statistics.isi` for every spiketrain
+    in a DataFrame from `multi_spiketrains_to_dataframe` at once.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The spike times.
+
+    Returns
+    -------
+
+    pandas DataFrame
+        The inter-spike intervals, with the same columns as `pdobj`, padded
+        with `NaN` values.  The index name is `isi_number`.
+
+    Notes
+    -----
+
+    `NaN` values are skipped, so the intervals of DataFrames from
+    `slice_spiketrain` are also correct.
+
+    """
+    values = np.diff(_compact_columns(pdobj.values), axis=0)
+    index = pd.Index(np.arange(len(values)), name='isi_number')
+    return pd.DataFrame(values, index=index, columns=pdobj.columns)
+
+
+@instrument
+def grouped_spike_counts(pdobj, groupby=None):
+    """Count the spikes in the columns of a `pandas.DataFrame` by group.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The spike times, as returned by `multi_spiketrains_to_dataframe`.
+    groupby : str or list of str, optional
+              The column index levels to group the spiketrains by, such as
+              `'name'` or an annotation.  If not specified, all spiketrains
+              are in one group.
+
+    Returns
+    -------
+
+    pandas Series or int
+        The total number of spikes of the spiketrains in each group.
+        If `groupby` is not specified, a single number.
+
+    """
+    counts = pd.notnull(pdobj.values).sum(axis=0)
+    return _groupby_sum({'counts': counts}, pdobj.columns,
+                        groupby=groupby)['counts']
+
+
+@instrument
+def grouped_mean_firing_rate(pdobj, groupby=None, time_units='s'):
+    """Get the mean firing rate of the spiketrains in a DataFrame by group.
+
+    The rate of each spiketrain is calculated as in
+    `elephant.statistics.mean_firing_rate`, and these are averaged over the
+    spiketrains in each group.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The spike times, as returned by `multi_spiketrains_to_dataframe`.
+    groupby : str or list of str, optional
+              The column index levels to group the spiketrains by, such as
+              `'name'` or an annotation.  If not specified, all spiketrains
+              are in one group.
+    time_units : str or quantities.Quantity, optional
+                 The units of the times in `pdobj`.  Default is seconds.
+
+    Returns
+    -------
+
+    pandas Series or float
+        The mean firing rate in each group, in the inverse of `time_units`.
+        If `groupby` is not specified, a single number.
+
+    Notes
+    -----
+
+    The interval of each spiketrain is taken from its `t_start` and `t_stop`
+    column index levels.  If there is no `t_start` level it is `0`, and if
+    there is no `t_stop` level it is the last spike time, as in
+    `elephant.statistics.mean_firing_rate`.  Spikes outside the interval are
+    not counted.
+
+    """
+    values = pdobj.values
+    columns = pdobj.columns
+    ncols = len(columns)
+    if 't_start' in columns.names:
+        t_start = _level_times(columns, 't_start', time_units)
+    else:
+        t_start = np.zeros(ncols)
+    if 't_stop' in columns.names:
+        t_stop = _level_times(columns, 't_stop', time_units)
+    else:
+        t_stop = np.nanmax(values, axis=0)
+
+    with np.errstate(invalid='ignore'):
+        counts = ((values >= t_start) & (values <= t_stop)).sum(axis=0)
+    sums = _groupby_sum({'n': np.ones(ncols), 'rates': counts /
+                         (t_stop - t_start)}, columns, groupby=groupby)
+    return sums['rates'] / sums['n']
+
+
+@instrument
+def grouped_cv(pdobj, groupby=None):
+    """Get the coefficient of variation of the inter-spike intervals by group.
+
+    The inter-spike intervals of all spiketrains in a group are pooled, and
+    the coefficient of variation is calculated as with
+    `elephant.statistics.cv`, so the standard deviation divided by the mean.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The spike times, as returned by `multi_spiketrains_to_dataframe`.
+    groupby : str or list of str, optional
+              The column index levels to group the spiketrains by, such as
+              `'name'` or an annotation.  If not specified, all spiketrains
+              are in one group.
+
+    Returns
+    -------
+
+    pandas Series or float
+        The coefficient of variation in each group.
+        If `groupby` is not specified, a single number.
+
+    Notes
+    -----
+
+    The intervals are summed per spiketrain over the whole padded array,
+    and only these sums are grouped.
+
+    """
+    intervals = dataframe_isi(pdobj).values
+    sums = _groupby_sum({'n': pd.notnull(intervals).sum(axis=0),
+                         'sum': np.nansum(intervals, axis=0),
+                         'sumsq': np.nansum(intervals ** 2, axis=0)},
+                        pdobj.columns, groupby=groupby)
+    mean = sums['sum'] / sums['n']
+    var = np.maximum(sums['sumsq'] / sums['n'] - mean ** 2, 0)
+    return np.sqrt(var) / mean
+
+
+@instrument
+def grouped_fanofactor(pdobj, groupby=None):
+    """Get the Fano factor of the spike counts of a DataFrame by group.
+
+    This is calculated as with `elephant.statistics.fanofactor`, so the
+    variance of the spike counts of the spiketrains in a group divided by
+    their mean.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The spike times, as returned by `multi_spiketrains_to_dataframe`.
+    groupby : str or list of str, optional
+              The column index levels to group the spiketrains by, such as
+              `'name'` or an annotation.  If not specified, all spiketrains
+              are in one group.
+
+    Returns
+    -------
+
+    pandas Series or float
+        The Fano factor in each group, or `NaN` for groups where all
+        spiketrains are empty.  If `groupby` is not specified, a single
+        number.
+
+    """
+    counts = pd.notnull(pdobj.values).sum(axis=0)
+    sums = _groupby_sum({'n': np.ones(len(counts)), 'sum': counts,
+                         'sumsq': counts ** 2},
+                        pdobj.columns, groupby=groupby)
+    mean = sums['sum'] / sums['n']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums['sumsq'] / sums['n'] - mean ** 2) / mean
+
+
+# The key of the schema metadata used by `dataframe_to_arrow`.
+_ARROW_METADATA_KEY = b'elephant'
+
+# The names of the object and value columns used in the tidy layout of
+# `dataframe_to_arrow`, based on the index names of the wide DataFrame.
+_TIDY_NAMES = {('spike_number',): ('train', 'times'),
+               ('times',): ('event', 'labels'),
+               ('times', 'durations'): ('epoch', 'labels')}
+
+
+def _value_to_json(value):
+    """Convert an index value to something that can be stored as JSON.
+
+    Tuples and dates are tagged so `_value_from_json` can restore them.
+    """
+    if isinstance(value, tuple):
+        return {'tuple': [_value_to_json(ivalue) for ivalue in value]}
+    if hasattr(value, 'isoformat'):
+        return {'datetime': value.isoformat()}
+    if hasattr(value, 'item'):
+        return _value_to_json(value.item())
+    return value
+
+
+def _value_from_json(value):
+    """Restore an index value stored by `_value_to_json`."""
+    if isinstance(value, dict) and 'tuple' in value:
+        return tuple(_value_from_json(ivalue) for ivalue in value['tuple'])
+    if isinstance(value, dict) and 'datetime' in value:
+        return pd.Timestamp(value['datetime'])
+    return value
+
+
+@instrument
+def dataframe_to_arrow(pdobj, path, file_format='arrow'):
+    """Write a `pandas.DataFrame` from this module to an Arrow or Parquet file.
+
+    This works with the DataFrames returned by
+    `multi_spiketrains_to_dataframe`, `multi_events_to_dataframe`, and
+    `multi_epochs_to_dataframe`, as well as the single-object variants.
+
+    The data is stored in a long format, with one row per non-`NaN` value,
+    so the `NaN` padding is not stored.  The column `pandas.MultiIndex`,
+    which holds the attributes and annotations of the neo objects, is stored
+    as JSON in the schema metadata.
+
+    Parameters
+    ----------
+
+    pdobj : pandas DataFrame
+            The DataFrame to write.
+    path : str
+           The file to write to.
+    file_format : str, optional
+                  `'arrow'` (default) to write an Arrow IPC file, which can be
+                  memory-mapped when read, or `'parquet'` to write a
+                  compressed Parquet file.
+
+    Notes
+    -----
+
+    The table has one column for the position of the neo object
+    (`train`, `event`, or `epoch`), one for each index level (such as
+    `spike_number` or `times`), and one for the values (`times` for
+    spiketrains, `labels` for events and epochs).
+
+    Rows of `pdobj` that contain only `NaN` values are not stored in the
+    table.  They are restored when reading, with the index values of
+    the default `spike_number` index rebuilt and any other index values kept
+    in the metadata.
+
+    Raises
+    ------
+
+    ImportError
+        If `pyarrow` is not installed.
+
+    ValueError
+        If `file_format` is not `'arrow'` or `'parquet'`.
+
+    """
+    if not HAVE_ARROW:
+        raise ImportError('dataframe_to_arrow requires pyarrow')
+    if file_format not in ('arrow', 'parquet'):
+        raise ValueError('Unknown file format %s' % file_format)
+
+    index_names = [str(name) for name in pdobj.index.names]
+    id_name, value_name = _TIDY_NAMES.get(tuple(index_names),
+                                          ('column', 'values'))
+
+    values, mask, categories = _dataframe_values(pdobj)
+    categorical = categories is not None
+
+    colind, rowind = np.nonzero(mask.T)
+    values = values.T[mask.T]
+    if categorical:
+        values = pa.DictionaryArray.from_arrays(
+            values.astype('int32'), pa.array(categories.values.astype('U')))
+    else:
+        values = pa.array(values)
+
+    arrays = [pa.array(colind.astype('int64'))]
+    names = [id_name]
+    for name in index_names:
+        arrays.append(pa.array(pdobj.index.get_level_values(name).values[
+            rowind]))
+        names.append(name)
+    default_index = (index_names == ['spike_number'] and
+                     np.array_equal(pdobj.index.values,
+                                    np.arange(len(pdobj.index))))
+    empty_rows = None
+    if not default_index:
+        arrays.append(pa.array(rowind.astype('int64')))
+        names.append('row')
+        # rows without any values are not in the table, so their index
+        # values are kept in the metadata
+        empty = np.nonzero(~mask.any(axis=1))[0]
+        empty_rows = {'rows': empty.tolist(),
+                      'values': [[_value_to_json(value) for value in
+                                  pdobj.index.get_level_values(name).values[
+                                      empty]]
+                                 for name in index_names]}
+    arrays.append(values)
+    names.append(value_name)
+
+    columns = pdobj.columns
+    metadata = {'column_names': [str(name) for name in columns.names],
+                'column_values': [[_value_to_json(value) for value in col]
+                                  for col in columns.tolist()],
+                'index_names': index_names,
+                'id_name': id_name,
+                'value_name': value_name,
+                'nrows': len(pdobj.index),
+                'empty_rows': empty_rows,
+                'categorical': categorical}
+    metadata = {_ARROW_METADATA_KEY: json.dumps(metadata).encode('UTF8')}
+
+    table = pa.Table.from_arrays(arrays, names=names)
+    table = table.replace_schema_metadata(metadata)
+
+    if file_format == 'parquet':
+        parquet.write_table(table, path)
+        return
+    with pa.OSFile(path, 'wb') as sink:
+        writer = pa.RecordBatchFileWriter(sink, table.schema)
+        writer.write_table(table)
+        writer.close()
+
+
+@instrument
+def arrow_to_dataframe(path, memory_map=True, tidy=False):
+    """Read a `pandas.DataFrame` written by `dataframe_to_arrow`.
+
+    Parameters
+    ----------
+
+    path : str
+           The file to read.  Arrow and Parquet files are both accepted.
+    memory_map : bool, optional
+                 If True (default), memory-map the file instead of reading it
+                 into memory.  For Arrow files, the values are then not copied
+                 when `tidy` is True.
+    tidy : bool, optional
+           If True (default False), return the data in the long format it is
+           stored in rather than as the original DataFrame.
+
+    Returns
+    -------
+
+    pandas DataFrame
+        The DataFrame that was written.
+        If `tidy` is True, this is instead a tuple of two DataFrames,
+        `values` and `objects`.
+
+    Notes
+    -----
+
+    With `tidy`, `values` has a single column containing the non-`NaN`
+    values, and a `pandas.MultiIndex` index with the position of the neo
+    object and the index levels of the original DataFrame.  `objects` has one
+    row per neo object and one column for each attribute or annotation.
+    For spiketrains, these are the same as the DataFrames returned by
+    `multi_spiketrains_to_dataframe` with `tidy=True`.
+
+    Raises
+    ------
+
+    ImportError
+        If `pyarrow` is not installed.
+
+    """
+    if not HAVE_ARROW:
+        raise ImportError('arrow_to_dataframe requires pyarrow')
+
+    with open(path, 'rb') as fobj:
+        is_parquet = fobj.read(4) == b'PAR1'
+    if is_parquet:
+        table = parquet.read_table(path, memory_map=memory_map)
+    elif memory_map:
+        table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    else:
+        table = pa.ipc.open_file(pa.OSFile(path, 'rb')).read_all()
+
+    metadata = json.loads(table.schema.metadata[_ARROW_METADATA_KEY].decode(
+        'UTF8'))
+    id_name = metadata['id_name']
+    value_name = metadata['value_name']
+    index_names = metadata['index_names']
+
+    def get_column(name):
+        column = table.column(name)
+        if column.num_chunks == 1:
+            return column.chunk(0)
+        return pa.concat_arrays(column.chunks)
+
+    values = get_column(value_name)
+    if metadata['categorical']:
+        categories = values.dictionary.to_numpy(zero_copy_only=False)
+        categories = pd.Index(categories)
+        values = values.indices.to_numpy(zero_copy_only=False)
+    else:
+        categories = None
+        values = values.to_numpy(zero_copy_only=False)
+    # only the values are kept as read-only views, the indexes are copied
+    colind = np.array(get_column(id_name).to_numpy())
+    levels = [np.array(get_column(name).to_numpy(zero_copy_only=False))
+              for name in index_names]
+
+    tuples = [tuple(_value_from_json(value) for value in col)
+              for col in metadata['column_values']]
+    columns = pd.MultiIndex.from_tuples(tuples,
+                                        names=metadata['column_names'])
+
+    if tidy:
+        index = pd.MultiIndex.from_arrays([colind] + levels,
+                                          names=[id_name] + index_names)
+        if categories is None:
+            res = pd.DataFrame(values[:, np.newaxis], index=index,
+                               columns=[value_name], copy=False)
+        else:
+            res = pd.DataFrame({value_name: pd.Categorical.from_codes(
+                values, categories)}, index=index)
+        objects = pd.DataFrame(tuples, columns=columns.names,
+                               index=pd.Index(np.arange(len(tuples)),
+                                              name=id_name))
+        return res, objects
+
+    nrows = metadata['nrows']
+    if 'row' in table.column_names:
+        rowind = np.array(get_column('row').to_numpy())
+        index = []
+        for level in levels:
+            ilevel = np.empty(nrows, dtype=level.dtype)
+            ilevel[rowind] = level
+            index.append(ilevel)
+        empty_rows = metadata.get('empty_rows')
+        if empty_rows and empty_rows['rows']:
+            for ilevel, values_json in zip(index, empty_rows['values']):
+                ilevel[empty_rows['rows']] = [_value_from_json(value)
+                                              for value in values_json]
+    else:
+        # the default spike_number index, including the rows not stored
+        rowind = levels[0]
+        index = [np.arange(nrows, dtype=levels[0].dtype)]
+    if len(index) == 1:
+        index = pd.Index(index[0], name=index_names[0])
+    else:
+        index = pd.MultiIndex.from_arrays(index, names=index_names)
+
+    if categories is None:
+        wide = np.empty((nrows, len(columns)), dtype=values.dtype)
+        wide.fill(np.nan)
+        wide[rowind, colind] = values
+        return pd.DataFrame(wide, index=index, columns=columns)
+
+    wide = np.empty((nrows, len(columns)), dtype=values.dtype)
+    wide.fill(-1)
+    wide[rowind, colind] = values
+    res = pd.DataFrame(dict((i, pd.Categorical.from_codes(wide[:, i],
+                                                          categories))
+                            for i in range(len(columns))), index=index)
+    res.columns = columns
+    return res
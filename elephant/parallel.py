@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Apply a function to every spike train of a container in parallel.
+
+The spike trains are split into contiguous chunks holding about the same
+number of spikes, so one long train does not leave the other workers idle,
+and the chunks are handed to a pool of threads or processes.  Threads share
+the neo objects directly, which works well for functions spending their time
+in NumPy code that releases the GIL.  Processes are sent the spike times and
+attributes of each chunk rather than the neo objects themselves, which would
+bring their whole Block along when pickled.  Either way, the results come
+back in the order of the trains.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+from functools import partial
+from itertools import chain
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+
+from neo.core import SpikeTrain
+
+from elephant.neo_tools import get_all_spiketrains
+from elephant.profiling import instrument
+from elephant.spike_train_array import SpikeTrainArray
+
+# The kinds of pool `map_spiketrains` can use.
+BACKENDS = ('thread', 'process')
+
+# The SpikeTrain attributes, besides the spike times, sent to worker processes.
+_SPIKETRAIN_ATTRS = ('t_start', 't_stop', 'sampling_rate', 'left_sweep',
+                     'waveforms', 'name', 'description', 'file_origin')
+
+
+def _balanced_chunks(counts, nchunks):
+    """Split trains into contiguous chunks of about the same size.
+
+    Parameters
+    ----------
+
+    counts : 1D NumPy array of ints
+             The number of spikes in each train.
+    nchunks : int
+              The maximum number of chunks.
+
+    Returns
+    -------
+
+    1D NumPy array of ints
+        The index of the first train of each chunk, plus the number of
+        trains.  No chunk is empty.
+
+    """
+    # every train costs something, even without spikes
+    cumsize = np.concatenate([[0], np.cumsum(np.asarray(counts) + 1)])
+    targets = np.linspace(0, cumsize[-1], nchunks + 1)
+    bounds = np.searchsorted(cumsize, targets)
+    bounds[0] = 0
+    bounds[-1] = len(counts)
+    return np.unique(bounds)
+
+
+def _slice_trains(trains, start, stop):
+    """Get trains `start` to `stop` of a `SpikeTrainArray` as a new one."""
+    offsets = trains.offsets[start:stop + 1]
+    return SpikeTrainArray(trains.times[offsets[0]:offsets[-1]],
+                           offsets - offsets[0],
+                           trains.t_starts[start:stop],
+                           trains.t_stops[start:stop], units=trains.units)
+
+
+class _PackedSpikeTrains(object):
+    """Neo SpikeTrains in a form that is cheap to send to worker processes.
+
+    The spike times of each train are kept as a plain array in the units of
+    that train, along with its other attributes and its annotations.  Links
+    to the parent Segment and Unit are dropped.
+    """
+
+    def __init__(self, trains):
+        self.times = [train.magnitude for train in trains]
+        self.units = [train.units for train in trains]
+        self.attrs = [dict((name, getattr(train, name))
+                           for name in _SPIKETRAIN_ATTRS)
+                      for train in trains]
+        self.annotations = [dict(train.annotations) for train in trains]
+
+    def to_spiketrains(self):
+        """Rebuild the neo SpikeTrains."""
+        trains = []
+        for times, units, attrs, annotations in zip(self.times, self.units,
+                                                     self.attrs,
+                                                     self.annotations):
+            train = SpikeTrain(times, units=units, copy=False, **attrs)
+            train.annotate(**annotations)
+            trains.append(train)
+        return trains
+
+
+def _apply_to_chunk(chunk, func, kwargs):
+    """Apply `func` to every train of a chunk.
+
+    This is the unit of work for `map_spiketrains`, so it is a module-level
+    function that can be sent to worker processes.
+    """
+    if isinstance(chunk, (SpikeTrainArray, _PackedSpikeTrains)):
+        chunk = chunk.to_spiketrains()
+    return [func(train, **kwargs) for train in chunk]
+
+
+@instrument
+def map_spiketrains(func, container, backend='thread', workers=None,
+                    chunks=None, **kwargs):
+    """Apply a function to every spike train of a container in parallel.
+
+    Parameters
+    ----------
+
+    func : callable
+           The function to apply, such as `statistics.isi` or
+           `conversion.binarize`.  It is called with one neo SpikeTrain
+           and `kwargs`.
+    container : list of neo SpikeTrain, neo container, or SpikeTrainArray
+                The spike trains, or anything `get_all_spiketrains`
+                accepts.
+    backend : str, optional
+              `'thread'` (default) to use a pool of threads, or `'process'`
+              to use a pool of worker processes.
+    workers : int, optional
+              The number of threads or processes.  If not specified, use
+              the number of CPUs.  If 1, everything is done in the current
+              thread without starting a pool.
+    chunks : int, optional
+             The number of chunks to split the trains into.  Chunks have
+             about the same total number of spikes.  Default is four
+             chunks per worker.
+    Any other keyword arguments are passed to `func`.
+
+    Returns
+    -------
+
+    list
+        The result of `func` for each spike train, in the order of
+        `get_all_spiketrains`.
+
+    Raises
+    ------
+
+    ValueError
+        If `backend` is not one of `BACKENDS`.
+
+    Notes
+    -----
+
+    With the `'process'` backend, the workers get copies of the spike
+    trains with the same units, attributes and annotations, but without
+    their parent `segment` and `unit`.  `func`, `kwargs`, the annotations
+    and the results must be picklable, so `func` must be a module-level
+    function or a `functools.partial` object wrapping one.
+
+    """
+    if backend not in BACKENDS:
+        raise ValueError('backend must be one of %s, not %r' %
+                         (', '.join(BACKENDS), backend))
+
+    if isinstance(container, SpikeTrainArray):
+        trains = container
+        counts = trains.counts
+    else:
+        trains = get_all_spiketrains(container)
+        counts = np.array([len(train) for train in trains], dtype='int64')
+    if not len(trains):
+        return []
+
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    if chunks is None:
+        chunks = 4 * workers
+    bounds = _balanced_chunks(counts, max(min(chunks, len(trains)), 1))
+    apply_func = partial(_apply_to_chunk, func=func, kwargs=kwargs)
+
+    if backend == 'process':
+        if isinstance(trains, SpikeTrainArray):
+            work = [_slice_trains(trains, start, stop)
+                    for start, stop in zip(bounds[:-1], bounds[1:])]
+        else:
+            work = [_PackedSpikeTrains(trains[start:stop])
+                    for start, stop in zip(bounds[:-1], bounds[1:])]
+    else:
+        if isinstance(trains, SpikeTrainArray):
+            trains = trains.to_spiketrains()
+        work = [trains[start:stop]
+                for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    if workers == 1:
+        res = [apply_func(chunk) for chunk in work]
+    else:
+        if backend == 'process':
+            pool = multiprocessing.Pool(processes=workers)
+        else:
+            pool = ThreadPool(processes=workers)
+        try:
+            res = pool.map(apply_func, work, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    return list(chain.from_iterable(res))
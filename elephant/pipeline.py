@@ -0,0 +1,285 @@
+# -*- coding: utf-8 -*-
+"""
+Load and analyze many sources concurrently with asyncio.
+
+Reading files with a neo IO mostly waits for the disk, while the analysis
+mostly uses the CPU.  `iter_pipeline` overlaps the two: sources are loaded
+ahead of time in a thread, at most `prefetch` at a time, while the analysis
+stages of already loaded containers run in an executor.  The number of
+containers held in memory at once is bounded, so a slow consumer of the
+results, or a slow analysis, stops the loading rather than filling up the
+memory.  Results can be collected in the order of the sources, or as soon
+as they are ready.
+
+For example, to get the mean firing rate of every spike train in every
+file, reading them with a neo IO::
+
+    >>> def load(path):
+    ...     return neo.io.NixIO(path, mode='ro').read_block()
+    >>> stage = per_spiketrain(mean_firing_rate)
+    >>> results = run_pipeline(paths, stage, loader=load)
+
+This module requires Python 3.6 or newer.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import os
+
+from elephant.neo_tools import (_load_block, _needs_loader,
+                                get_all_spiketrains)
+from elephant.parallel import _apply_to_chunk
+from elephant.spike_train_array import SpikeTrainArray
+
+# Put in the queue of results by a worker that has no more work to do.
+_DONE = object()
+
+
+def _apply_to_container(container, func, kwargs):
+    """Apply `func` to every spike train of a container.
+
+    This is the stage created by `per_spiketrain`, so it is a module-level
+    function that can be sent to worker processes.
+    """
+    if not isinstance(container, SpikeTrainArray):
+        container = get_all_spiketrains(container)
+    return _apply_to_chunk(container, func, kwargs)
+
+
+def per_spiketrain(func, **kwargs):
+    """Create a stage applying a function to every spike train of a container.
+
+    Parameters
+    ----------
+
+    func : callable
+           The function to apply, such as `statistics.isi` or
+           `conversion.binarize`.  It is called with one neo SpikeTrain
+           and `kwargs`.
+    Any other keyword arguments are passed to `func`.
+
+    Returns
+    -------
+
+    functools.partial
+        The stage.  It takes anything `get_all_spiketrains` accepts, or a
+        `SpikeTrainArray`, and returns the list of results of `func` in the
+        order of the spike trains.  It can be sent to worker processes if
+        `func` and `kwargs` can.
+
+    """
+    return partial(_apply_to_container, func=func, kwargs=kwargs)
+
+
+def _apply_stages(container, stages):
+    """Apply each stage in turn to the result of the previous one."""
+    for stage in stages:
+        container = stage(container)
+    return container
+
+
+async def _load(source, loader):
+    """Load one source, without blocking the event loop."""
+    if asyncio.iscoroutinefunction(loader) and _needs_loader(source):
+        return await loader(source)
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, _load_block, source, loader)
+
+
+async def _produce(sources, loader, loaded, window, results, concurrency):
+    """Load the sources in order and queue them for the workers.
+
+    A slot of `window` is taken before loading each source, and given back
+    once its result has been handed over, so loading waits while too many
+    containers are in flight.
+    """
+    index = source = None
+    try:
+        for index, source in enumerate(sources):
+            await window.acquire()
+            container = await _load(source, loader)
+            await loaded.put((index, source, container))
+    except Exception as exc:
+        await results.put((index, source, None, exc))
+        return
+    for _ in range(concurrency):
+        await loaded.put(None)
+
+
+async def _work(stages, executor, loaded, results):
+    """Apply the stages to loaded containers in the executor."""
+    loop = asyncio.get_event_loop()
+    while True:
+        item = await loaded.get()
+        if item is None:
+            break
+        index, source, container = item
+        try:
+            result = await loop.run_in_executor(executor, _apply_stages,
+                                                container, stages)
+        except Exception as exc:
+            await results.put((index, source, None, exc))
+            break
+        # drop the reference so the container can be freed
+        del container, item
+        await results.put((index, source, result, None))
+    await results.put(_DONE)
+
+
+async def iter_pipeline(sources, stages, loader=None, prefetch=2,
+                        concurrency=None, executor=None, ordered=True):
+    """Load sources and apply analysis stages to them concurrently.
+
+    This is an asynchronous generator, to be used with `async for`.  See
+    `run_pipeline` for a version that can be called from synchronous code.
+
+    Parameters
+    ----------
+
+    sources : iterable
+              The sources to process.  Each can be a neo Block or any other
+              container accepted by `get_all_spiketrains`, a callable taking
+              no arguments that returns such a container, or a path (or
+              other value) that `loader` converts to such a container.
+              They are only taken from the iterable when there is room to
+              load them.
+    stages : callable or list of callables
+             The analysis.  The first stage is called with the loaded
+             container, and every other stage with the result of the
+             previous one.  `per_spiketrain` creates a stage applying a
+             function such as `statistics.isi` to every spike train.
+    loader : callable or coroutine function, optional
+             Called with a source that is not a neo object to get the
+             container from it, such as a function reading a file path
+             with a neo IO.  Ordinary functions are called in the default
+             thread pool executor of the event loop, one source at a time.
+             Coroutine functions are awaited instead.
+             If not specified, only neo objects, containers and callables
+             are accepted.
+    prefetch : int, optional
+               The maximum number of loaded containers waiting for a worker.
+               Default is 2.
+    concurrency : int, optional
+                  The number of containers analyzed at the same time.  If
+                  not specified, use the number of CPUs.
+    executor : concurrent.futures.Executor, optional
+               The executor to run the stages in.  If not specified, a
+               thread pool with `concurrency` threads is used, and shut
+               down at the end.
+    ordered : bool, optional
+              If True (default), yield results in the order of `sources`.
+              If False, yield each result as soon as it is ready.
+
+    Yields
+    ------
+
+    tuple
+        `(source, result)`, where `result` is the output of the last stage.
+
+    Raises
+    ------
+
+    ValueError
+        If `prefetch` or `concurrency` is less than 1.
+
+    Any exception raised while loading a source or running a stage is
+    raised here, and the remaining work is cancelled.
+
+    Notes
+    -----
+
+    At most `prefetch + concurrency` sources are loaded but not yet
+    yielded at any time.  In ordered mode, results that are ready before
+    the results of earlier sources are held back and count towards this
+    limit.
+
+    With a process executor, the loaded containers and the stages must be
+    picklable, and the containers are sent to the workers in full.  Having
+    `loader` return a `SpikeTrainArray`, using
+    `SpikeTrainArray.from_spiketrains`, keeps this cheap.
+
+    """
+    if callable(stages):
+        stages = [stages]
+    stages = list(stages)
+    if concurrency is None:
+        concurrency = os.cpu_count() or 1
+    if prefetch < 1 or concurrency < 1:
+        raise ValueError('prefetch and concurrency must be at least 1')
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    window = asyncio.Semaphore(prefetch + concurrency)
+    loaded = asyncio.Queue(maxsize=prefetch)
+    results = asyncio.Queue()
+    tasks = [asyncio.ensure_future(_produce(iter(sources), loader, loaded,
+                                            window, results, concurrency))]
+    tasks.extend(asyncio.ensure_future(_work(stages, executor, loaded,
+                                             results))
+                 for _ in range(concurrency))
+
+    try:
+        pending = {}
+        next_index = 0
+        finished = 0
+        while finished < concurrency:
+            item = await results.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            index, source, result, exc = item
+            if exc is not None:
+                raise exc
+            if not ordered:
+                window.release()
+                yield source, result
+                continue
+            pending[index] = source, result
+            while next_index in pending:
+                window.release()
+                yield pending.pop(next_index)
+                next_index += 1
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+def run_pipeline(sources, stages, **kwargs):
+    """Load sources and apply analysis stages to them concurrently.
+
+    This runs `iter_pipeline` in a new event loop and collects the results.
+
+    Parameters
+    ----------
+
+    sources, stages
+           See `iter_pipeline`.
+    Any other keyword arguments are passed to `iter_pipeline`.
+
+    Returns
+    -------
+
+    list of tuples
+        `(source, result)` for every source, in the order of `sources`
+        unless `ordered` is False.
+
+    """
+    async def collect():
+        return [item async for item in iter_pipeline(sources, stages,
+                                                     **kwargs)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(collect())
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
@@ -0,0 +1,413 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in instrumentation of the elephant functions.
+
+Public functions are decorated with `instrument`, and expensive internal
+steps (traversing containers, extracting attributes, converting units,
+building DataFrames) are wrapped in a `stage`.  While profiling is off,
+each of these only checks one flag.  While it is on, the number of calls, the
+cumulative wall time, the total input size and, optionally, the peak memory
+allocated are recorded for every function and stage.
+
+Profiling is turned on for a block of code with `profile`::
+
+    >>> with profile(memory=True) as prof:
+    ...     multi_spiketrains_to_dataframe(block)
+    >>> print(prof.table())
+
+or for a whole program by setting the `ELEPHANT_PROFILE` environment
+variable before elephant is imported.  The summary table is then printed to
+standard error when the program exits, or, if the variable is set to a file
+name ending in `.json`, the JSON trace is written to that file.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import atexit
+from contextlib import contextmanager
+from functools import wraps
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# The `Profile` recording calls, or `None` if profiling is off.  This is the
+# only thing checked by instrumented code while profiling is off.
+_ACTIVE = None
+
+# The environment variable that turns on profiling for the whole program.
+PROFILE_ENV = 'ELEPHANT_PROFILE'
+
+
+def _input_size(args):
+    """Get the size of the first argument, if it has one.
+
+    This is the number of elements of arrays and the length of other
+    sequences, or `None` for anything else.
+    """
+    if not args:
+        return None
+    value = args[0]
+    size = getattr(value, 'size', None)
+    if isinstance(size, int):
+        return size
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class _Stats(object):
+    """The statistics recorded for one function or stage."""
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.
+        self.size = 0
+        self.peak_memory = 0
+
+    def as_dict(self):
+        return {'calls': self.calls, 'time': self.time, 'size': self.size,
+                'peak_memory': self.peak_memory}
+
+
+class Profile(object):
+    """The calls recorded while profiling.
+
+    Parameters
+    ----------
+
+    memory : bool, optional
+             If True (default False), also record the peak memory allocated
+             during every call, using `tracemalloc`.  This makes everything
+             much slower, so the times are not meaningful in this mode.
+    trace : bool, optional
+            If True (default), record every call for `trace`, in addition to
+            the totals per name.
+
+    Attributes
+    ----------
+
+    stats : dict
+            The totals for every function and stage name, as a dictionary
+            with the keys `calls`, `time`, `size`, and `peak_memory`.
+            The time of recursive calls is only counted once.
+
+    Notes
+    -----
+
+    Calls made from several threads at once, such as by
+    `parallel.map_spiketrains` with the thread backend, are recorded with
+    one call stack per thread, so their times are added up and each call is
+    charged to the enclosing call of its own thread.  The peak memory is
+    measured for the whole process, so with several threads it includes
+    the memory allocated by the other threads.
+
+    """
+
+    def __init__(self, memory=False, trace=True):
+        self.memory = memory and tracemalloc is not None
+        self.record_trace = trace
+        self._stats = {}
+        self._events = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._t_origin = time.time()
+
+    @property
+    def _stack(self):
+        """The calls in progress in the current thread, outermost first."""
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    @property
+    def stats(self):
+        with self._lock:
+            return dict((name, stats.as_dict())
+                        for name, stats in self._stats.items())
+
+    def _enter(self, name, size):
+        """Start recording a call, and return its state for `_exit`."""
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        else:
+            current = peak = 0
+        frame = [name, size, current, peak, 0, time.time()]
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame):
+        """Finish recording a call started with `_enter`."""
+        t_stop = time.time()
+        name, size, current, outer_peak, child_peak, t_start = frame
+        stack = self._stack
+        stack.pop()
+
+        peak_memory = 0
+        if self.memory:
+            peak = max(tracemalloc.get_traced_memory()[1], child_peak)
+            peak_memory = max(peak - current, 0)
+            # the peak of the enclosing call includes this one, and its own
+            # peak before this call started
+            if stack:
+                stack[-1][4] = max(stack[-1][4], peak, outer_peak)
+        recursive = any(outer[0] == name for outer in stack)
+
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = _Stats()
+            stats.calls += 1
+            if not recursive:
+                stats.time += t_stop - t_start
+            if size is not None:
+                stats.size += size
+            stats.peak_memory = max(stats.peak_memory, peak_memory)
+
+            if self.record_trace:
+                self._events.append({'name': name, 'ph': 'X', 'pid': 0,
+                                     'tid': threading.current_thread().ident,
+                                     'ts': (t_start - self._t_origin) * 1e6,
+                                     'dur': (t_stop - t_start) * 1e6,
+                                     'args': {'size': size,
+                                              'peak_memory': peak_memory}})
+
+    def table(self, sort='time'):
+        """Get a summary table of the recorded calls.
+
+        Parameters
+        ----------
+
+        sort : str, optional
+               The column to sort by, from largest to smallest: `'time'`
+               (default), `'calls'`, `'size'`, or `'peak_memory'`.
+
+        Returns
+        -------
+
+        str
+
+        """
+        if sort not in ('time', 'calls', 'size', 'peak_memory'):
+            raise ValueError("sort must be 'time', 'calls', 'size', or "
+                             "'peak_memory', not %r" % sort)
+        rows = sorted(self.stats.items(), key=lambda item: -item[1][sort])
+        width = max([len('name')] + [len(name) for name, _ in rows])
+        lines = ['%-*s %10s %12s %12s %14s' %
+                 (width, 'name', 'calls', 'time (s)', 'size',
+                  'peak memory')]
+        for name, stats in rows:
+            lines.append('%-*s %10d %12.6f %12d %14d' %
+                         (width, name, stats['calls'], stats['time'],
+                          stats['size'], stats['peak_memory']))
+        return '\n'.join(lines)
+
+    def trace(self):
+        """Get the recorded calls as a JSON-compatible dictionary.
+
+        The dictionary is in the Chrome trace event format, so it can be
+        viewed in `chrome://tracing` or Perfetto, with the totals per name
+        under the `stats` key.
+
+        Returns
+        -------
+
+        dict
+
+        """
+        with self._lock:
+            events = list(self._events)
+        return {'traceEvents': events,
+                'displayTimeUnit': 'ms',
+                'stats': self.stats}
+
+    def dump(self, path):
+        """Write `trace` to a JSON file.
+
+        Parameters
+        ----------
+
+        path : str
+               The name of the file.
+
+        """
+        with open(path, 'w') as fobj:
+            json.dump(self.trace(), fobj)
+
+
+class _Stage(object):
+    """A context manager recording one call of a stage."""
+
+    __slots__ = ('profile', 'name', 'size', 'frame')
+
+    def __init__(self, profile, name, size):
+        self.profile = profile
+        self.name = name
+        self.size = size
+
+    def __enter__(self):
+        self.frame = self.profile._enter(self.name, self.size)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile._exit(self.frame)
+        return False
+
+
+class _NullStage(object):
+    """A context manager that does nothing, used while profiling is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, size=None):
+    """Record a stage of a function as a separate entry while profiling.
+
+    Parameters
+    ----------
+
+    name : str
+           The name of the stage.  Stages with the same name are added up.
+    size : int, optional
+           The size of the input of the stage.
+
+    Returns
+    -------
+
+    context manager
+
+    """
+    if _ACTIVE is None:
+        return _NULL_STAGE
+    return _Stage(_ACTIVE, name, size)
+
+
+def instrument(func=None, name=None):
+    """Decorate a function so its calls are recorded while profiling.
+
+    Parameters
+    ----------
+
+    func : function
+           The function to decorate.
+    name : str, optional
+           The name to record calls under.  Default is the module and name
+           of the function.
+
+    Returns
+    -------
+
+    function
+
+    Notes
+    -----
+
+    The size of the first argument, as from `len` or the `size` attribute,
+    is recorded as the input size.
+
+    """
+    if func is None:
+        return lambda func: instrument(func, name=name)
+    if name is None:
+        name = '%s.%s' % (func.__module__, func.__name__)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _ACTIVE
+        if profile is None:
+            return func(*args, **kwargs)
+        frame = profile._enter(name, _input_size(args))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile._exit(frame)
+
+    return wrapper
+
+
+@contextmanager
+def profile(memory=False, trace=True):
+    """Record the calls of instrumented functions within a block.
+
+    Parameters
+    ----------
+
+    memory : bool, optional
+             If True (default False), also record peak memory, as with
+             `Profile`.
+    trace : bool, optional
+            If True (default), record every call for `Profile.trace`.
+
+    Yields
+    ------
+
+    Profile
+        The profile with the recorded calls.
+
+    Notes
+    -----
+
+    Profiles cannot be nested.  If profiling is already on, the calls are
+    recorded in the profile that is already active.
+
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        yield _ACTIVE
+        return
+
+    prof = Profile(memory=memory, trace=trace)
+    start_tracing = prof.memory and not tracemalloc.is_tracing()
+    if start_tracing:
+        tracemalloc.start()
+    _ACTIVE = prof
+    try:
+        yield prof
+    finally:
+        _ACTIVE = None
+        if start_tracing:
+            tracemalloc.stop()
+
+
+def _report_at_exit(prof, destination):
+    """Print the summary table, or write the trace to a `.json` file."""
+    if destination.lower().endswith('.json'):
+        prof.dump(destination)
+    else:
+        print(prof.table(), file=sys.stderr)
+
+
+def _profile_from_environment():
+    """Turn on profiling for the whole program if `PROFILE_ENV` is set."""
+    global _ACTIVE
+    destination = os.environ.get(PROFILE_ENV)
+    if not destination or destination == '0':
+        return
+    _ACTIVE = Profile(trace=destination.lower().endswith('.json'))
+    atexit.register(_report_at_exit, _ACTIVE, destination)
+
+
+_profile_from_environment()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+Compact containers for many spike trains.
+
+A `SpikeTrainArray` stores the spike times of any number of spike trains in
+one contiguous array, with the start of each train in a second array, and
+shares one set of units between all trains.  Functions in `statistics` and
+`conversion` accept it directly and handle all trains in one vectorized call
+rather than one Python object at a time.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import numpy as np
+import quantities as pq
+
+
+def _units_or_none(units):
+    """Get the units of `units`, a quantity or a unit name, or `None`."""
+    if units is None:
+        return None
+    if not hasattr(units, 'units'):
+        units = pq.Quantity(1, units)
+    return units.units
+
+
+class RaggedArray(object):
+    """A sequence of 1D arrays of different lengths stored as one array.
+
+    Segment `i` is `values[offsets[i]:offsets[i+1]]`.
+
+    Parameters
+    ----------
+
+    values : 1D array-like of floats
+             The values of all segments, concatenated.
+    offsets : 1D array-like of ints
+              The start of each segment in `values`, plus the total length.
+    units : quantities Quantity, str, or None, optional
+            The units of `values`, if any.
+
+    Raises
+    ------
+
+    ValueError
+        If `offsets` does not start at 0, end at the length of `values`, and
+        never decrease.
+
+    """
+
+    def __init__(self, values, offsets, units=None):
+        values = np.ascontiguousarray(values, dtype='float64')
+        offsets = np.ascontiguousarray(offsets, dtype='int64')
+        if (values.ndim != 1 or offsets.ndim != 1 or not len(offsets) or
+                offsets[0] != 0 or offsets[-1] != len(values) or
+                (np.diff(offsets) < 0).any()):
+            raise ValueError('offsets must go from 0 to the length of values '
+                             'without decreasing')
+        self.values = values
+        self.offsets = offsets
+        self.units = _units_or_none(units)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('index out of range')
+        values = self.values[self.offsets[index]:self.offsets[index+1]]
+        if self.units is None:
+            return values
+        return pq.Quantity(values, units=self.units, copy=False)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def counts(self):
+        """The number of values in each segment."""
+        return np.diff(self.offsets)
+
+    @property
+    def segment_index(self):
+        """The index of the segment of each value."""
+        return np.repeat(np.arange(len(self)), self.counts)
+
+    def segment_sums(self, values=None):
+        """Sum `values` within each segment.
+
+        Parameters
+        ----------
+
+        values : 1D NumPy array, optional
+                 One value per element of `self.values`.  If not specified,
+                 use `self.values`.
+
+        Returns
+        -------
+
+        1D NumPy array of floats
+            The sum of each segment, which is 0 for empty segments.
+
+        """
+        if values is None:
+            values = self.values
+        return np.bincount(self.segment_index, weights=values,
+                           minlength=len(self))
+
+
+class SpikeTrainArray(RaggedArray):
+    """The spike times of many spike trains, stored as one array.
+
+    Train `i` is `times[offsets[i]:offsets[i+1]]`, from `t_starts[i]` to
+    `t_stops[i]`.  All times are in `units`.
+
+    Parameters
+    ----------
+
+    times : 1D array-like of floats
+            The spike times of all trains, concatenated.
+    offsets : 1D array-like of ints
+              The start of each train in `times`, plus the total length.
+    t_starts : 1D array-like of floats
+               The start time of each train.
+    t_stops : 1D array-like of floats
+              The stop time of each train.
+    units : quantities Quantity or str, optional
+            The units of all times.  Default is seconds.
+
+    Raises
+    ------
+
+    ValueError
+        If `offsets` is not valid, or `t_starts` and `t_stops` do not have
+        one value per train.
+
+    """
+
+    def __init__(self, times, offsets, t_starts, t_stops, units='s'):
+        super(SpikeTrainArray, self).__init__(times, offsets, units=units)
+        t_starts = np.ascontiguousarray(t_starts, dtype='float64')
+        t_stops = np.ascontiguousarray(t_stops, dtype='float64')
+        if t_starts.shape != (len(self),) or t_stops.shape != (len(self),):
+            raise ValueError('t_starts and t_stops must have one value per '
+                             'spiketrain')
+        self.t_starts = t_starts
+        self.t_stops = t_stops
+
+    @property
+    def times(self):
+        """The spike times of all trains, concatenated, without units."""
+        return self.values
+
+    def __getitem__(self, index):
+        from neo.core import SpikeTrain
+
+        times = super(SpikeTrainArray, self).__getitem__(index)
+        if index < 0:
+            index += len(self)
+        return SpikeTrain(times.magnitude, units=self.units,
+                          t_start=self.t_starts[index] * self.units,
+                          t_stop=self.t_stops[index] * self.units,
+                          copy=False)
+
+    @classmethod
+    def from_spiketrains(cls, container, units=None):
+        """Create a `SpikeTrainArray` from neo SpikeTrains.
+
+        Parameters
+        ----------
+
+        container : list of neo SpikeTrain, or neo container
+                    The spike trains, or anything `get_all_spiketrains`
+                    accepts.
+        units : quantities Quantity or str, optional
+                The units of the array.  If not specified, use the units of
+                the first train, or seconds if there are no trains.
+
+        Returns
+        -------
+
+        SpikeTrainArray
+
+        """
+        from elephant.neo_tools import get_all_spiketrains
+
+        spiketrains = get_all_spiketrains(container)
+        if units is None:
+            units = spiketrains[0].units if spiketrains else pq.s
+        units = _units_or_none(units)
+
+        times = [train.times.rescale(units).magnitude for train in spiketrains]
+        offsets = np.cumsum([0] + [len(train) for train in times])
+        times = np.concatenate(times) if times else []
+        t_starts = [train.t_start.rescale(units).magnitude
+                    for train in spiketrains]
+        t_stops = [train.t_stop.rescale(units).magnitude
+                   for train in spiketrains]
+        return cls(times, offsets, t_starts, t_stops, units=units)
+
+    def to_spiketrains(self):
+        """Get the trains as neo SpikeTrains.
+
+        The SpikeTrains are views into `times` rather than copies.
+
+        Returns
+        -------
+
+        list of neo SpikeTrain
+
+        """
+        return list(self)
@@ -0,0 +1,374 @@
+# -*- coding: utf-8 -*-
+"""
+Functions to generate synthetic spike trains.
+
+All spike trains of a call are generated together: the inter-spike
+intervals of every train are drawn in one vectorized call, turned into spike
+times with a cumulative sum, and split into trains by masking, so
+thousands of trains can be generated at once.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import numpy as np
+import quantities as pq
+from neo.core import SpikeTrain
+
+from elephant._units import magnitude
+
+
+def _check_random_state(random_state=None):
+    """Turn `random_state` into a `numpy.random.RandomState`.
+
+    Parameters
+    ----------
+
+    random_state : None, int, or NumPy RandomState, optional
+                   If `None` (default), use the global NumPy random state.
+                   If an int, use a new RandomState with it as the seed.
+                   If a RandomState, use it as-is.
+
+    Returns
+    -------
+
+    NumPy RandomState
+
+    """
+    if random_state is None:
+        return np.random.mtrand._rand
+    if isinstance(random_state, np.random.RandomState):
+        return random_state
+    return np.random.RandomState(random_state)
+
+
+def _magnitude(value, units):
+    """Get the magnitude of `value` in `units` as a float.
+
+    Values without units are taken to already be in `units`.
+    """
+    return float(magnitude(value, units))
+
+
+def _renewal_times(draw_isis, mean_isi, t_start, t_stop, n):
+    """Generate the spike times of renewal processes.
+
+    Parameters
+    ----------
+
+    draw_isis : function
+                A function that takes a shape and returns an array of
+                intervals of that shape.
+    mean_isi : float
+               The mean of the intervals from `draw_isis`.
+    t_start : float
+              The start of the trains.
+    t_stop : float
+             The end of the trains.
+    n : int
+        The number of trains.
+
+    Returns
+    -------
+
+    times : 1D NumPy array of floats
+            The spike times of all trains, concatenated.
+    offsets : 1D NumPy array of ints
+              The start of each train in `times`, plus the total length.
+
+    """
+    duration = t_stop - t_start
+    expected = duration / mean_isi
+    ncols = int(np.ceil(expected + 5 * np.sqrt(expected) + 10))
+    times = t_start + np.cumsum(draw_isis((n, ncols)), axis=1)
+
+    # in the rare case that a train is not long enough, extend only the
+    # trains that need it
+    short = np.nonzero(times[:, -1] < t_stop)[0]
+    while len(short):
+        extra = times[short, -1:] + np.cumsum(draw_isis((len(short), ncols)),
+                                              axis=1)
+        full = np.empty((n, ncols), dtype=times.dtype)
+        full.fill(np.inf)
+        full[short] = extra
+        times = np.hstack([times, full])
+        short = short[extra[:, -1] < t_stop]
+
+    mask = times < t_stop
+    counts = mask.sum(axis=1)
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype('int64')
+    return times[mask], offsets
+
+
+def _apply_dead_time(times, offsets, dead_time):
+    """Remove the spikes that follow a kept spike by less than `dead_time`.
+
+    Spikes are only removed relative to spikes that are kept, so the result
+    is the same as going through each train spike by spike.
+
+    Parameters
+    ----------
+
+    times : 1D NumPy array of floats
+            The sorted spike times of all trains, concatenated.
+    offsets : 1D NumPy array of ints
+              The start of each train in `times`, plus the total length.
+    dead_time : float
+                The minimum interval between spikes.
+
+    Returns
+    -------
+
+    times, offsets
+        The same as the inputs, without the removed spikes.
+
+    """
+    trainind = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    while True:
+        close = np.zeros(len(times), dtype='bool')
+        close[1:] = ((np.diff(times) < dead_time) &
+                     (trainind[1:] == trainind[:-1]))
+        # a spike that is not itself too close to its predecessor is always
+        # kept, so the spikes right after it that are too close are removed
+        remove = close.copy()
+        remove[1:] &= ~close[:-1]
+        if not remove.any():
+            break
+        times = times[~remove]
+        trainind = trainind[~remove]
+    counts = np.bincount(trainind, minlength=len(offsets) - 1)
+    offsets = np.concatenate([[0], np.cumsum(counts)]).astype('int64')
+    return times, offsets
+
+
+def _to_output(times, offsets, t_start, t_stop, units, as_array):
+    """Return generated spike times as SpikeTrains or as a ragged array.
+
+    The SpikeTrains are views into `times` rather than copies.
+    """
+    if as_array:
+        return times, offsets
+    return [SpikeTrain(times[offsets[i]:offsets[i+1]], units=units,
+                       t_start=t_start * units, t_stop=t_stop * units,
+                       copy=False)
+            for i in range(len(offsets) - 1)]
+
+
+def homogeneous_poisson_process(rate, t_stop, t_start=0 * pq.s, n=1,
+                                dead_time=None, as_array=False,
+                                random_state=None):
+    """Generate spike trains from a homogeneous Poisson process.
+
+    Parameters
+    ----------
+
+    rate : quantities.Quantity scalar
+           The mean firing rate of every train.
+    t_stop : quantities.Quantity scalar
+             The end of the trains.  The trains are in the units of `t_stop`.
+    t_start : quantities.Quantity scalar, optional
+              The start of the trains.  Default is 0 s.
+    n : int, optional
+        The number of trains.  Default is 1.
+    dead_time : quantities.Quantity scalar, optional
+                If specified, the minimum interval between spikes.  The
+                intervals are then this plus an exponential interval, with
+                the mean interval still `1 / rate`.
+    as_array : bool, optional
+               If True (default False), return a ragged array instead of
+               SpikeTrains.
+    random_state : None, int, or NumPy RandomState, optional
+                   The random number generator, or the seed for a new one.
+                   If `None` (default), use the global NumPy random state.
+
+    Returns
+    -------
+
+    list of neo SpikeTrain
+        The generated spike trains.
+        If `as_array` is True, this is instead a tuple of two arrays,
+        `times` and `offsets`: the spike times of all trains concatenated,
+        without units, and the start of each train in `times` plus the total
+        length, so train `i` is `times[offsets[i]:offsets[i+1]]`.
+
+    Notes
+    -----
+
+    A `rate` of 0 gives empty trains.
+
+    Raises
+    ------
+
+    ValueError
+        If `t_stop` is before `t_start`, `rate` is negative, or `dead_time`
+        is not shorter than `1 / rate`.
+
+    """
+    return homogeneous_gamma_process(1, rate, t_stop, t_start=t_start, n=n,
+                                     dead_time=dead_time, as_array=as_array,
+                                     random_state=random_state)
+
+
+def homogeneous_gamma_process(shape, rate, t_stop, t_start=0 * pq.s, n=1,
+                              dead_time=None, as_array=False,
+                              random_state=None):
+    """Generate spike trains from a gamma renewal process.
+
+    The inter-spike intervals follow a gamma distribution with the given
+    shape factor, so the coefficient of variation of the intervals is
+    `1 / sqrt(shape)`.  A shape of 1 gives a Poisson process.
+
+    Parameters
+    ----------
+
+    shape : float
+            The shape factor of the gamma distribution.
+    rate : quantities.Quantity scalar
+           The mean firing rate of every train.
+    t_stop : quantities.Quantity scalar
+             The end of the trains.  The trains are in the units of `t_stop`.
+    t_start : quantities.Quantity scalar, optional
+              The start of the trains.  Default is 0 s.
+    n : int, optional
+        The number of trains.  Default is 1.
+    dead_time : quantities.Quantity scalar, optional
+                If specified, the minimum interval between spikes.  The
+                intervals are then this plus a gamma interval, with the mean
+                interval still `1 / rate`.
+    as_array : bool, optional
+               If True (default False), return a ragged array instead of
+               SpikeTrains.
+    random_state : None, int, or NumPy RandomState, optional
+                   The random number generator, or the seed for a new one.
+                   If `None` (default), use the global NumPy random state.
+
+    Returns
+    -------
+
+    list of neo SpikeTrain
+        The generated spike trains.
+        If `as_array` is True, this is instead a tuple of two arrays,
+        `times` and `offsets`, as with `homogeneous_poisson_process`.
+
+    Notes
+    -----
+
+    The first spike of each train is one interval after `t_start`.
+
+    A `rate` of 0 gives empty trains.
+
+    Raises
+    ------
+
+    ValueError
+        If `t_stop` is before `t_start`, `rate` is negative, or `dead_time`
+        is not shorter than `1 / rate`.
+
+    """
+    random_state = _check_random_state(random_state)
+    units = t_stop.units
+    t_start = _magnitude(t_start, units)
+    t_stop = _magnitude(t_stop, units)
+    if t_stop < t_start:
+        raise ValueError('t_stop must not be before t_start')
+    rate = _magnitude(rate, 1 / units)
+    if rate < 0:
+        raise ValueError('rate must not be negative')
+    if rate == 0:
+        times = np.array([], dtype='float64')
+        offsets = np.zeros(n + 1, dtype='int64')
+        return _to_output(times, offsets, t_start, t_stop, units, as_array)
+
+    mean_isi = 1. / rate
+    dead = 0. if dead_time is None else _magnitude(dead_time, units)
+    if dead >= mean_isi:
+        raise ValueError('dead_time must be shorter than 1 / rate')
+
+    scale = (mean_isi - dead) / shape
+
+    def draw_isis(size):
+        return random_state.gamma(shape, scale, size=size) + dead
+
+    times, offsets = _renewal_times(draw_isis, mean_isi, t_start, t_stop, n)
+    return _to_output(times, offsets, t_start, t_stop, units, as_array)
+
+
+def inhomogeneous_poisson_process(rate, n=1, dead_time=None, as_array=False,
+                                  random_state=None):
+    """Generate spike trains from an inhomogeneous Poisson process.
+
+    The spikes are generated by thinning: a homogeneous Poisson process at the
+    maximum rate is generated for all trains at once, and each spike is kept
+    with a probability of the rate at its time over the maximum rate.
+
+    Parameters
+    ----------
+
+    rate : neo AnalogSignal
+           The firing rate over time, with one sample per `sampling_period`.
+           The rate is constant within each sample.  The trains start and
+           stop at the `t_start` and `t_stop` of `rate`, and are in the units
+           of `t_start`.
+    n : int, optional
+        The number of trains.  Default is 1.
+    dead_time : quantities.Quantity scalar, optional
+                If specified, spikes that come less than this after the
+                previous spike are removed, which lowers the rate.
+    as_array : bool, optional
+               If True (default False), return a ragged array instead of
+               SpikeTrains.
+    random_state : None, int, or NumPy RandomState, optional
+                   The random number generator, or the seed for a new one.
+                   If `None` (default), use the global NumPy random state.
+
+    Returns
+    -------
+
+    list of neo SpikeTrain
+        The generated spike trains.
+        If `as_array` is True, this is instead a tuple of two arrays,
+        `times` and `offsets`, as with `homogeneous_poisson_process`.
+
+    Raises
+    ------
+
+    ValueError
+        If any value of `rate` is negative.
+
+    """
+    random_state = _check_random_state(random_state)
+    units = rate.t_start.units
+    t_start = _magnitude(rate.t_start, units)
+    t_stop = _magnitude(rate.t_stop, units)
+    period = _magnitude(rate.sampling_period, units)
+    rates = rate.rescale(1 / units).magnitude.ravel()
+    if (rates < 0).any():
+        raise ValueError('rate must not be negative')
+
+    max_rate = rates.max() if len(rates) else 0.
+    if max_rate == 0:
+        times = np.array([], dtype='float64')
+        offsets = np.zeros(n + 1, dtype='int64')
+        return _to_output(times, offsets, t_start, t_stop, units, as_array)
+
+    def draw_isis(size):
+        return random_state.exponential(1. / max_rate, size=size)
+
+    times, offsets = _renewal_times(draw_isis, 1. / max_rate, t_start,
+                                    t_stop, n)
+
+    bins = np.minimum(((times - t_start) / period).astype('int64'),
+                      len(rates) - 1)
+    keep = random_state.uniform(size=len(times)) * max_rate < rates[bins]
+    trainind = np.repeat(np.arange(n), np.diff(offsets))[keep]
+    times = times[keep]
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(trainind,
+                                                         minlength=n))])
+    offsets = offsets.astype('int64')
+
+    if dead_time is not None:
+        times, offsets = _apply_dead_time(times, offsets,
+                                          _magnitude(dead_time, units))
+    return _to_output(times, offsets, t_start, t_stop, units, as_array)
@@ -0,0 +1,482 @@
+# -*- coding: utf-8 -*-
+"""
+Functions to generate surrogates of spike trains, for significance testing.
+
+All surrogates of all trains are generated together from one contiguous
+array of spike times, with one vectorized random draw per step, rather than
+train by train and surrogate by surrogate.  Surrogates can be returned as
+SpikeTrains, as a ragged array, or as a NaN-padded 3D array, and can be
+generated in chunks so statistics can be computed on many surrogates without
+holding all of them in memory.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+from functools import partial
+import multiprocessing
+
+from neo.core import SpikeTrain
+import numpy as np
+import quantities as pq
+
+from elephant.spike_train_array import SpikeTrainArray
+from elephant.spike_train_generation import _check_random_state, _magnitude
+
+
+def _spiketrains_to_ragged(spiketrains):
+    """Get the spike times of spiketrains as one contiguous array.
+
+    Parameters
+    ----------
+
+    spiketrains : list of neo SpikeTrain, neo container, or SpikeTrainArray
+                  The spike trains, or anything `get_all_spiketrains`
+                  accepts.
+
+    Returns
+    -------
+
+    times : 1D NumPy array of floats
+            The spike times of all trains, concatenated, in `units`.
+    offsets : 1D NumPy array of ints
+              The start of each train in `times`, plus the total length.
+    t_starts : 1D NumPy array of floats
+               The start time of each train, in `units`.
+    t_stops : 1D NumPy array of floats
+              The stop time of each train, in `units`.
+    units : quantities Quantity
+            The units of the first train, or of the SpikeTrainArray.
+
+    """
+    if not isinstance(spiketrains, SpikeTrainArray):
+        spiketrains = SpikeTrainArray.from_spiketrains(spiketrains)
+    if not len(spiketrains):
+        raise ValueError('No spiketrains to create surrogates from')
+    times = spiketrains.times
+    offsets = spiketrains.offsets
+    t_starts = spiketrains.t_starts
+    t_stops = spiketrains.t_stops
+    units = spiketrains.units
+    return times, offsets, t_starts, t_stops, units
+
+
+def _offsets_from_segments(segind, nseg):
+    """Get the offsets of sorted segment indexes."""
+    counts = np.bincount(segind, minlength=nseg)
+    return np.concatenate([[0], np.cumsum(counts)]).astype('int64')
+
+
+def _sort_segments(times, segind, nseg):
+    """Sort times within each segment, and get the segment offsets."""
+    order = np.lexsort((times, segind))
+    return times[order], _offsets_from_segments(segind[order], nseg)
+
+
+def _dither_spikes(times, segind, t_starts, t_stops, random_state, dither,
+                   edges):
+    """Move every spike by a uniform random amount up to `dither`."""
+    nseg = len(t_starts)
+    low = times - dither
+    high = times + dither
+    if not edges:
+        low = np.maximum(low, t_starts[segind])
+        high = np.minimum(high, t_stops[segind])
+    times = low + random_state.uniform(size=len(times)) * (high - low)
+    if edges:
+        keep = (times >= t_starts[segind]) & (times <= t_stops[segind])
+        times = times[keep]
+        segind = segind[keep]
+    return _sort_segments(times, segind, nseg)
+
+
+def _shuffle_isis(times, segind, t_starts, t_stops, random_state, dither,
+                  edges):
+    """Randomly reorder the intervals of each train.
+
+    The interval from `t_start` to the first spike is included, so the last
+    spike stays in place.
+    """
+    nseg = len(t_starts)
+    offsets = _offsets_from_segments(segind, nseg)
+    first = offsets[:-1][offsets[:-1] < len(times)]
+    intervals = np.empty_like(times)
+    intervals[1:] = np.diff(times)
+    intervals[first] = times[first] - t_starts[segind[first]]
+
+    order = np.lexsort((random_state.uniform(size=len(times)), segind))
+    intervals = intervals[order]
+    cumulative = np.cumsum(intervals)
+    before = np.concatenate([[0], cumulative])[offsets[:-1]]
+    times = (t_starts[segind] + cumulative -
+             np.repeat(before, np.diff(offsets)))
+    return times, offsets
+
+
+def _train_shifting(times, segind, t_starts, t_stops, random_state, dither,
+                    edges):
+    """Shift every train as a whole by a uniform random amount up to `dither`.
+
+    Spikes shifted past one end of the train wrap around to the other end.
+    """
+    nseg = len(t_starts)
+    shifts = random_state.uniform(-dither, dither, size=nseg)
+    durations = (t_stops - t_starts)[segind]
+    times = t_starts[segind] + np.mod(times - t_starts[segind] +
+                                      shifts[segind], durations)
+    return _sort_segments(times, segind, nseg)
+
+
+# The surrogate methods that change the spike times within each train,
+# applied to all surrogates of all trains at once.
+_WITHIN_TRAIN_METHODS = {'dither_spikes': _dither_spikes,
+                         'shuffle_isis': _shuffle_isis,
+                         'train_shifting': _train_shifting}
+
+# All surrogate methods.
+SURROGATE_METHODS = sorted(_WITHIN_TRAIN_METHODS) + ['trial_shuffling']
+
+
+def _trial_shuffling(times, offsets, t_starts, t_stops, n, random_state):
+    """Randomly reorder the trains, once per surrogate.
+
+    The trains are taken to be trials of the same unit.  Every train is
+    moved relative to the `t_start` of the trial it replaces, and spikes
+    after the `t_stop` of that trial are removed.
+    """
+    ntrains = len(t_starts)
+    source = np.argsort(random_state.uniform(size=(n, ntrains)),
+                        axis=1).ravel()
+    dest = np.tile(np.arange(ntrains), n)
+    counts = np.diff(offsets)[source]
+    newoffsets = np.concatenate([[0], np.cumsum(counts)]).astype('int64')
+    index = (np.arange(newoffsets[-1]) +
+             np.repeat(offsets[source] - newoffsets[:-1], counts))
+    segind = np.repeat(np.arange(len(dest)), counts)
+    shifts = t_starts[dest] - t_starts[source]
+    times = times[index] + shifts[segind]
+    keep = times <= t_stops[dest][segind]
+    if keep.all():
+        return times, newoffsets
+    return times[keep], _offsets_from_segments(segind[keep], len(dest))
+
+
+def _surrogate_chunk(chunk, times, offsets, t_starts, t_stops, method,
+                     dither, edges):
+    """Generate `n` surrogates of every train.
+
+    Parameters
+    ----------
+
+    chunk : tuple
+            The number of surrogates to generate, and the random state or
+            seed to generate them with.
+    times, offsets, t_starts, t_stops
+            The trains, as from `_spiketrains_to_ragged`.
+    method : str
+             One of `SURROGATE_METHODS`.
+    dither : float
+             The maximum displacement, in the units of `times`.
+    edges : bool
+            Whether dithered spikes outside the train are removed.
+
+    Returns
+    -------
+
+    times : 1D NumPy array of floats
+            The spike times of all surrogates, concatenated.  Surrogate `j`
+            of train `i` is segment `j * len(t_starts) + i`.
+    offsets : 1D NumPy array of ints
+              The start of each segment in `times`, plus the total length.
+
+    """
+    n, random_state = chunk
+    random_state = _check_random_state(random_state)
+    if method == 'trial_shuffling':
+        return _trial_shuffling(times, offsets, t_starts, t_stops, n,
+                                random_state)
+
+    ntrains = len(t_starts)
+    trainind = np.repeat(np.arange(ntrains), np.diff(offsets))
+    segind = (np.tile(trainind, n) +
+              np.repeat(np.arange(n) * ntrains, len(times)))
+    return _WITHIN_TRAIN_METHODS[method](np.tile(times, n), segind,
+                                         np.tile(t_starts, n),
+                                         np.tile(t_stops, n),
+                                         random_state, dither, edges)
+
+
+def _format_surrogates(times, offsets, t_starts, t_stops, units, output):
+    """Convert surrogates from `_surrogate_chunk` to the requested output."""
+    ntrains = len(t_starts)
+    n = (len(offsets) - 1) // ntrains
+    if output == 'ragged':
+        return times, offsets
+    if output == 'padded':
+        counts = np.diff(offsets)
+        width = counts.max() if len(counts) else 0
+        padded = np.empty((len(counts), width), dtype=times.dtype)
+        padded.fill(np.nan)
+        rowind = np.repeat(np.arange(len(counts)), counts)
+        colind = np.arange(len(times)) - np.repeat(offsets[:-1], counts)
+        padded[rowind, colind] = times
+        return padded.reshape(n, ntrains, width)
+    return [[SpikeTrain(times[offsets[j*ntrains+i]:offsets[j*ntrains+i+1]],
+                        units=units, t_start=t_starts[i] * units,
+                        t_stop=t_stops[i] * units, copy=False)
+             for i in range(ntrains)]
+            for j in range(n)]
+
+
+def _iter_surrogate_chunks(data, n, method, dither, edges, chunk_size,
+                           processes, random_state):
+    """Generate surrogates of ragged trains in chunks.
+
+    Parameters
+    ----------
+
+    data : tuple
+           The trains, as from `_spiketrains_to_ragged`.
+    n, method, dither, edges, chunk_size, processes, random_state
+           See `iter_surrogates`.
+
+    Yields
+    ------
+
+    tuple
+        The `times` and `offsets` of a chunk, as from `_surrogate_chunk`.
+
+    """
+    if method not in SURROGATE_METHODS:
+        raise ValueError('method must be one of %s, not %r' %
+                         (', '.join(SURROGATE_METHODS), method))
+    if n < 0:
+        raise ValueError('n cannot be negative')
+
+    times, offsets, t_starts, t_stops, units = data
+    random_state = _check_random_state(random_state)
+    sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+    func = partial(_surrogate_chunk, times=times, offsets=offsets,
+                   t_starts=t_starts, t_stops=t_stops, method=method,
+                   dither=_magnitude(dither, units), edges=edges)
+
+    if processes == 1:
+        for size in sizes:
+            yield func((size, random_state))
+        return
+
+    seeds = random_state.randint(np.iinfo('int32').max, size=len(sizes))
+    pool = multiprocessing.Pool(processes=processes)
+    try:
+        for chunk in pool.imap(func, zip(sizes, seeds)):
+            yield chunk
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _check_output(output):
+    """Raise a ValueError if `output` is not a valid surrogate format."""
+    if output not in ('spiketrains', 'ragged', 'padded'):
+        raise ValueError("output must be 'spiketrains', 'ragged', or "
+                         "'padded', not %r" % output)
+
+
+def iter_surrogates(spiketrains, n=1, method='dither_spikes',
+                    dither=15 * pq.ms, edges=True, output='spiketrains',
+                    chunk_size=100, processes=1, random_state=None):
+    """Generate surrogates of spike trains in chunks.
+
+    This is the same as `surrogates`, except that a chunk of `chunk_size`
+    surrogates is generated at a time, so only one chunk has to be held in
+    memory at once.
+
+    Parameters
+    ----------
+
+    spiketrains : list of neo SpikeTrain, or neo container
+    n : int, optional
+    method : str, optional
+    dither : quantities.Quantity scalar, optional
+    edges : bool, optional
+    output : str, optional
+    processes : int, optional
+    random_state : None, int, or NumPy RandomState, optional
+        See `surrogates`.
+    chunk_size : int, optional
+                 The maximum number of surrogates per chunk.  The last chunk
+                 can be smaller.  Default is 100.
+
+    Yields
+    ------
+
+    The surrogates of a chunk, in the format given by `output`, as from
+    `surrogates`.
+
+    Notes
+    -----
+
+    With more than one process, chunks are generated in parallel but are
+    still yielded in order.  Each chunk is then generated with its own seed
+    drawn from `random_state`, so the results depend on `chunk_size`.
+
+    """
+    _check_output(output)
+    data = _spiketrains_to_ragged(spiketrains)
+    _, _, t_starts, t_stops, units = data
+    for times, offsets in _iter_surrogate_chunks(data, n, method, dither,
+                                                 edges, chunk_size,
+                                                 processes, random_state):
+        yield _format_surrogates(times, offsets, t_starts, t_stops, units,
+                                 output)
+
+
+def surrogates(spiketrains, n=1, method='dither_spikes', dither=15 * pq.ms,
+               edges=True, output='spiketrains', processes=1,
+               random_state=None):
+    """Generate surrogates of spike trains.
+
+    Parameters
+    ----------
+
+    spiketrains : list of neo SpikeTrain, neo container, or SpikeTrainArray
+                  The spike trains, or anything `get_all_spiketrains`
+                  accepts.  Surrogates are in the units of the first train.
+    n : int, optional
+        The number of surrogates of each train.  Default is 1.  If 0, the
+        result is empty.
+    method : str, optional
+             How to generate the surrogates.  Default is `'dither_spikes'`.
+
+             * `'dither_spikes'`: move every spike by a uniform random amount
+               of at most `dither`.
+             * `'shuffle_isis'`: randomly reorder the inter-spike intervals
+               of every train, including the interval from `t_start` to the
+               first spike.
+             * `'train_shifting'`: shift every train as a whole by a uniform
+               random amount of at most `dither`, wrapping spikes around
+               from one end of the train to the other.
+             * `'trial_shuffling'`: randomly reorder the trains, taken to be
+               trials of the same unit, moving every train relative to the
+               `t_start` of the trial it replaces.  Spikes after the
+               `t_stop` of that trial are removed.  Use with the trains of
+               one unit at a time.
+
+    dither : quantities.Quantity scalar, optional
+             The maximum displacement, for `'dither_spikes'` and
+             `'train_shifting'`.  Default is 15 ms.
+    edges : bool, optional
+            For `'dither_spikes'`.  If True (default), spikes dithered outside
+            of the train are removed.  If False, the dithering window is
+            limited so spikes stay inside the train.
+    output : str, optional
+             The format of the surrogates.  Default is `'spiketrains'`.
+
+             * `'spiketrains'`: a list of `n` lists of neo SpikeTrains, each
+               with one surrogate of every train.
+             * `'ragged'`: a tuple of two arrays, `times` and `offsets`: the
+               spike times of all surrogates concatenated, without units, and
+               the start of each surrogate in `times` plus the total length.
+               Surrogate `j` of train `i` is segment `j * len(spiketrains) +
+               i`.
+             * `'padded'`: a 3D array of floats with one surrogate per
+               surrogate number and train, padded with NaN.
+
+    processes : int, optional
+                The number of worker processes.  If `None`, use the number of
+                CPUs.  If 1 (default), everything is done in the current
+                process without starting a pool.
+    random_state : None, int, or NumPy RandomState, optional
+                   The random number generator, or the seed for a new one.
+                   If `None` (default), use the global NumPy random state.
+
+    Returns
+    -------
+
+    list of lists of neo SpikeTrain, tuple of arrays, or 3D array
+        The surrogates, in the format given by `output`.
+
+    Raises
+    ------
+
+    ValueError
+        If `method` or `output` is not one of the options, `n` is negative,
+        or there are no spiketrains.
+
+    Notes
+    -----
+
+    With more than one process, the surrogates are split into one chunk per
+    process, each generated with its own seed drawn from `random_state`.
+    Only the arrays of spike times are sent to the workers.
+
+    """
+    _check_output(output)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    chunk_size = max(1, -(-n // processes))
+    data = _spiketrains_to_ragged(spiketrains)
+    _, _, t_starts, t_stops, units = data
+    chunks = list(_iter_surrogate_chunks(data, n, method, dither, edges,
+                                         chunk_size, processes,
+                                         random_state))
+    if not chunks:
+        return _format_surrogates(np.zeros(0), np.zeros(1, dtype='int64'),
+                                  t_starts, t_stops, units, output)
+    times = np.concatenate([chunk[0] for chunk in chunks])
+    starts = np.cumsum([0] + [len(chunk[0]) for chunk in chunks[:-1]])
+    offsets = np.concatenate([[0]] + [chunk[1][1:] + start
+                                      for chunk, start in zip(chunks,
+                                                              starts)])
+    return _format_surrogates(times, offsets.astype('int64'), t_starts,
+                              t_stops, units, output)
+
+
+def surrogate_statistic(spiketrains, func, n=1, method='dither_spikes',
+                        dither=15 * pq.ms, edges=True, chunk_size=100,
+                        processes=1, random_state=None):
+    """Compute a statistic on every surrogate, without keeping them all.
+
+    Surrogates are generated `chunk_size` at a time with `iter_surrogates`,
+    and `func` is called on each surrogate as soon as its chunk is ready.
+
+    Parameters
+    ----------
+
+    spiketrains : list of neo SpikeTrain, or neo container
+    n : int, optional
+    method : str, optional
+    dither : quantities.Quantity scalar, optional
+    edges : bool, optional
+    chunk_size : int, optional
+    processes : int, optional
+    random_state : None, int, or NumPy RandomState, optional
+        See `iter_surrogates`.
+    func : callable
+           Called with one surrogate, a list of neo SpikeTrains with one
+           surrogate of every train, such as `statistics.fanofactor`.
+
+    Returns
+    -------
+
+    NumPy array
+        The return values of `func`, one per surrogate along the first axis.
+
+    Examples
+    --------
+
+    >>> from elephant.statistics import fanofactor
+    >>> fanos = surrogate_statistic(trials, fanofactor, n=1000,
+    ...                             method='dither_spikes')
+
+    """
+    res = []
+    for chunk in iter_surrogates(spiketrains, n=n, method=method,
+                                 dither=dither, edges=edges,
+                                 output='spiketrains', chunk_size=chunk_size,
+                                 processes=processes,
+                                 random_state=random_state):
+        res.extend(func(surrogate) for surrogate in chunk)
+    return np.array(res)
@@ -10,10 +10,79 @@ from __future__ import division, print_function
 
 import numpy as np
 import quantities as pq
-import scipy.stats
-import neo.core
 
+from elephant._units import inverse_units, magnitude
+from elephant.caching import cached
+from elephant.profiling import instrument
+from elephant.spike_train_array import RaggedArray
 
+
+def _ragged_magnitude(value, units, name):
+    """Get the magnitude of `value` in the units of a `RaggedArray`.
+
+    Values without units are taken to already be in `units`.
+
+    Raises
+    ------
+
+    TypeError
+        If `value` is a Quantity and `units` is None.
+
+    """
+    if units is None and hasattr(value, 'units'):
+        raise TypeError('%s cannot be a Quantity if spiketrain is not a '
+                        'quantity' % name)
+    return magnitude(value, units)
+
+
+def _ragged_isi(spiketrains):
+    """Get the inter-spike intervals of every train of a `RaggedArray`."""
+    segind = spiketrains.segment_index
+    within = segind[1:] == segind[:-1]
+    intervals = np.diff(spiketrains.values)[within]
+    counts = np.maximum(spiketrains.counts - 1, 0)
+    return RaggedArray(intervals, np.concatenate([[0], np.cumsum(counts)]),
+                       units=spiketrains.units)
+
+
+def _ragged_mean_firing_rate(spiketrains, t_start=None, t_stop=None):
+    """Get the firing rate of every train of a `RaggedArray`."""
+    units = spiketrains.units
+    nseg = len(spiketrains)
+    segind = spiketrains.segment_index
+    values = spiketrains.values
+
+    if t_start is None:
+        t_start = getattr(spiketrains, 't_starts', 0)
+    if t_stop is None:
+        t_stop = getattr(spiketrains, 't_stops', None)
+    if t_stop is None:
+        t_stop = np.empty(nseg)
+        t_stop.fill(np.nan)
+        np.fmax.at(t_stop, segind, values)
+    t_start = np.zeros(nseg) + _ragged_magnitude(t_start, units, 't_start')
+    t_stop = np.zeros(nseg) + _ragged_magnitude(t_stop, units, 't_stop')
+
+    inside = (values >= t_start[segind]) & (values <= t_stop[segind])
+    counts = np.bincount(segind[inside], minlength=nseg)
+    rates = counts / (t_stop - t_start)
+    if units is None:
+        return rates
+    return pq.Quantity(rates, units=inverse_units(units), copy=False)
+
+
+def _ragged_cv(values):
+    """Get the coefficient of variation of every segment of a RaggedArray."""
+    counts = values.counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = values.segment_sums() / counts
+        deviations = values.values - means[values.segment_index]
+        stds = np.sqrt(values.segment_sums(deviations ** 2) / counts)
+        return stds / means
+
+
+@instrument
+@cached
 def isi(spiketrain, axis=-1):
     """
     Return an array containing the inter-spike intervals of the SpikeTrain.
@@ -26,7 +95,8 @@ def isi(spiketrain, axis=-1):
     Parameters
     ----------
 
-    spiketrain : Neo SpikeTrain or Quantity array or NumPy ndarray
+    spiketrain : Neo SpikeTrain or Quantity array or NumPy ndarray or
+                 SpikeTrainArray
                  The spike times.
     axis : int, optional
            The axis along which the difference is taken.
@@ -36,8 +106,13 @@ def isi(spiketrain, axis=-1):
     -------
 
     NumPy array or quantities array.
+        If `spiketrain` is a `SpikeTrainArray` or other `RaggedArray`, this
+        is instead a `RaggedArray` with the intervals of each train, and
+        `axis` is ignored.
 
     """
+    if isinstance(spiketrain, RaggedArray):
+        return _ragged_isi(spiketrain)
     if axis is None:
         axis = -1
     intervals = np.diff(spiketrain, axis=axis)
@@ -46,6 +121,8 @@ def isi(spiketrain, axis=-1):
     return intervals
 
 
+@instrument
+@cached
 def mean_firing_rate(spiketrain, t_start=None, t_stop=None, axis=None):
     """
     Return the firing rate of the SpikeTrain.
@@ -61,7 +138,8 @@ def mean_firing_rate(spiketrain, t_start=None, t_stop=None, axis=None):
     Parameters
     ----------
 
-    spiketrain : Neo SpikeTrain or Quantity array or NumPy ndarray
+    spiketrain : Neo SpikeTrain or Quantity array or NumPy ndarray or
+                 SpikeTrainArray
                  The spike times.
     t_start : float or Quantity scalar, optional
               The start time to use for the inveral.
@@ -82,6 +160,9 @@ def mean_firing_rate(spiketrain, t_start=None, t_stop=None, axis=None):
     -------
 
     float, quantities scalar, NumPy array or quantities array.
+        If `spiketrain` is a `SpikeTrainArray`, this has the rate of each
+        train, using the `t_starts` and `t_stops` of the trains unless
+        `t_start` or `t_stop` are specified, and `axis` is ignored.
 
     Notes
     -----
@@ -98,54 +179,78 @@ def mean_firing_rate(spiketrain, t_start=None, t_stop=None, axis=None):
         is a quantity scalar.
 
     """
+    if isinstance(spiketrain, RaggedArray):
+        return _ragged_mean_firing_rate(spiketrain, t_start, t_stop)
+
     if t_start is None:
         t_start = getattr(spiketrain, 't_start', 0)
 
+    # figure out what units, if any, we are dealing with, and do the
+    # calculation on the magnitudes
+    units = getattr(spiketrain, 'units', None)
+    values = getattr(spiketrain, 'magnitude', spiketrain)
+
     found_t_start = False
     if t_stop is None:
         if hasattr(spiketrain, 't_stop'):
             t_stop = spiketrain.t_stop
         else:
-            t_stop = np.max(spiketrain, axis=axis)
+            t_stop = np.max(values, axis=axis)
             found_t_start = True
 
-    # figure out what units, if any, we are dealing with
-    if hasattr(spiketrain, 'units'):
-        units = spiketrain.units
+    # convert everything to the magnitude in the same units, using cached
+    # conversion factors rather than arithmetic on quantities
+    if units is None:
+        for name, value in (('t_start', t_start), ('t_stop', t_stop)):
+            if hasattr(value, 'units'):
+                raise TypeError('%s cannot be a Quantity if '
+                                'spiketrain is not a quantity' % name)
     else:
-        units = None
-
-    # convert everything to the same units
-    if hasattr(t_start, 'units'):
-        if units is None:
-            raise TypeError('t_start cannot be a Quantity if '
-                            'spiketrain is not a quantity')
-        t_start = t_start.rescale(units)
-    elif units is not None:
-        t_start = pq.Quantity(t_start, units=units)
-    if hasattr(t_stop, 'units'):
-        if units is None:
-            raise TypeError('t_stop cannot be a Quantity if '
-                            'spiketrain is not a quantity')
-        t_stop = t_stop.rescale(units)
-    elif units is not None:
-        t_stop = pq.Quantity(t_stop, units=units)
+        t_start = magnitude(t_start, units)
+        t_stop = magnitude(t_stop, units)
 
     if not axis or not found_t_start:
-        return np.sum((spiketrain >= t_start) & (spiketrain <= t_stop),
-                      axis=axis) / (t_stop-t_start)
+        t_stop_test = t_stop
     else:
         # this is needed to handle broadcasting between spiketrain and t_stop
         t_stop_test = np.expand_dims(t_stop, axis)
-        return np.sum((spiketrain >= t_start) & (spiketrain <= t_stop_test),
-                      axis=axis) / (t_stop-t_start)
+    rate = np.sum((values >= t_start) & (values <= t_stop_test),
+                  axis=axis) / (t_stop-t_start)
+    if units is None:
+        return rate
+    return pq.Quantity(rate, units=inverse_units(units), copy=False)
+
+
+@instrument
+@cached
+def cv(*args, **kwargs):
+    """
+    Return the coefficient of variation, the standard deviation over the mean.
 
+    This is `scipy.stats.variation`, provided under this name for the
+    convenience of former NeuroTools users.  All arguments are passed to it.
 
-# we make `cv` an alias for scipy.stats.variation for the convenience
-# of former NeuroTools users
-cv = scipy.stats.variation
+    If the only argument is a `RaggedArray`, such as the intervals from
+    `isi` of a `SpikeTrainArray`, this is instead an array with the
+    coefficient of variation of each segment, computed without scipy.
 
+    Notes
+    -----
 
+    `scipy.stats` is slow to import, so it is only imported the first time
+    this function is called rather than when this module is imported.
+
+    """
+    if args and isinstance(args[0], RaggedArray):
+        if len(args) > 1 or kwargs:
+            raise TypeError('cv takes no other arguments with a RaggedArray')
+        return _ragged_cv(args[0])
+    from scipy.stats import variation
+    return variation(*args, **kwargs)
+
+
+@instrument
+@cached
 def fanofactor(spiketrains):
     """
     Evaluates the empirical Fano factor F of the spike counts of
@@ -164,7 +269,7 @@ def fanofactor(spiketrains):
     Parameters
     ----------
     spiketrains : list of neo.core.SpikeTrain objects, quantity array,
-                  numpy array or list
+                  numpy array, list, or SpikeTrainArray
         Spike trains for which to compute the Fano factor of spike counts.
 
     Returns
@@ -174,7 +279,10 @@ def fanofactor(spiketrains):
         empty list is specified, or if all spike trains are empty, F:=nan.
     """
     # Build array of spike counts (one per spike train)
-    spike_counts = np.array([len(t) for t in spiketrains])
+    if isinstance(spiketrains, RaggedArray):
+        spike_counts = spiketrains.counts
+    else:
+        spike_counts = np.array([len(t) for t in spiketrains])
 
     # Compute FF
     if all([count == 0 for count in spike_counts]):
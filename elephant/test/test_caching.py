@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the caching module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import neo
+import numpy as np
+from numpy.testing import assert_array_equal
+import quantities as pq
+
+from elephant import caching
+from elephant.conversion import binarize
+from elephant.statistics import mean_firing_rate
+
+CALLS = []
+
+
+@caching.cached
+def counted(values, scale=1.):
+    CALLS.append(1)
+    return values * scale
+
+
+@caching.cached
+def counted_tuple(values):
+    CALLS.append(1)
+    return values.sum(), values * pq.ms
+
+
+class CachingTestCase(unittest.TestCase):
+    def setUp(self):
+        del CALLS[:]
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = caching.set_cache(self.tmpdir)
+
+    def tearDown(self):
+        caching.set_cache(None)
+        shutil.rmtree(self.tmpdir)
+
+    def test__disabled(self):
+        caching.set_cache(None)
+        counted(np.arange(5.))
+        counted(np.arange(5.))
+
+        self.assertEqual(len(CALLS), 2)
+        self.assertIsNone(caching.get_cache())
+
+    def test__hit_is_memmap(self):
+        res0 = counted(np.arange(5.), scale=2.)
+        res1 = counted(np.arange(5.), scale=2.)
+
+        self.assertEqual(len(CALLS), 1)
+        assert_array_equal(res0, res1)
+        self.assertIsInstance(res1, np.memmap)
+        self.assertFalse(res1.flags.writeable)
+
+    def test__key_depends_on_inputs(self):
+        counted(np.arange(5.))
+        counted(np.arange(5.), scale=2.)
+        counted(np.arange(6.))
+        counted(np.arange(5.).astype('float32'))
+        counted(pq.Quantity(np.arange(5.), 's'))
+        counted(pq.Quantity(np.arange(5.), 'ms'))
+
+        self.assertEqual(len(CALLS), 6)
+
+    def test__argument_forms(self):
+        counted(np.arange(5.))
+        counted(np.arange(5.), 1.)
+        counted(np.arange(5.), scale=1.)
+        counted(values=np.arange(5.), scale=1.)
+
+        self.assertEqual(len(CALLS), 1)
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test__invalidate_argument_forms(self):
+        counted(np.arange(5.), scale=2.)
+        caching.invalidate(counted, np.arange(5.), 2.)
+        counted(np.arange(5.), scale=2.)
+
+        self.assertEqual(len(CALLS), 2)
+
+    def test__invalidate_not_cached_typeerror(self):
+        self.assertRaises(TypeError, caching.invalidate, len, [1])
+
+    def test__wrong_arguments_typeerror(self):
+        self.assertRaises(TypeError, counted, np.arange(5.), wrong=1)
+        self.assertEqual(self.cache.entries(), [])
+
+    def test__spiketrain_key(self):
+        train0 = neo.SpikeTrain([1., 2.], units='s', t_stop=10.)
+        train1 = neo.SpikeTrain([1., 2.], units='s', t_stop=20.)
+
+        res0 = mean_firing_rate(train0)
+        res1 = mean_firing_rate(train1)
+        res2 = mean_firing_rate(train0)
+
+        self.assertEqual(len(self.cache.entries()), 2)
+        self.assertEqual(res0, res2)
+        self.assertNotEqual(res0, res1)
+        self.assertEqual(res2.units, 1 / pq.s)
+
+    def test__binarize(self):
+        train = neo.SpikeTrain([.1, .5], units='s', t_stop=1.)
+        res0, times0 = binarize(train, sampling_rate=10 * pq.Hz,
+                                return_times=True)
+        res1, times1 = binarize(train, sampling_rate=10 * pq.Hz,
+                                return_times=True)
+
+        assert_array_equal(res0, res1)
+        assert_array_equal(times0, times1)
+        self.assertEqual(res1.dtype, np.dtype('bool'))
+        self.assertEqual(times1.units, pq.s)
+
+    def test__tuple_and_scalar(self):
+        res0 = counted_tuple(np.arange(5.))
+        res1 = counted_tuple(np.arange(5.))
+
+        self.assertEqual(len(CALLS), 1)
+        self.assertIsInstance(res1, tuple)
+        self.assertEqual(res1[0], 10.)
+        self.assertIsInstance(res1[0], np.float64)
+        assert_array_equal(res1[1], res0[1])
+        self.assertEqual(res1[1].units, pq.ms)
+
+    def test__uncacheable(self):
+        counted(np.array([1, 2], dtype=object), scale=1)
+        counted([object()], scale=1)
+
+        self.assertEqual(len(CALLS), 2)
+        self.assertEqual(self.cache.entries(), [])
+
+    def test__invalidate(self):
+        counted(np.arange(5.))
+        counted(np.arange(6.))
+        caching.invalidate(counted, np.arange(5.))
+        counted(np.arange(5.))
+        counted(np.arange(6.))
+
+        self.assertEqual(len(CALLS), 3)
+
+    def test__clear(self):
+        counted(np.arange(5.))
+        caching.clear_cache()
+        counted(np.arange(5.))
+
+        self.assertEqual(len(CALLS), 2)
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test__lru_eviction(self):
+        counted(np.zeros(1000))
+        size = self.cache.size()
+        self.cache.max_size = 2 * size
+        for i, key in enumerate([1., 2.]):
+            time.sleep(.01)
+            counted(np.zeros(1000) + key)
+            if not i:
+                # use the first entry, so the entry for 1. is evicted first
+                time.sleep(.01)
+                counted(np.zeros(1000))
+
+        self.assertLessEqual(self.cache.size(), 2 * size)
+        del CALLS[:]
+        counted(np.zeros(1000))
+        counted(np.zeros(1000) + 2.)
+        self.assertEqual(len(CALLS), 0)
+        counted(np.zeros(1000) + 1.)
+        self.assertEqual(len(CALLS), 1)
+
+    def test__environment(self):
+        os.environ[caching.CACHE_DIR_ENV] = self.tmpdir
+        os.environ[caching.CACHE_SIZE_ENV] = '1000'
+        try:
+            caching._cache_from_environment()
+        finally:
+            del os.environ[caching.CACHE_DIR_ENV]
+            del os.environ[caching.CACHE_SIZE_ENV]
+
+        self.assertEqual(caching.get_cache().path, self.tmpdir)
+        self.assertEqual(caching.get_cache().max_size, 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
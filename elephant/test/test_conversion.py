@@ -14,6 +14,7 @@ from numpy.testing.utils import assert_array_almost_equal
 import quantities as pq
 
 import elephant.conversion as cv
+from elephant.spike_train_array import RaggedArray, SpikeTrainArray
 
 
 def get_nearest(times, time):
@@ -172,6 +173,33 @@ class binarize_TestCase(unittest.TestCase):
                           t_start=0., t_stop=pq.Quantity(10, 'ms'))
         self.assertRaises(ValueError, cv.binarize, st1)
 
+    def test_binarize_spiketrainarray(self):
+        trains = [neo.SpikeTrain([.1, .5, 1.], units='s', t_stop=1.),
+                  neo.SpikeTrain([], units='s', t_stop=1.),
+                  neo.SpikeTrain([200., 800.], units='ms', t_stop=1000.)]
+        arr = SpikeTrainArray.from_spiketrains(trains)
+
+        res, times = cv.binarize(arr, sampling_rate=10 * pq.Hz,
+                                 return_times=True)
+
+        self.assertEqual(res.shape, (3, 11))
+        for row, train in zip(res, trains):
+            targ = cv.binarize(train, sampling_rate=10 * pq.Hz)
+            assert_array_almost_equal(row, targ)
+        assert_array_almost_equal(times,
+                                  cv.binarize(trains[0],
+                                              sampling_rate=10 * pq.Hz,
+                                              return_times=True)[1])
+
+    def test_binarize_raggedarray_window(self):
+        arr = RaggedArray([0.5, 3., 5., 1., 4.], [0, 3, 5])
+
+        res = cv.binarize(arr, sampling_rate=1., t_start=1., t_stop=4.)
+
+        targ = np.array([[False, False, True, False],
+                         [True, False, False, True]])
+        assert_array_almost_equal(res, targ)
+
 
 if __name__ == '__main__':
     unittest.main()
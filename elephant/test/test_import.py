@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the import behaviour of the elephant package.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+from __future__ import division, print_function
+
+import json
+import subprocess
+import sys
+import unittest
+
+# Print which of the slow modules importing a module loaded.  The import
+# time itself is measured by the benchmarks in `benchmarks.bench_import`.
+SCRIPT = '''
+import json, sys
+import %s
+print(json.dumps({"modules": sorted(name for name in %r
+                                    if name in sys.modules)}))
+'''
+
+SLOW_MODULES = ['scipy.stats', 'neo', 'pandas', 'elephant.statistics',
+                'elephant.conversion', 'elephant.neo_tools',
+                'elephant.pandas_bridge']
+
+
+def run_import(module):
+    """Import `module` in a new interpreter and return the result of
+    `SCRIPT`."""
+    output = subprocess.check_output([sys.executable, '-c',
+                                      SCRIPT % (module, SLOW_MODULES)])
+    return json.loads(output.decode('UTF8'))
+
+
+@unittest.skipUnless(sys.version_info >= (3, 7),
+                     'lazy imports require Python 3.7 or newer')
+class ImportTestCase(unittest.TestCase):
+    def test__import_elephant__lazy(self):
+        res = run_import('elephant')
+
+        self.assertEqual([], res['modules'])
+
+    def test__import_statistics__no_scipy_stats(self):
+        res = run_import('elephant.statistics')
+
+        self.assertNotIn('scipy.stats', res['modules'])
+
+    def test__submodule_attributes(self):
+        import elephant
+        import elephant.conversion
+        import elephant.neo_tools
+        import elephant.statistics
+
+        self.assertIs(elephant.statistics, elephant.__getattr__('statistics'))
+        self.assertIs(elephant.conversion, elephant.__getattr__('conversion'))
+        self.assertIs(elephant.neo_tools, elephant.__getattr__('neo_tools'))
+        self.assertIn('statistics', dir(elephant))
+
+    def test__missing_attribute(self):
+        import elephant
+
+        with self.assertRaises(AttributeError):
+            elephant.not_a_submodule
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,11 +8,14 @@ docstring goes here.
 
 from __future__ import division, print_function, unicode_literals
 
+from functools import partial
 from itertools import chain
+import pickle
 import unittest
 
 from neo.test.generate_datasets import fake_neo, get_fake_values
 from neo.test.tools import assert_same_sub_schema
+import numpy as np
 from numpy.testing.utils import assert_array_equal
 
 import elephant.neo_tools as nt
@@ -67,6 +70,41 @@ def strip_iter_values(targ, array_attrs=ARRAY_ATTRS):
     return targ
 
 
+class DataAccessError(Exception):
+    """Raised when the sample data of a protected neo object is accessed."""
+    pass
+
+
+def forbid_data_access(obj):
+    """Make any access to the sample data of a neo data object fail.
+
+    This emulates a lazily-loaded object, where reading the data would be
+    expensive, so tests can check that the data is never touched.
+
+    Parameters
+    ----------
+    obj : neo data object
+          The object to protect.  It is modified in-place.
+
+    Returns
+    -------
+    neo data object
+        `obj`, whose class is replaced by a subclass with the same name.
+        Iterating over it or reading `ndim` or any of its array attributes
+        raises a `DataAccessError`.
+
+    """
+    def fail(self, *args, **kwargs):
+        raise DataAccessError('data of %s was accessed' % type(self))
+
+    namespace = {'__iter__': fail, 'ndim': property(fail)}
+    for attr in obj._necessary_attrs + obj._recommended_attrs:
+        if len(attr) >= 3 and attr[2]:
+            namespace[attr[0]] = property(fail)
+    obj.__class__ = type(obj.__class__.__name__, (obj.__class__,), namespace)
+    return obj
+
+
 class GetAllObjsTestCase(unittest.TestCase):
     def test__get_all_objs__float_valueerror(self):
         value = 5.
@@ -83,6 +121,11 @@ class GetAllObjsTestCase(unittest.TestCase):
         with self.assertRaises(ValueError):
             nt._get_all_objs(value, 'Event')
 
+    def test__get_all_objs__spiketrain_for_event_lazy_valueerror(self):
+        value = [forbid_data_access(fake_neo('SpikeTrain', n=10, seed=0))]
+        with self.assertRaises(ValueError):
+            nt._get_all_objs(value, 'Event', lazy=True)
+
     def test__get_all_objs__empty_list(self):
         targ = []
         value = []
@@ -264,6 +307,17 @@ class GetAllObjsTestCase(unittest.TestCase):
 
         assert_same_sub_schema(targ, res)
 
+    def test__get_all_objs__block_spiketrain_lazy(self):
+        value = fake_neo('Block', n=3, seed=0)
+        targ = value.list_children_by_class('SpikeTrain')
+        for obj in chain(targ, value.list_children_by_class('Epoch'),
+                         value.list_children_by_class('Event')):
+            forbid_data_access(obj)
+
+        res = nt._get_all_objs([value, targ], 'SpikeTrain', lazy=True)
+
+        self.assertEqual([id(obj) for obj in targ], [id(obj) for obj in res])
+
 
 class ExtractNeoAttrsTestCase(unittest.TestCase):
     def setUp(self):
@@ -332,6 +386,30 @@ class ExtractNeoAttrsTestCase(unittest.TestCase):
         self.assertEqual(targ, res11)
         self.assertEqual(targ, res21)
 
+    def test__extract_neo_attrs__spiketrain_lazy(self):
+        obj = fake_neo('SpikeTrain', seed=0)
+        targ = get_fake_values('SpikeTrain', seed=0)
+        targ = strip_iter_values(targ)
+        forbid_data_access(obj)
+
+        res0 = nt.extract_neo_attrs(obj, parents=False, lazy=True)
+        res1 = nt.extract_neo_attrs(obj, parents=False, lazy=True,
+                                    skip_array=False)
+
+        self.assertEqual(targ, res0)
+        self.assertEqual(targ, res1)
+        with self.assertRaises(DataAccessError):
+            nt.extract_neo_attrs(obj, parents=False)
+
+    def test__extract_neo_attrs__spiketrain_parents_lazy(self):
+        obj = self.block.list_children_by_class('SpikeTrain')[0]
+        targ = nt.extract_neo_attrs(obj, parents=True, skip_array=True)
+        forbid_data_access(obj)
+
+        res = nt.extract_neo_attrs(obj, parents=True, lazy=True)
+
+        self.assert_dicts_equal(targ, res)
+
     def test__extract_neo_attrs__spiketrain_noarray_skip_none(self):
         obj = fake_neo('SpikeTrain', seed=0)
         targ = get_fake_values('SpikeTrain', seed=0)
@@ -1359,5 +1437,143 @@ class GetAllEpochsTestCase(unittest.TestCase):
         assert_same_sub_schema(targ, res0)
 
 
+def load_fake_block(path):
+    """Create a fake Block from a "path" containing the random seed."""
+    return fake_neo('Block', seed=int(path), n=2)
+
+
+class ParallelExtractNeoAttrsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        blocks = [fake_neo('Block', seed=i, n=2) for i in range(4)]
+        self.targ = [nt.extract_neo_attrs(obj, skip_array=True)
+                     for obj in nt.get_all_spiketrains(blocks)]
+
+    def test__parallel_extract_neo_attrs__blocks_serial(self):
+        value = [fake_neo('Block', seed=i, n=2) for i in range(4)]
+
+        res = nt.parallel_extract_neo_attrs(value, processes=1,
+                                            skip_array=True)
+
+        self.assertEqual(self.targ, res)
+
+    def test__parallel_extract_neo_attrs__callables(self):
+        value = [partial(fake_neo, 'Block', seed=i, n=2) for i in range(4)]
+
+        res0 = nt.parallel_extract_neo_attrs(value, processes=2,
+                                             skip_array=True)
+        res1 = nt.parallel_extract_neo_attrs(value, processes=2, chunksize=3,
+                                             skip_array=True)
+
+        self.assertEqual(self.targ, res0)
+        self.assertEqual(self.targ, res1)
+
+    def test__parallel_extract_neo_attrs__paths_epoch(self):
+        value = ['0', '1', '2', '3']
+        blocks = [fake_neo('Block', seed=i, n=2) for i in range(4)]
+        targ = [nt.extract_neo_attrs(obj, skip_array=True, parents=False)
+                for obj in nt.get_all_epochs(blocks)]
+
+        res = nt.parallel_extract_neo_attrs(value, classname='Epoch',
+                                            loader=load_fake_block,
+                                            processes=2, parents=False,
+                                            skip_array=True)
+
+        self.assertEqual(targ, res)
+
+    def test__parallel_extract_neo_attrs__path_no_loader_typeerror(self):
+        with self.assertRaises(TypeError):
+            nt.parallel_extract_neo_attrs(['0'], processes=1)
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.block = fake_neo('Block', seed=0, n=3)
+
+    def test__neo_to_snapshot__spiketrain(self):
+        targ = self.block.list_children_by_class('SpikeTrain')
+
+        res = nt.neo_to_snapshot(self.block, classnames=['SpikeTrain'])
+        trains = res['SpikeTrain']
+
+        self.assertEqual(['Segment', 'SpikeTrain', 'Unit'], sorted(res))
+        self.assertEqual(len(self.block.segments), len(res['Segment']))
+        self.assertEqual(len(targ) + 1, len(trains['offsets']))
+        self.assertEqual(len(targ), len(trains['units']))
+        self.assertEqual(len(targ), len(trains['attrs']))
+        self.assertEqual(0, trains['offsets'][0])
+        self.assertEqual(len(trains['times']), trains['offsets'][-1])
+
+        for i, train in enumerate(targ):
+            start, stop = trains['offsets'][i:i+2]
+            assert_array_equal(train.magnitude, trains['times'][start:stop])
+            self.assertEqual(str(train.dimensionality), trains['units'][i])
+            self.assertEqual(nt.extract_neo_attrs(train, parents=False,
+                                                  skip_array=True),
+                             trains['attrs'][i])
+            self.assertEqual(train.segment.name,
+                             res['Segment'][trains['segment'][i]]['name'])
+            self.assertEqual(train.unit.name,
+                             res['Unit'][trains['unit'][i]]['name'])
+
+    def test__neo_to_snapshot__empty(self):
+        res = nt.neo_to_snapshot([], classnames=['SpikeTrain'])
+        trains = res['SpikeTrain']
+
+        self.assertEqual([], res['Segment'])
+        self.assertEqual([], res['Unit'])
+        self.assertEqual([], trains['attrs'])
+        assert_array_equal(np.array([0]), trains['offsets'])
+        self.assertEqual(0, len(trains['times']))
+
+    def test__snapshot_to_neo__spiketrain(self):
+        targ = self.block.list_children_by_class('SpikeTrain')
+        snapshot = nt.neo_to_snapshot(self.block, classnames=['SpikeTrain'])
+        snapshot = pickle.loads(pickle.dumps(snapshot))
+
+        res = nt.snapshot_to_neo(snapshot)
+
+        self.assertEqual(['Segment', 'SpikeTrain', 'Unit'], sorted(res))
+        self.assertEqual(len(targ), len(res['SpikeTrain']))
+        for train, rtrain in zip(targ, res['SpikeTrain']):
+            assert_array_equal(train.magnitude, rtrain.magnitude)
+            self.assertEqual(train.units, rtrain.units)
+            self.assertEqual(train.t_stop, rtrain.t_stop)
+            self.assertEqual(train.name, rtrain.name)
+            self.assertEqual(train.annotations, rtrain.annotations)
+            self.assertEqual(train.segment.name, rtrain.segment.name)
+            self.assertEqual(train.unit.name, rtrain.unit.name)
+            self.assertTrue(np.may_share_memory(
+                rtrain, snapshot['SpikeTrain']['times']))
+        for segment in res['Segment']:
+            for rtrain in segment.spiketrains:
+                self.assertIs(segment, rtrain.segment)
+
+    def test__snapshot_to_neo__event_epoch(self):
+        targ_ev = self.block.list_children_by_class('Event')
+        targ_ep = self.block.list_children_by_class('Epoch')
+        snapshot = nt.neo_to_snapshot(self.block,
+                                      classnames=['Event', 'Epoch'])
+
+        res = nt.snapshot_to_neo(snapshot)
+
+        self.assertEqual(len(targ_ev), len(res['Event']))
+        self.assertEqual(len(targ_ep), len(res['Epoch']))
+        for event, revent in zip(targ_ev, res['Event']):
+            minlen = len(revent.times)
+            assert_array_equal(event.times[:minlen], revent.times)
+            assert_array_equal(event.labels[:minlen].astype('U'),
+                               revent.labels)
+            self.assertEqual(event.segment.name, revent.segment.name)
+        for epoch, repoch in zip(targ_ep, res['Epoch']):
+            minlen = len(repoch.times)
+            assert_array_equal(epoch.times[:minlen], repoch.times)
+            assert_array_equal(epoch.durations[:minlen], repoch.durations)
+            assert_array_equal(epoch.labels[:minlen].astype('U'),
+                               repoch.labels)
+            self.assertEqual(epoch.segment.name, repoch.segment.name)
+
+
 if __name__ == '__main__':
     unittest.main()
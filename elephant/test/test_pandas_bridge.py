@@ -8,14 +8,21 @@ docstring goes here.
 
 from __future__ import division, print_function
 
+import os
+import shutil
+import tempfile
 import unittest
 from itertools import chain
 
+from neo.core import Block, Epoch, Event, Segment, SpikeTrain
 from neo.test.generate_datasets import fake_neo
 import numpy as np
-from numpy.testing.utils import assert_array_equal
+from numpy.testing.utils import (assert_array_almost_equal,
+                                 assert_array_equal)
 import quantities as pq
 
+import elephant.statistics as es
+
 try:
     import pandas as pd
     from pandas.util.testing import assert_frame_equal, assert_index_equal
@@ -25,6 +32,8 @@ else:
     import elephant.pandas_bridge as ep
     HAVE_PANDAS = True
 
+HAVE_ARROW = HAVE_PANDAS and ep.HAVE_ARROW
+
 
 @unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
 class MultiindexFromDictTestCase(unittest.TestCase):
@@ -40,6 +49,40 @@ class MultiindexFromDictTestCase(unittest.TestCase):
         self.assertEqual(targ.names, res0.names)
         self.assertEqual(targ.labels, res0.labels)
 
+    def test__multiindex_from_dict__empty(self):
+        res0 = ep._multiindex_from_dict({})
+
+        self.assertEqual(1, res0.nlevels)
+        self.assertEqual([(0,)], res0.tolist())
+
+
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class MultiindexFromDictsTestCase(unittest.TestCase):
+    def test__multiindex_from_dicts(self):
+        inds = [{'test1': 6.5, 'test2': 5, 'test3': (1., 'ms')},
+                {'test3': (2., 'ms'), 'test1': 7.5, 'test2': 5}]
+        targ = pd.MultiIndex.from_tuples([(6.5, 5, (1., 'ms')),
+                                          (7.5, 5, (2., 'ms'))],
+                                         names=['test1', 'test2', 'test3'])
+
+        res0 = ep._multiindex_from_dicts(inds)
+
+        assert_index_equal(targ, res0)
+        self.assertEqual(targ.names, res0.names)
+
+    def test__multiindex_from_dicts__empty(self):
+        res0 = ep._multiindex_from_dicts([{}, {}, {}])
+
+        self.assertEqual(1, res0.nlevels)
+        self.assertEqual([(0,), (1,), (2,)], res0.tolist())
+
+    def test__group_by_keys(self):
+        inds = [{'a': 1}, {'a': 2, 'b': 3}, {'a': 4}, {'b': 5, 'a': 6}]
+
+        res0 = ep._group_by_keys(inds)
+
+        self.assertEqual([[0, 2], [1, 3]], res0)
+
 
 def _convert_levels(levels):
     """Convert a list of levels to the format pandas returns for a MultiIndex.
@@ -973,6 +1016,78 @@ class EpochToDataframeTestCase(unittest.TestCase):
             assert_index_equal(value, level)
 
 
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class CategoricalLabelsTestCase(unittest.TestCase):
+    def test__event_to_dataframe__categorical(self):
+        obj = fake_neo('Event', seed=0, n=5)
+
+        res0 = ep.event_to_dataframe(obj, categorical=False)
+        res1 = ep.event_to_dataframe(obj, categorical=True)
+        res2 = ep.event_to_dataframe(obj, categorical=['a', 'b'])
+
+        self.assertEqual('category', res1.iloc[:, 0].dtype.name)
+        self.assertEqual('category', res2.iloc[:, 0].dtype.name)
+        self.assertEqual(['a', 'b'], res2.iloc[:, 0].cat.categories.tolist())
+
+        assert_index_equal(res0.index, res1.index)
+        assert_index_equal(res0.columns, res1.columns)
+        assert_array_equal(res0.values, res1.values)
+
+    def test__epoch_to_dataframe__categorical(self):
+        obj = fake_neo('Epoch', seed=0, n=5)
+
+        res0 = ep.epoch_to_dataframe(obj, categorical=False)
+        res1 = ep.epoch_to_dataframe(obj, categorical=True)
+
+        self.assertEqual('category', res1.iloc[:, 0].dtype.name)
+
+        assert_index_equal(res0.index, res1.index)
+        assert_index_equal(res0.columns, res1.columns)
+        assert_array_equal(res0.values, res1.values)
+
+    def test__multi_events_to_dataframe__categorical(self):
+        obj = fake_neo('Block', seed=0, n=3)
+        objs = obj.list_children_by_class('Event')
+
+        res0 = ep.multi_events_to_dataframe(obj, categorical=False)
+        res1 = ep.multi_events_to_dataframe(obj)
+
+        targ = [ep.event_to_dataframe(iobj) for iobj in objs]
+        targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
+        categories = ep._label_categories(objs)
+
+        assert_frame_equal(targ, res0)
+
+        assert_index_equal(targ.index, res1.index)
+        assert_index_equal(targ.columns, res1.columns)
+        for i in range(len(res1.columns)):
+            self.assertEqual('category', res1.iloc[:, i].dtype.name)
+            assert_index_equal(categories, res1.iloc[:, i].cat.categories)
+            self.assertEqual(targ.iloc[:, i].dropna().tolist(),
+                             res1.iloc[:, i].dropna().tolist())
+
+    def test__multi_epochs_to_dataframe__categorical(self):
+        obj = fake_neo('Block', seed=0, n=3)
+        objs = obj.list_children_by_class('Epoch')
+
+        res0 = ep.multi_epochs_to_dataframe(obj, categorical=False)
+        res1 = ep.multi_epochs_to_dataframe(obj)
+
+        targ = [ep.epoch_to_dataframe(iobj) for iobj in objs]
+        targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
+        categories = ep._label_categories(objs)
+
+        assert_frame_equal(targ, res0)
+
+        assert_index_equal(targ.index, res1.index)
+        assert_index_equal(targ.columns, res1.columns)
+        for i in range(len(res1.columns)):
+            self.assertEqual('category', res1.iloc[:, i].dtype.name)
+            assert_index_equal(categories, res1.iloc[:, i].cat.categories)
+            self.assertEqual(targ.iloc[:, i].dropna().tolist(),
+                             res1.iloc[:, i].dropna().tolist())
+
+
 @unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
 class MultiSpiketrainsToDataframeTestCase(unittest.TestCase):
     def setUp(self):
@@ -1507,6 +1622,59 @@ class MultiSpiketrainsToDataframeTestCase(unittest.TestCase):
 
         assert_frame_equal(targ, res0)
 
+    def test__multi_spiketrains_to_dataframe__data_func(self):
+        obj = [fake_neo('Block', seed=i, n=3) for i in range(3)]
+        objs = ep.get_all_spiketrains(obj)
+
+        res0 = ep._sort_inds(pd.concat([ep.spiketrain_to_dataframe(iobj)
+                                        for iobj in objs], axis=1), axis=1)
+        res1 = ep._multi_objs_to_dataframe(obj, ep._spiketrains_data,
+                                           ep.get_all_spiketrains)
+        res2 = ep.multi_spiketrains_to_dataframe(obj)
+
+        assert_frame_equal(res0, res1)
+        assert_frame_equal(res0, res2)
+
+    def test__multi_spiketrains_to_dataframe__block_tidy(self):
+        obj = fake_neo('Block', seed=0, n=3)
+
+        spikes, trains = ep.multi_spiketrains_to_dataframe(obj, tidy=True)
+
+        objs = obj.list_children_by_class('SpikeTrain')
+
+        targlen = sum(len(iobj) for iobj in objs)
+        keys = set()
+        for iobj in objs:
+            keys.update(ep._extract_neo_attrs_safe(iobj).keys())
+
+        self.assertGreater(len(objs), 0)
+
+        self.assertEqual(['times'], spikes.columns.tolist())
+        self.assertEqual(['train', 'spike_number'], spikes.index.names)
+        self.assertEqual(targlen, len(spikes.index))
+
+        self.assertEqual('train', trains.index.name)
+        self.assertEqual(len(objs), len(trains.index))
+        self.assertEqual(sorted(keys), trains.columns.tolist())
+
+        for i, iobj in enumerate(objs):
+            targvalues = pq.Quantity(iobj.magnitude, units=iobj.units)
+            targvalues = targvalues.rescale('s').magnitude
+            targattrs = ep._extract_neo_attrs_safe(iobj)
+
+            assert_array_equal(targvalues, spikes.loc[i, 'times'].values)
+            assert_array_equal(np.arange(len(iobj)),
+                               spikes.loc[i].index.values)
+            self.assertEqual(targattrs,
+                             trains.loc[i, sorted(targattrs)].to_dict())
+
+    def test__multi_spiketrains_to_dataframe__empty_tidy(self):
+        spikes, trains = ep.multi_spiketrains_to_dataframe([], tidy=True)
+
+        self.assertEqual(['times'], spikes.columns.tolist())
+        self.assertEqual(0, len(spikes.index))
+        self.assertEqual(0, len(trains.index))
+
 
 @unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
 class MultiEventsToDataframeTestCase(unittest.TestCase):
@@ -1531,7 +1699,8 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
         res8 = ep.multi_events_to_dataframe(obj, parents=True,
                                             child_first=False)
 
-        targ = ep.event_to_dataframe(obj)
+        targ = ep.event_to_dataframe(
+            obj, categorical=ep._label_categories([obj]))
 
         keys = ep._extract_neo_attrs_safe(obj, parents=True,
                                           child_first=True).keys()
@@ -1600,7 +1769,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.events
 
-        targ = [ep.event_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
@@ -1638,7 +1809,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.list_children_by_class('Event')
 
-        targ = [ep.event_to_dataframe(iobj, parents=False, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, parents=False, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -1687,7 +1860,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.list_children_by_class('Event')
 
-        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -1739,7 +1914,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.list_children_by_class('Event')
 
-        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=False)
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=False,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -1784,7 +1961,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Event') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.event_to_dataframe(iobj, parents=False, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, parents=False, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -1834,7 +2013,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Event') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -1887,7 +2068,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Event') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=False)
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, parents=True, child_first=False,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -1928,7 +2111,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Event') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.event_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
@@ -1962,7 +2147,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
 
         objs = (iobj.list_children_by_class('Event') for iobj in obj)
         objs = list(chain.from_iterable(objs))
-        targ = [ep.event_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
@@ -1997,7 +2184,9 @@ class MultiEventsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Event') for iobj in
                 obj.values())
         objs = list(chain.from_iterable(objs))
-        targ = [ep.event_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.event_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
@@ -2048,7 +2237,8 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
         res8 = ep.multi_epochs_to_dataframe(obj, parents=True,
                                             child_first=False)
 
-        targ = ep.epoch_to_dataframe(obj)
+        targ = ep.epoch_to_dataframe(
+            obj, categorical=ep._label_categories([obj]))
 
         keys = ep._extract_neo_attrs_safe(obj, parents=True,
                                           child_first=True).keys()
@@ -2117,7 +2307,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.epochs
 
-        targ = [ep.epoch_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
                                           child_first=True).keys()
@@ -2154,7 +2346,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.list_children_by_class('Epoch')
 
-        targ = [ep.epoch_to_dataframe(iobj, parents=False, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, parents=False, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -2203,7 +2397,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.list_children_by_class('Epoch')
 
-        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -2255,7 +2451,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
 
         objs = obj.list_children_by_class('Epoch')
 
-        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=False)
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=False,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -2300,7 +2498,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Epoch') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.epoch_to_dataframe(iobj, parents=False, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, parents=False, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -2350,7 +2550,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Epoch') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=True)
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=True,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -2403,7 +2605,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Epoch') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=False)
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, parents=True, child_first=False,
+                                      categorical=categories)
                 for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
@@ -2444,7 +2648,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Epoch') for iobj in obj)
         objs = list(chain.from_iterable(objs))
 
-        targ = [ep.epoch_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
@@ -2478,7 +2684,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
 
         objs = (iobj.list_children_by_class('Epoch') for iobj in obj)
         objs = list(chain.from_iterable(objs))
-        targ = [ep.epoch_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
@@ -2513,7 +2721,9 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
         objs = (iobj.list_children_by_class('Epoch') for iobj in
                 obj.values())
         objs = list(chain.from_iterable(objs))
-        targ = [ep.epoch_to_dataframe(iobj) for iobj in objs]
+        categories = ep._label_categories(objs)
+        targ = [ep.epoch_to_dataframe(iobj, categorical=categories)
+                for iobj in objs]
         targ = ep._sort_inds(pd.concat(targ, axis=1), axis=1)
 
         keys = ep._extract_neo_attrs_safe(objs[0], parents=True,
@@ -2541,6 +2751,73 @@ class MultiEpochsToDataframeTestCase(unittest.TestCase):
         assert_frame_equal(targ, res0)
 
 
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class IterMultiObjsToDataframeTestCase(unittest.TestCase):
+    def test__iter_multi_spiketrains_to_dataframe__segment(self):
+        obj = fake_neo('Block', seed=0, n=3)
+
+        res = list(ep.iter_multi_spiketrains_to_dataframe(obj))
+        targ = [ep.multi_spiketrains_to_dataframe(seg)
+                for seg in obj.segments]
+
+        self.assertEqual(len(targ), len(res))
+        for itarg, ires in zip(targ, res):
+            assert_frame_equal(itarg, ires)
+
+    def test__iter_multi_spiketrains_to_dataframe__chunksize(self):
+        obj = fake_neo('Block', seed=0, n=3)
+        objs = ep.get_all_spiketrains(obj)
+
+        res = list(ep.iter_multi_spiketrains_to_dataframe(obj, chunksize=2))
+        targ = [ep.multi_spiketrains_to_dataframe(objs[i:i+2])
+                for i in range(0, len(objs), 2)]
+
+        self.assertEqual((len(objs) + 1) // 2, len(res))
+        self.assertEqual(len(objs), sum(len(ires.columns) for ires in res))
+        for itarg, ires in zip(targ, res):
+            assert_frame_equal(itarg, ires)
+
+    def test__iter_multi_spiketrains_to_dataframe__no_segment(self):
+        objs = [fake_neo('SpikeTrain', seed=i, n=5) for i in range(3)]
+        for obj in objs:
+            obj.segment = None
+
+        res = list(ep.iter_multi_spiketrains_to_dataframe(objs))
+        targ = ep.multi_spiketrains_to_dataframe(objs)
+
+        self.assertEqual(1, len(res))
+        assert_frame_equal(targ, res[0])
+
+    def test__iter_multi_events_to_dataframe(self):
+        obj = fake_neo('Block', seed=0, n=3)
+        categories = ep._label_categories(ep.get_all_events(obj))
+
+        res0 = list(ep.iter_multi_events_to_dataframe(obj))
+        res1 = list(ep.iter_multi_events_to_dataframe(obj, chunksize=2,
+                                                      categorical=False))
+        targ0 = [ep.multi_events_to_dataframe(seg, categorical=categories)
+                 for seg in obj.segments]
+
+        self.assertEqual(len(targ0), len(res0))
+        for itarg, ires in zip(targ0, res0):
+            assert_frame_equal(itarg, ires)
+        for ires in res1:
+            for i in range(len(ires.columns)):
+                self.assertNotEqual('category', ires.iloc[:, i].dtype.name)
+
+    def test__iter_multi_epochs_to_dataframe(self):
+        obj = fake_neo('Block', seed=0, n=3)
+        categories = ep._label_categories(ep.get_all_epochs(obj))
+
+        res = list(ep.iter_multi_epochs_to_dataframe(obj))
+        targ = [ep.multi_epochs_to_dataframe(seg, categorical=categories)
+                for seg in obj.segments]
+
+        self.assertEqual(len(targ), len(res))
+        for itarg, ires in zip(targ, res):
+            assert_frame_equal(itarg, ires)
+
+
 @unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
 class SliceSpiketrainTestCase(unittest.TestCase):
     def setUp(self):
@@ -2666,6 +2943,531 @@ class SliceSpiketrainTestCase(unittest.TestCase):
 
         self.assertEqual([targ_stop], res0_stop)
 
+    def test_single_both_unchanged(self):
+        targ = self.obj.copy()
+
+        ep.slice_spiketrain(self.obj, t_stop=.0009, t_start=.0001)
+
+        assert_frame_equal(targ, self.obj)
+
+    def test_single_both_inplace(self):
+        targ_start = .0001
+        targ_stop = .0009
+
+        targ = ep.slice_spiketrain(self.obj,
+                                   t_stop=targ_stop, t_start=targ_start)
+        res0 = self.obj.copy()
+        res1 = ep.slice_spiketrain(res0, t_stop=targ_stop, t_start=targ_start,
+                                   inplace=True)
+
+        self.assertIsNone(res1)
+        assert_frame_equal(targ, res0)
+
+
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class DataframeToObjsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.obj = [fake_neo('Block', seed=i, n=3) for i in range(2)]
+
+    def test__dataframe_to_spiketrains(self):
+        targ = ep.multi_spiketrains_to_dataframe(self.obj, parents=False)
+
+        res = ep.dataframe_to_spiketrains(targ)
+
+        self.assertEqual(len(targ.columns), len(res))
+        for i, train in enumerate(res):
+            t_start = targ.columns.get_level_values('t_start')[i]
+            self.assertEqual(t_start[1], str(train.units.dimensionality))
+            assert_array_almost_equal(targ.iloc[:, i].dropna().values,
+                                      train.rescale('s').magnitude)
+        assert_frame_equal(targ, ep.multi_spiketrains_to_dataframe(
+            res, parents=False))
+
+    def test__dataframe_to_spiketrains__units(self):
+        targ = ep.multi_spiketrains_to_dataframe(self.obj, parents=False)
+
+        res = ep.dataframe_to_spiketrains(targ, units='s')
+
+        for i, train in enumerate(res):
+            self.assertEqual(pq.s, train.units)
+            assert_array_equal(targ.iloc[:, i].dropna().values,
+                               train.magnitude)
+
+    def test__dataframe_to_spiketrains__sliced(self):
+        obj = [fake_neo('SpikeTrain', seed=i, n=3) for i in range(10)]
+        targ = ep.slice_spiketrain(ep.multi_spiketrains_to_dataframe(obj),
+                                   t_start=.0001, t_stop=.0009)
+
+        res = ep.dataframe_to_spiketrains(targ)
+
+        for i, train in enumerate(res):
+            self.assertAlmostEqual(.0001,
+                                   train.t_start.rescale('s').magnitude)
+            self.assertAlmostEqual(.0009,
+                                   train.t_stop.rescale('s').magnitude)
+            assert_array_almost_equal(targ.iloc[:, i].dropna().values,
+                                      train.rescale('s').magnitude)
+
+    def test__dataframe_to_events(self):
+        targ0 = ep.multi_events_to_dataframe(self.obj, parents=False)
+        targ1 = ep.multi_events_to_dataframe(self.obj, parents=False,
+                                             categorical=False)
+
+        res0 = ep.dataframe_to_events(targ0)
+        res1 = ep.dataframe_to_events(targ1)
+
+        self.assertEqual(len(targ0.columns), len(res0))
+        for i, (event0, event1) in enumerate(zip(res0, res1)):
+            column = targ1.iloc[:, i].dropna()
+            assert_array_equal(column.index.values, event0.times.magnitude)
+            assert_array_equal(column.values.astype('U'), event0.labels)
+            assert_array_equal(event0.times, event1.times)
+            assert_array_equal(event0.labels, event1.labels)
+        assert_frame_equal(targ0, ep.multi_events_to_dataframe(
+            res0, parents=False))
+
+    def test__dataframe_to_epochs(self):
+        targ = ep.multi_epochs_to_dataframe(self.obj, parents=False)
+
+        res = ep.dataframe_to_epochs(targ, units='ms')
+
+        self.assertEqual(len(targ.columns), len(res))
+        for i, epoch in enumerate(res):
+            column = targ.iloc[:, i].dropna()
+            self.assertEqual(pq.ms, epoch.units)
+            assert_array_almost_equal(
+                column.index.get_level_values('times').values,
+                epoch.times.rescale('s').magnitude)
+            assert_array_almost_equal(
+                column.index.get_level_values('durations').values,
+                epoch.durations.rescale('s').magnitude)
+            assert_array_equal(column.values.astype('U'), epoch.labels)
+
+
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class TimeUnitsDtypeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.obj = [fake_neo('Block', seed=i, n=3) for i in range(2)]
+
+    def test__spiketrain_to_dataframe__time_units_dtype(self):
+        obj = fake_neo('SpikeTrain', seed=0, n=5)
+
+        res0 = ep.spiketrain_to_dataframe(obj, time_units='ms',
+                                          dtype='float32')
+        res1 = ep.spiketrain_to_dataframe(obj, time_units=obj.units)
+
+        targ0 = obj.rescale('ms').magnitude.astype('float32')
+        targ1 = obj.magnitude
+
+        self.assertEqual(np.dtype('float32'), res0.values.dtype)
+        assert_array_equal(targ0, res0.values[:, 0])
+        assert_array_equal(targ1, res1.values[:, 0])
+        self.assertFalse(np.may_share_memory(obj.magnitude, res1.values))
+
+    def test__multi_spiketrains_to_dataframe__time_units_dtype(self):
+        targ = ep.multi_spiketrains_to_dataframe(self.obj)
+
+        res0 = ep.multi_spiketrains_to_dataframe(self.obj, time_units='ms',
+                                                 dtype='float32')
+        res1, _ = ep.multi_spiketrains_to_dataframe(self.obj, tidy=True,
+                                                    dtype='float32')
+
+        self.assertTrue((res0.dtypes == np.dtype('float32')).all())
+        self.assertEqual(np.dtype('float32'), res1['times'].dtype)
+        assert_array_almost_equal(targ.values * 1000, res0.values,
+                                  decimal=3)
+        assert_index_equal(targ.columns, res0.columns)
+
+    def test__multi_events_epochs_to_dataframe__time_units_dtype(self):
+        targ0 = ep.multi_events_to_dataframe(self.obj)
+        targ1 = ep.multi_epochs_to_dataframe(self.obj)
+
+        res0 = ep.multi_events_to_dataframe(self.obj, time_units='ms',
+                                            dtype='float32')
+        res1 = ep.multi_epochs_to_dataframe(self.obj, time_units='ms',
+                                            dtype='float32')
+
+        assert_array_almost_equal(targ0.index.values * 1000,
+                                  res0.index.values, decimal=3)
+        for name in ['times', 'durations']:
+            level = res1.index.get_level_values(name).values
+            assert_array_almost_equal(
+                targ1.index.get_level_values(name).values * 1000, level,
+                decimal=3)
+
+    def test__dataframe_to_spiketrains__time_units(self):
+        targ = ep.multi_spiketrains_to_dataframe(self.obj, parents=False)
+        res0 = ep.multi_spiketrains_to_dataframe(self.obj, parents=False,
+                                                 time_units='ms')
+
+        res1 = ep.dataframe_to_spiketrains(res0, time_units='ms')
+
+        assert_frame_equal(targ, ep.multi_spiketrains_to_dataframe(
+            res1, parents=False))
+
+
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class AssignSpikesToEpochsTestCase(unittest.TestCase):
+    def setUp(self):
+        trains = [SpikeTrain([0.5, 1.5, 2.5, 3.5] * pq.s, t_stop=10 * pq.s,
+                             name='a'),
+                  SpikeTrain([1., 2.] * pq.s, t_stop=10 * pq.s, name='b')]
+        epochs = [Epoch(times=[1., 2.] * pq.s, durations=[1., 1.] * pq.s,
+                        labels=np.array(['x', 'y']), name='c'),
+                  Epoch(times=[3.] * pq.s, durations=[2.] * pq.s,
+                        labels=np.array(['z']), name='d')]
+        self.spiketrains = ep.multi_spiketrains_to_dataframe(trains)
+        self.epochs = ep.multi_epochs_to_dataframe(epochs)
+
+    def test__assign_spikes_to_epochs__left(self):
+        res = ep.assign_spikes_to_epochs(self.spiketrains, self.epochs)
+
+        self.assertEqual(['train', 'spike_number'], res.index.names)
+        self.assertEqual([(0, 0), (0, 1), (0, 2), (0, 3), (1, 0), (1, 1)],
+                         res.index.tolist())
+        assert_array_equal([.5, 1.5, 2.5, 3.5, 1., 2.], res['times'].values)
+        assert_array_equal([-1, 0, 0, 1, 0, 0], res['epoch'].values)
+        assert_array_equal([np.nan, 1., 2., 3., 1., 2.],
+                           res['epoch_times'].values)
+        assert_array_equal([np.nan, 1., 1., 2., 1., 1.],
+                           res['epoch_durations'].values)
+        self.assertEqual('category', res['labels'].dtype.name)
+        self.assertTrue(pd.isnull(res['labels'].iloc[0]))
+        self.assertEqual(['x', 'y', 'z', 'x', 'y'],
+                         res['labels'].iloc[1:].tolist())
+
+    def test__assign_spikes_to_epochs__inner(self):
+        res = ep.assign_spikes_to_epochs(self.spiketrains, self.epochs,
+                                         how='inner')
+
+        self.assertEqual([(0, 1), (0, 2), (0, 3), (1, 0), (1, 1)],
+                         res.index.tolist())
+        self.assertTrue((res['epoch'].values >= 0).all())
+
+    def test__assign_spikes_to_epochs__overlap(self):
+        epochs = ep.multi_epochs_to_dataframe(
+            Epoch(times=[1., 2.] * pq.s, durations=[3., 1.] * pq.s,
+                  labels=np.array(['x', 'y'])), categorical=False)
+
+        res = ep.assign_spikes_to_epochs(self.spiketrains, epochs)
+
+        self.assertEqual([(0, 0), (0, 1), (0, 2), (0, 2), (0, 3), (1, 0),
+                          (1, 1), (1, 1)], res.index.tolist())
+        self.assertEqual([np.nan, 'x', 'x', 'y', 'x', 'x', 'x', 'y'][1:],
+                         res['labels'].tolist()[1:])
+        self.assertTrue(pd.isnull(res['labels'].iloc[0]))
+
+    def test__assign_spikes_to_epochs__fake(self):
+        obj = fake_neo('Block', seed=0, n=3)
+        spiketrains = ep.multi_spiketrains_to_dataframe(obj)
+        epochs = ep.multi_epochs_to_dataframe(obj)
+
+        res = ep.assign_spikes_to_epochs(spiketrains, epochs, how='inner')
+
+        targ = []
+        for i in range(len(spiketrains.columns)):
+            for time in spiketrains.iloc[:, i].dropna().values:
+                for j in range(len(epochs.columns)):
+                    column = epochs.iloc[:, j].dropna()
+                    starts = column.index.get_level_values('times').values
+                    stops = starts + column.index.get_level_values(
+                        'durations').values
+                    targ.extend([(i, time, j)] * int(
+                        ((starts <= time) & (time < stops)).sum()))
+        res = list(zip(res.index.get_level_values('train'),
+                       res['times'], res['epoch']))
+
+        self.assertCountEqual(targ, res)
+
+    def test__assign_spikes_to_epochs__how_valueerror(self):
+        with self.assertRaises(ValueError):
+            ep.assign_spikes_to_epochs(self.spiketrains, self.epochs,
+                                       how='outer')
+
+
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class AlignSpiketrainsToEventsTestCase(unittest.TestCase):
+    def setUp(self):
+        trains = [SpikeTrain([0.5, 1.5, 2.5, 3.5, 5., 6.5] * pq.s,
+                             t_stop=10 * pq.s, name='a'),
+                  SpikeTrain([1., 4.2] * pq.s, t_stop=10 * pq.s, name='b')]
+        events = Event(times=[5., 2.] * pq.s,
+                       labels=np.array(['stop', 'go']), name='c')
+        self.spiketrains = ep.multi_spiketrains_to_dataframe(trains)
+        self.events = ep.multi_events_to_dataframe(events)
+
+    def test__align_spiketrains_to_events(self):
+        res = ep.align_spiketrains_to_events(self.spiketrains, self.events,
+                                             t_pre=1., t_post=1.)
+
+        targ = np.array([[-.5, 0., -1., -.8],
+                         [.5, np.nan, np.nan, np.nan]])
+
+        self.assertEqual(list(self.spiketrains.columns.names) +
+                         ['event_label', 'trial'], res.columns.names)
+        self.assertEqual(['a', 'a', 'b', 'b'],
+                         res.columns.get_level_values('name').tolist())
+        self.assertEqual(['go', 'stop', 'go', 'stop'],
+                         res.columns.get_level_values('event_label').tolist())
+        self.assertEqual([0, 1, 0, 1],
+                         res.columns.get_level_values('trial').tolist())
+        self.assertEqual([-1.], res.columns.get_level_values(
+            't_start').unique().tolist())
+        self.assertEqual([1.], res.columns.get_level_values(
+            't_stop').unique().tolist())
+        self.assertEqual('spike_number', res.index.name)
+        assert_array_almost_equal(targ, res.values)
+
+    def test__align_spiketrains_to_events__event_labels(self):
+        res = ep.align_spiketrains_to_events(self.spiketrains, self.events,
+                                             t_pre=1., t_post=2.,
+                                             event_labels=['stop'])
+
+        targ = np.array([[0., -.8], [1.5, np.nan]])
+
+        self.assertEqual(['stop', 'stop'],
+                         res.columns.get_level_values('event_label').tolist())
+        self.assertEqual([0, 0],
+                         res.columns.get_level_values('trial').tolist())
+        assert_array_almost_equal(targ, res.values)
+
+    def test__align_spiketrains_to_events__fake(self):
+        obj = fake_neo('Block', seed=0, n=3)
+        spiketrains = ep.multi_spiketrains_to_dataframe(obj)
+        events = ep.multi_events_to_dataframe(obj, categorical=False)
+        evtimes = np.sort(events.index.values[
+            np.nonzero(events.notnull().values)[0]])
+
+        res = ep.align_spiketrains_to_events(spiketrains, events,
+                                             t_pre=.001, t_post=.002)
+
+        self.assertEqual(len(spiketrains.columns) * len(evtimes),
+                         len(res.columns))
+        for i in range(len(res.columns)):
+            train = spiketrains.iloc[:, i // len(evtimes)].dropna().values
+            evtime = evtimes[i % len(evtimes)]
+            targ = np.sort(train[(train >= evtime - .001) &
+                                 (train <= evtime + .002)]) - evtime
+            assert_array_equal(targ, res.iloc[:, i].dropna().values)
+
+    def test__align_spiketrains_to_events__segments(self):
+        # the events of every segment are applied to the trains of every
+        # segment, so each segment has to be aligned on its own
+        blk = Block()
+        for i in range(2):
+            seg = Segment(name='seg%s' % i)
+            seg.spiketrains.append(SpikeTrain([i + .5, i + 1.5] * pq.s,
+                                              t_stop=10 * pq.s))
+            seg.events.append(Event(times=[i + 1.] * pq.s,
+                                    labels=np.array(['go'])))
+            blk.segments.append(seg)
+        spiketrains = ep.multi_spiketrains_to_dataframe(blk)
+        events = ep.multi_events_to_dataframe(blk)
+
+        res0 = ep.align_spiketrains_to_events(spiketrains, events,
+                                              t_pre=1., t_post=1.)
+        res1 = [ep.align_spiketrains_to_events(
+            ep.multi_spiketrains_to_dataframe(seg),
+            ep.multi_events_to_dataframe(seg), t_pre=1., t_post=1.)
+            for seg in blk.segments]
+
+        self.assertEqual(4, len(res0.columns))
+        assert_array_almost_equal([[-.5, -.5, .5, -.5],
+                                   [.5, np.nan, np.nan, .5]], res0.values)
+        for res in res1:
+            self.assertEqual(1, len(res.columns))
+            assert_array_almost_equal([[-.5], [.5]], res.values)
+
+    def test__window_bounds(self):
+        np.random.seed(0)
+        trains = [np.sort(np.random.randint(0, 20, size)).astype('float64')
+                  for size in [0, 10, 30, 5]]
+        times = np.concatenate(trains)
+        trainind = np.repeat(np.arange(4), [len(train) for train in trains])
+        offsets = np.cumsum([0] + [len(train) for train in trains])
+        starts = np.array([0., 5., 5., 19., 25.])
+        stops = starts + 3.
+
+        lower, upper = ep._window_bounds(times, trainind, 4, starts, stops)
+
+        targ_lower = np.concatenate([
+            np.searchsorted(train, starts, side='left') + offset
+            for train, offset in zip(trains, offsets)])
+        targ_upper = np.concatenate([
+            np.searchsorted(train, stops, side='right') + offset
+            for train, offset in zip(trains, offsets)])
+        assert_array_equal(targ_lower, lower)
+        assert_array_equal(targ_upper, upper)
+
+
+@unittest.skipUnless(HAVE_PANDAS, 'requires pandas')
+class GroupedStatisticsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.trains = [SpikeTrain([0.5, 1.5, 2.5, 4.] * pq.s,
+                                  t_stop=5 * pq.s, name='a', condition=1),
+                       SpikeTrain([100., 300.] * pq.ms, t_stop=5 * pq.s,
+                                  name='a', condition=2),
+                       SpikeTrain([1., 2., 2.5, 3., 4.5] * pq.s,
+                                  t_start=1 * pq.s, t_stop=5 * pq.s,
+                                  name='b', condition=1),
+                       SpikeTrain([] * pq.s, t_stop=5 * pq.s,
+                                  name='b', condition=2)]
+        self.pdobj = ep.multi_spiketrains_to_dataframe(self.trains)
+        self.groups = {'a': self.trains[:2], 'b': self.trains[2:]}
+
+    def test__dataframe_isi(self):
+        res = ep.dataframe_isi(self.pdobj)
+
+        self.assertEqual('isi_number', res.index.name)
+        assert_index_equal(self.pdobj.columns, res.columns)
+        for i in range(len(res.columns)):
+            targ = np.diff(self.pdobj.iloc[:, i].dropna().values)
+            assert_array_almost_equal(targ, res.iloc[:, i].dropna().values)
+
+    def test__dataframe_isi__sliced(self):
+        pdobj = ep.slice_spiketrain(self.pdobj, t_start=1.2)
+
+        res = ep.dataframe_isi(pdobj)
+
+        for i in range(len(res.columns)):
+            targ = np.diff(pdobj.iloc[:, i].dropna().values)
+            assert_array_almost_equal(targ, res.iloc[:, i].dropna().values)
+
+    def test__grouped_spike_counts(self):
+        res0 = ep.grouped_spike_counts(self.pdobj)
+        res1 = ep.grouped_spike_counts(self.pdobj, groupby='name')
+        res2 = ep.grouped_spike_counts(self.pdobj,
+                                       groupby=['name', 'condition'])
+
+        self.assertEqual(11, res0)
+        self.assertEqual({'a': 6, 'b': 5}, res1.to_dict())
+        self.assertEqual({('a', 1): 4, ('a', 2): 2,
+                          ('b', 1): 5, ('b', 2): 0}, res2.to_dict())
+
+    def test__grouped_mean_firing_rate(self):
+        res0 = ep.grouped_mean_firing_rate(self.pdobj)
+        res1 = ep.grouped_mean_firing_rate(self.pdobj, groupby='name')
+
+        rates = dict((name, [es.mean_firing_rate(train).rescale(
+            1 / pq.s).magnitude for train in trains])
+            for name, trains in self.groups.items())
+
+        self.assertAlmostEqual(np.mean(rates['a'] + rates['b']), res0)
+        self.assertEqual(['a', 'b'], res1.index.tolist())
+        for name in ['a', 'b']:
+            self.assertAlmostEqual(np.mean(rates[name]), res1[name])
+
+    def test__grouped_cv(self):
+        res0 = ep.grouped_cv(self.pdobj)
+        res1 = ep.grouped_cv(self.pdobj, groupby='name')
+
+        isis = dict((name, np.concatenate(
+            [es.isi(train).rescale('s').magnitude for train in trains]))
+            for name, trains in self.groups.items())
+
+        self.assertAlmostEqual(
+            es.cv(np.concatenate([isis['a'], isis['b']])), res0)
+        for name in ['a', 'b']:
+            self.assertAlmostEqual(es.cv(isis[name]), res1[name])
+
+    def test__grouped_fanofactor(self):
+        res0 = ep.grouped_fanofactor(self.pdobj)
+        res1 = ep.grouped_fanofactor(self.pdobj, groupby='name')
+        res2 = ep.grouped_fanofactor(self.pdobj,
+                                     groupby=['name', 'condition'])
+
+        self.assertAlmostEqual(es.fanofactor(self.trains), res0)
+        for name, trains in self.groups.items():
+            self.assertAlmostEqual(es.fanofactor(trains), res1[name])
+        self.assertTrue(np.isnan(res2[('b', 2)]))
+
+
+@unittest.skipUnless(HAVE_ARROW, 'requires pandas and pyarrow')
+class ArrowTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.obj = [fake_neo('Block', seed=i, n=3) for i in range(2)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def check_roundtrip(self, targ):
+        for file_format in ['arrow', 'parquet']:
+            path = os.path.join(self.tempdir, 'test.' + file_format)
+            ep.dataframe_to_arrow(targ, path, file_format=file_format)
+
+            res0 = ep.arrow_to_dataframe(path)
+            res1 = ep.arrow_to_dataframe(path, memory_map=False)
+
+            assert_frame_equal(targ, res0)
+            assert_frame_equal(targ, res1)
+
+    def test__dataframe_to_arrow__spiketrains(self):
+        targ = ep.multi_spiketrains_to_dataframe(self.obj)
+        self.check_roundtrip(targ)
+
+    def test__dataframe_to_arrow__spiketrain_single(self):
+        obj = fake_neo('SpikeTrain', seed=0, n=5)
+        targ = ep.spiketrain_to_dataframe(obj)
+        self.check_roundtrip(targ)
+
+    def test__dataframe_to_arrow__spiketrains_sliced(self):
+        obj = [SpikeTrain(np.linspace(0, 10, size), units='s', t_stop=10.)
+               for size in [5000, 10000]]
+        targ = ep.slice_spiketrain(ep.multi_spiketrains_to_dataframe(obj),
+                                   t_stop=6.)
+        self.assertTrue(targ.iloc[-1].isnull().all())
+        self.check_roundtrip(targ)
+
+    def test__dataframe_to_arrow__spiketrains_sliced_index(self):
+        obj = [SpikeTrain(np.linspace(0, 10, size), units='s', t_stop=10.)
+               for size in [5, 10]]
+        targ = ep.slice_spiketrain(ep.multi_spiketrains_to_dataframe(obj),
+                                   t_stop=6.)
+        targ.index = pd.Index(np.arange(len(targ.index)) * 2 + 1,
+                              name='spike_number')
+        self.check_roundtrip(targ)
+
+    def test__dataframe_to_arrow__events(self):
+        targ0 = ep.multi_events_to_dataframe(self.obj)
+        targ1 = ep.multi_events_to_dataframe(self.obj, categorical=False)
+        self.check_roundtrip(targ0)
+        self.check_roundtrip(targ1)
+
+    def test__dataframe_to_arrow__epochs(self):
+        targ0 = ep.multi_epochs_to_dataframe(self.obj)
+        targ1 = ep.multi_epochs_to_dataframe(self.obj, categorical=False)
+        self.check_roundtrip(targ0)
+        self.check_roundtrip(targ1)
+
+    def test__arrow_to_dataframe__spiketrains_tidy(self):
+        targ = ep.multi_spiketrains_to_dataframe(self.obj)
+        path = os.path.join(self.tempdir, 'test.arrow')
+        ep.dataframe_to_arrow(targ, path)
+
+        values, objects = ep.arrow_to_dataframe(path, tidy=True)
+
+        self.assertEqual(['times'], values.columns.tolist())
+        self.assertEqual(['train', 'spike_number'], values.index.names)
+        self.assertEqual(targ.notnull().values.sum(), len(values.index))
+        self.assertEqual(list(targ.columns.names), objects.columns.tolist())
+        self.assertEqual(len(targ.columns), len(objects.index))
+
+        # the times are read-only views of the memory-mapped file
+        self.assertFalse(values['times'].values.flags.owndata)
+        self.assertFalse(values['times'].values.flags.writeable)
+
+        for i, column in enumerate(targ.columns):
+            assert_array_equal(targ.iloc[:, i].dropna().values,
+                               values.loc[i, 'times'].values)
+            self.assertEqual(column, tuple(objects.iloc[i]))
+
+    def test__dataframe_to_arrow__format_valueerror(self):
+        targ = ep.multi_spiketrains_to_dataframe(self.obj)
+        path = os.path.join(self.tempdir, 'test.h5')
+        with self.assertRaises(ValueError):
+            ep.dataframe_to_arrow(targ, path, file_format='hdf5')
+
 
 if __name__ == '__main__':
     unittest.main()
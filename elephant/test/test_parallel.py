@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the parallel module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import unittest
+
+from neo.core import Block, Segment, SpikeTrain
+import numpy as np
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+import quantities as pq
+
+from elephant.conversion import binarize
+import elephant.parallel as par
+from elephant.spike_train_array import SpikeTrainArray
+from elephant.statistics import isi, mean_firing_rate
+
+
+def describe(train):
+    """Get the attributes of a SpikeTrain that should reach the workers."""
+    return (train.magnitude.tolist(), train.dimensionality.string,
+            train.t_start.magnitude.item(), train.t_stop.magnitude.item(),
+            train.sampling_rate, train.name, train.annotations)
+
+
+class BalancedChunksTestCase(unittest.TestCase):
+    def test__even(self):
+        res = par._balanced_chunks(np.array([2, 2, 2, 2]), 2)
+        assert_array_equal(res, [0, 2, 4])
+
+    def test__one_long_train(self):
+        res = par._balanced_chunks(np.array([100, 0, 0, 0]), 4)
+        assert_array_equal(res, [0, 1, 4])
+
+    def test__more_chunks_than_trains(self):
+        res = par._balanced_chunks(np.array([1, 1]), 5)
+        assert_array_equal(res, [0, 1, 2])
+
+
+class MapSpiketrainsTestCase(unittest.TestCase):
+    def setUp(self):
+        np.random.seed(0)
+        self.trains = [SpikeTrain(np.sort(np.random.uniform(0, 10, size)),
+                                  units='s', t_stop=10.)
+                       for size in [50, 0, 3, 200, 10, 1, 70]]
+        self.block = Block()
+        for i in range(2):
+            seg = Segment()
+            seg.spiketrains.extend(self.trains[i::2])
+            self.block.segments.append(seg)
+
+    def assert_results_equal(self, res, targ):
+        self.assertEqual(len(res), len(targ))
+        for res_item, targ_item in zip(res, targ):
+            assert_array_almost_equal(res_item, targ_item)
+            self.assertEqual(getattr(res_item, 'units', None),
+                             getattr(targ_item, 'units', None))
+
+    def test__serial(self):
+        targ = [isi(train) for train in self.trains]
+        res = par.map_spiketrains(isi, self.trains, workers=1)
+        self.assert_results_equal(res, targ)
+
+    def test__thread(self):
+        targ = [mean_firing_rate(train) for train in self.trains]
+        res = par.map_spiketrains(mean_firing_rate, self.trains,
+                                  backend='thread', workers=3)
+        self.assert_results_equal(res, targ)
+
+    def test__process(self):
+        targ = [isi(train) for train in self.trains]
+        res = par.map_spiketrains(isi, self.trains, backend='process',
+                                  workers=2)
+        self.assert_results_equal(res, targ)
+
+    def test__kwargs(self):
+        targ = [binarize(train, sampling_rate=10 * pq.Hz)
+                for train in self.trains]
+        for backend in par.BACKENDS:
+            res = par.map_spiketrains(binarize, self.trains, backend=backend,
+                                      workers=2, chunks=3,
+                                      sampling_rate=10 * pq.Hz)
+            self.assert_results_equal(res, targ)
+
+    def test__block(self):
+        targ = [mean_firing_rate(train) for train in
+                self.trains[0::2] + self.trains[1::2]]
+        res = par.map_spiketrains(mean_firing_rate, self.block, workers=2)
+        self.assert_results_equal(res, targ)
+
+    def test__spiketrainarray(self):
+        trains = SpikeTrainArray.from_spiketrains(self.trains)
+        targ = [isi(train) for train in self.trains]
+        for backend in par.BACKENDS:
+            res = par.map_spiketrains(isi, trains, backend=backend,
+                                      workers=2)
+            self.assert_results_equal(res, targ)
+
+    def test__process_attrs(self):
+        trains = [SpikeTrain([1., 2.], units='s', t_stop=3.,
+                             sampling_rate=10 * pq.Hz, name='a', quality=1),
+                  SpikeTrain([1500., 2500.], units='ms', t_start=1000.,
+                             t_stop=3000., name='b', quality=2),
+                  SpikeTrain([], units='ms', t_stop=10.)]
+        targ = par.map_spiketrains(describe, trains, workers=1)
+        res = par.map_spiketrains(describe, trains, backend='process',
+                                  workers=2)
+        self.assertEqual(res, targ)
+        self.assertEqual(res[1][1:3], ('ms', 1000.))
+
+    def test__empty(self):
+        self.assertEqual(par.map_spiketrains(isi, [], workers=2), [])
+
+    def test__backend_valueerror(self):
+        self.assertRaises(ValueError, par.map_spiketrains, isi, self.trains,
+                          backend='gpu')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the pipeline module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import asyncio
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+import threading
+import time
+import unittest
+
+from neo.core import Block, Segment, SpikeTrain
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+import quantities as pq
+
+from elephant.conversion import binarize
+import elephant.pipeline as pl
+from elephant.spike_train_array import SpikeTrainArray
+from elephant.statistics import isi, mean_firing_rate
+
+
+def make_block(path):
+    """Create the Block stored in a fake file."""
+    seed = int(path.split('_')[-1])
+    random = np.random.RandomState(seed)
+    block = Block(name=path)
+    for _ in range(2):
+        seg = Segment()
+        for size in random.randint(0, 20, size=3):
+            seg.spiketrains.append(
+                SpikeTrain(np.sort(random.uniform(0, 5, size)), units='s',
+                           t_stop=5.))
+        block.segments.append(seg)
+    return block
+
+
+def load_array(path):
+    return SpikeTrainArray.from_spiketrains(make_block(path))
+
+
+class FakeIO(object):
+    """Reads Blocks from fake files, keeping track of how many Blocks are
+    loaded but not analyzed yet."""
+
+    def __init__(self, delay=0., fail=None):
+        self.delay = delay
+        self.fail = fail
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.paths = []
+
+    def read_block(self, path):
+        time.sleep(self.delay)
+        if path == self.fail:
+            raise IOError('cannot read %s' % path)
+        with self.lock:
+            self.paths.append(path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        return make_block(path)
+
+    def analyzed(self, result):
+        with self.lock:
+            self.in_flight -= 1
+        return result
+
+
+class ReversingExecutor(Executor):
+    """Holds back the submitted calls until `n` are pending, then runs them
+    in a thread, the last one submitted first.
+
+    This sets the order in which the stages finish without relying on
+    timing.  The calls are only released from the next iteration of the
+    event loop, once `run_in_executor` has attached its callbacks to every
+    future, so the results reach the loop in the order they are set.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.pending = []
+        self.thread = None
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        self.pending.append((future, fn, args, kwargs))
+        if len(self.pending) == self.n:
+            asyncio.get_event_loop().call_soon(self.release)
+        return future
+
+    def release(self):
+        self.thread = threading.Thread(target=self.run)
+        self.thread.start()
+
+    def run(self):
+        for future, fn, args, kwargs in reversed(self.pending):
+            future.set_result(fn(*args, **kwargs))
+
+    def shutdown(self, wait=True):
+        if wait and self.thread is not None:
+            self.thread.join()
+
+
+class PipelineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.paths = ['session_%s' % i for i in range(8)]
+
+    def assert_results_equal(self, res, targ):
+        self.assertEqual(len(res), len(targ))
+        for res_item, targ_item in zip(res, targ):
+            self.assertEqual(len(res_item), len(targ_item))
+            for res_value, targ_value in zip(res_item, targ_item):
+                assert_array_almost_equal(res_value, targ_value)
+
+    def test__ordered(self):
+        fakeio = FakeIO(delay=.005)
+        stage = pl.per_spiketrain(isi)
+        res = pl.run_pipeline(self.paths, stage, loader=fakeio.read_block,
+                              concurrency=3)
+
+        self.assertEqual([source for source, _ in res], self.paths)
+        self.assertEqual(fakeio.paths, self.paths)
+        self.assert_results_equal([result for _, result in res],
+                                  [stage(make_block(path))
+                                   for path in self.paths])
+
+    def test__unordered(self):
+        executor = ReversingExecutor(len(self.paths))
+        res = pl.run_pipeline(self.paths, lambda block: block.name,
+                              loader=make_block,
+                              concurrency=len(self.paths),
+                              executor=executor, ordered=False)
+
+        self.assertEqual(res, list(zip(self.paths, self.paths))[::-1])
+
+    def test__ordered_reversed(self):
+        executor = ReversingExecutor(len(self.paths))
+        res = pl.run_pipeline(self.paths, lambda block: block.name,
+                              loader=make_block,
+                              concurrency=len(self.paths),
+                              executor=executor)
+
+        self.assertEqual(res, list(zip(self.paths, self.paths)))
+
+    def test__stages(self):
+        stages = [pl.per_spiketrain(binarize, sampling_rate=100 * pq.Hz),
+                  lambda res: [arr.sum() for arr in res]]
+        res = pl.run_pipeline(self.paths, stages, loader=make_block,
+                              concurrency=2)
+
+        for path, counts in res:
+            targ = [len(np.unique(np.round(train.magnitude * 100)))
+                    for seg in make_block(path).segments
+                    for train in seg.spiketrains]
+            self.assertEqual(counts, targ)
+
+    def test__backpressure(self):
+        fakeio = FakeIO()
+
+        def stage(block):
+            time.sleep(.02)
+            return fakeio.analyzed(block.name)
+
+        res = pl.run_pipeline(iter(self.paths), stage,
+                              loader=fakeio.read_block, prefetch=1,
+                              concurrency=2)
+
+        self.assertEqual(len(res), len(self.paths))
+        self.assertLessEqual(fakeio.max_in_flight, 3)
+
+    def test__sources(self):
+        blocks = [make_block(path) for path in self.paths[:3]]
+        sources = [blocks[0], lambda: blocks[1], blocks[2].segments[0]]
+        res = pl.run_pipeline(sources, pl.per_spiketrain(mean_firing_rate),
+                              concurrency=2)
+
+        targ = [pl.per_spiketrain(mean_firing_rate)(container)
+                for container in blocks[:2] + [blocks[2].segments[0]]]
+        self.assert_results_equal([result for _, result in res], targ)
+
+    def test__coroutine_loader(self):
+        async def loader(path):
+            await asyncio.sleep(.001)
+            return make_block(path)
+
+        res = pl.run_pipeline(self.paths, lambda block: block.name,
+                              loader=loader, concurrency=2)
+
+        self.assertEqual(res, list(zip(self.paths, self.paths)))
+
+    def test__coroutine_loader_sources(self):
+        async def loader(path):
+            return make_block(path)
+
+        block = make_block(self.paths[0])
+        func = partial(make_block, self.paths[1])
+        sources = [block, func, self.paths[2]]
+        res = pl.run_pipeline(sources, lambda block: block.name,
+                              loader=loader)
+
+        self.assertEqual(res, list(zip(sources, self.paths[:3])))
+
+    def test__process_executor(self):
+        stage = pl.per_spiketrain(isi)
+        executor = ProcessPoolExecutor(max_workers=2)
+        try:
+            res = pl.run_pipeline(self.paths, stage, loader=load_array,
+                                  concurrency=2, executor=executor)
+        finally:
+            executor.shutdown()
+
+        self.assert_results_equal([result for _, result in res],
+                                  [stage(make_block(path))
+                                   for path in self.paths])
+
+    def test__loader_error(self):
+        fakeio = FakeIO(fail=self.paths[3])
+        self.assertRaises(IOError, pl.run_pipeline, self.paths,
+                          pl.per_spiketrain(isi), loader=fakeio.read_block,
+                          concurrency=2)
+
+    def test__stage_error(self):
+        def stage(block):
+            if block.name == 'session_5':
+                raise ZeroDivisionError
+            return block.name
+
+        self.assertRaises(ZeroDivisionError, pl.run_pipeline, self.paths,
+                          stage, loader=make_block, concurrency=2)
+
+    def test__no_loader_typeerror(self):
+        self.assertRaises(TypeError, pl.run_pipeline, self.paths,
+                          pl.per_spiketrain(isi), concurrency=1)
+
+    def test__prefetch_valueerror(self):
+        self.assertRaises(ValueError, pl.run_pipeline, self.paths,
+                          pl.per_spiketrain(isi), loader=make_block,
+                          prefetch=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
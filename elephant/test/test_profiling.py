@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the profiling module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from neo.core import SpikeTrain
+import numpy as np
+
+from elephant import profiling
+from elephant.parallel import map_spiketrains
+from elephant.statistics import isi
+
+
+@profiling.instrument
+def instrumented(values, depth=0):
+    with profiling.stage('inner', len(values)):
+        data = [0] * 10000
+    if depth:
+        instrumented(values, depth - 1)
+    return len(data)
+
+
+@profiling.instrument(name='custom')
+def named():
+    return 1
+
+
+@profiling.instrument(name='sleeping')
+def sleeping(started, ready):
+    started.wait()
+    time.sleep(.05)
+    ready.wait()
+
+
+class ProfilingTestCase(unittest.TestCase):
+    def test__disabled(self):
+        self.assertIsNone(profiling._ACTIVE)
+        self.assertIs(profiling.stage('inner'), profiling._NULL_STAGE)
+        self.assertEqual(instrumented([1, 2]), 10000)
+
+    def test__wraps(self):
+        self.assertEqual(instrumented.__name__, 'instrumented')
+        self.assertEqual(named.__name__, 'named')
+
+    def test__profile(self):
+        with profiling.profile() as prof:
+            instrumented(np.zeros(5))
+            instrumented([1, 2, 3])
+            named()
+
+        self.assertIsNone(profiling._ACTIVE)
+        stats = prof.stats
+        name = '%s.instrumented' % __name__
+        self.assertEqual(sorted(stats), sorted([name, 'inner', 'custom']))
+        self.assertEqual(stats[name]['calls'], 2)
+        self.assertEqual(stats[name]['size'], 8)
+        self.assertEqual(stats['inner']['calls'], 2)
+        self.assertEqual(stats['custom']['calls'], 1)
+        self.assertGreaterEqual(stats[name]['time'], stats['inner']['time'])
+
+    def test__recursion_time_counted_once(self):
+        with profiling.profile() as prof:
+            instrumented([1], depth=2)
+
+        name = '%s.instrumented' % __name__
+        events = [event for event in prof.trace()['traceEvents']
+                  if event['name'] == name]
+        self.assertEqual(prof.stats[name]['calls'], 3)
+        self.assertAlmostEqual(prof.stats[name]['time'],
+                               max(event['dur'] for event in events) / 1e6)
+
+    def test__threads(self):
+        # every thread is inside `sleeping` while the others enter and
+        # leave it, so a shared call stack would take them for recursion
+        started = threading.Event()
+        ready = threading.Event()
+        threads = [threading.Thread(target=sleeping, args=(started, ready))
+                   for _ in range(4)]
+        with profiling.profile() as prof:
+            for thread in threads:
+                thread.start()
+            started.set()
+            time.sleep(.1)
+            ready.set()
+            for thread in threads:
+                thread.join()
+
+        events = prof.trace()['traceEvents']
+        self.assertEqual(prof.stats['sleeping']['calls'], 4)
+        self.assertAlmostEqual(prof.stats['sleeping']['time'],
+                               sum(event['dur'] for event in events) / 1e6)
+        self.assertEqual(len(set(event['tid'] for event in events)), 4)
+
+    def test__map_spiketrains_threads(self):
+        trains = [SpikeTrain(np.arange(size) * .1, units='s', t_stop=100.)
+                  for size in range(1, 40)]
+        with profiling.profile() as prof:
+            map_spiketrains(isi, trains, backend='thread', workers=4)
+
+        stats = prof.stats
+        self.assertEqual(stats['elephant.statistics.isi']['calls'],
+                         len(trains))
+        self.assertEqual(stats['elephant.parallel.map_spiketrains']['calls'],
+                         1)
+
+    def test__exception(self):
+        def fail():
+            raise ValueError
+        fail = profiling.instrument(fail)
+
+        with profiling.profile() as prof:
+            self.assertRaises(ValueError, fail)
+
+        self.assertEqual(list(prof.stats.values())[0]['calls'], 1)
+        self.assertIsNone(profiling._ACTIVE)
+
+    def test__nested_profile(self):
+        with profiling.profile() as prof0:
+            with profiling.profile() as prof1:
+                named()
+            self.assertIs(profiling._ACTIVE, prof0)
+
+        self.assertIs(prof0, prof1)
+
+    @unittest.skipUnless(profiling.tracemalloc, 'requires tracemalloc')
+    def test__memory(self):
+        with profiling.profile(memory=True) as prof:
+            instrumented([1], depth=1)
+
+        stats = prof.stats
+        self.assertGreater(stats['inner']['peak_memory'], 0)
+        self.assertGreaterEqual(stats['%s.instrumented' % __name__]
+                                ['peak_memory'],
+                                stats['inner']['peak_memory'])
+
+    def test__table(self):
+        with profiling.profile() as prof:
+            named()
+
+        lines = prof.table(sort='calls').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].startswith('custom'))
+        self.assertRaises(ValueError, prof.table, sort='spam')
+
+    def test__dump(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'trace.json')
+            with profiling.profile() as prof:
+                named()
+            prof.dump(path)
+            with open(path) as fobj:
+                res = json.load(fobj)
+        finally:
+            shutil.rmtree(tmpdir)
+
+        self.assertEqual(len(res['traceEvents']), 1)
+        self.assertEqual(res['traceEvents'][0]['name'], 'custom')
+        self.assertEqual(res['stats']['custom']['calls'], 1)
+
+    def test__environment(self):
+        env = dict(os.environ)
+        env[profiling.PROFILE_ENV] = '1'
+        script = ('from elephant import profiling\n'
+                  'profiling.instrument(len, name="length")([1])\n')
+
+        output = subprocess.check_output([sys.executable, '-c', script],
+                                         stderr=subprocess.STDOUT, env=env)
+
+        self.assertIn('length', output.decode('UTF8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
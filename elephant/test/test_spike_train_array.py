@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the spike_train_array module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import unittest
+
+from neo.core import Block, Segment, SpikeTrain
+import numpy as np
+from numpy.testing import assert_array_equal
+import quantities as pq
+
+from elephant.spike_train_array import RaggedArray, SpikeTrainArray
+
+
+class RaggedArrayTestCase(unittest.TestCase):
+    def test__segments(self):
+        arr = RaggedArray([1., 2., 3., 4.], [0, 3, 3, 4], units='ms')
+
+        self.assertEqual(len(arr), 3)
+        assert_array_equal(arr.counts, [3, 0, 1])
+        assert_array_equal(arr.segment_index, [0, 0, 0, 2])
+        assert_array_equal(arr.segment_sums(), [6., 0., 4.])
+        assert_array_equal(arr[0], [1., 2., 3.] * pq.ms)
+        assert_array_equal(arr[-1], [4.] * pq.ms)
+        self.assertEqual(len(list(arr)), 3)
+        self.assertEqual(arr.values.dtype, np.dtype('float64'))
+        self.assertEqual(arr.offsets.dtype, np.dtype('int64'))
+
+    def test__no_units(self):
+        arr = RaggedArray([1., 2.], [0, 2])
+
+        self.assertIsNone(arr.units)
+        self.assertFalse(hasattr(arr[0], 'units'))
+
+    def test__invalid_offsets(self):
+        self.assertRaises(ValueError, RaggedArray, [1., 2.], [0, 1])
+        self.assertRaises(ValueError, RaggedArray, [1., 2.], [1, 2])
+        self.assertRaises(ValueError, RaggedArray, [1., 2.], [0, 2, 1, 2])
+        self.assertRaises(ValueError, RaggedArray, [1., 2.], [])
+
+    def test__index_error(self):
+        arr = RaggedArray([1., 2.], [0, 2])
+
+        self.assertRaises(IndexError, arr.__getitem__, 1)
+
+
+class SpikeTrainArrayTestCase(unittest.TestCase):
+    def setUp(self):
+        self.trains = [SpikeTrain([.1, .5], units='s', t_stop=1.),
+                       SpikeTrain([], units='s', t_stop=2.),
+                       SpikeTrain([1500.], units='ms', t_start=1000.,
+                                  t_stop=3000.)]
+
+    def test__from_spiketrains(self):
+        arr = SpikeTrainArray.from_spiketrains(self.trains)
+
+        self.assertEqual(len(arr), 3)
+        assert_array_equal(arr.times, [.1, .5, 1.5])
+        assert_array_equal(arr.offsets, [0, 2, 2, 3])
+        assert_array_equal(arr.t_starts, [0., 0., 1.])
+        assert_array_equal(arr.t_stops, [1., 2., 3.])
+        self.assertEqual(arr.units, pq.s)
+
+    def test__from_spiketrains_units(self):
+        arr = SpikeTrainArray.from_spiketrains(self.trains, units='ms')
+
+        assert_array_equal(arr.times, [100., 500., 1500.])
+        assert_array_equal(arr.t_stops, [1000., 2000., 3000.])
+
+    def test__from_container(self):
+        blk = Block()
+        seg = Segment()
+        blk.segments.append(seg)
+        seg.spiketrains.extend(self.trains)
+
+        arr = SpikeTrainArray.from_spiketrains(blk)
+
+        assert_array_equal(arr.offsets, [0, 2, 2, 3])
+
+    def test__from_spiketrains_empty(self):
+        arr = SpikeTrainArray.from_spiketrains([])
+
+        self.assertEqual(len(arr), 0)
+        self.assertEqual(arr.units, pq.s)
+
+    def test__to_spiketrains(self):
+        arr = SpikeTrainArray.from_spiketrains(self.trains)
+        res = arr.to_spiketrains()
+
+        self.assertEqual(len(res), 3)
+        for train, targ in zip(res, self.trains):
+            self.assertIsInstance(train, SpikeTrain)
+            assert_array_equal(train.rescale('s').magnitude,
+                               targ.rescale('s').magnitude)
+            self.assertEqual(train.t_start, targ.t_start)
+            self.assertEqual(train.t_stop, targ.t_stop)
+
+    def test__invalid_t_starts(self):
+        self.assertRaises(ValueError, SpikeTrainArray, [1.], [0, 1],
+                          [0., 0.], [2.])
+
+
+if __name__ == '__main__':
+    unittest.main()
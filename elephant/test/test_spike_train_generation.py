@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the spike_train_generation module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import unittest
+
+from neo.core import AnalogSignal, SpikeTrain
+import numpy as np
+from numpy.testing import assert_array_equal
+import quantities as pq
+
+import elephant.spike_train_generation as stgen
+
+
+def split_ragged(times, offsets):
+    return [times[start:stop] for start, stop in zip(offsets[:-1],
+                                                     offsets[1:])]
+
+
+class HomogeneousPoissonProcessTestCase(unittest.TestCase):
+    def test__spiketrains(self):
+        res = stgen.homogeneous_poisson_process(10 * pq.Hz, 2 * pq.s,
+                                                t_start=1000 * pq.ms, n=5,
+                                                random_state=0)
+
+        self.assertEqual(len(res), 5)
+        for train in res:
+            self.assertIsInstance(train, SpikeTrain)
+            self.assertEqual(train.units, pq.s)
+            self.assertEqual(train.t_start, 1 * pq.s)
+            self.assertEqual(train.t_stop, 2 * pq.s)
+            self.assertTrue((train.magnitude >= 1).all())
+            self.assertTrue((train.magnitude < 2).all())
+            self.assertTrue((np.diff(train.magnitude) > 0).all())
+
+    def test__as_array(self):
+        times, offsets = stgen.homogeneous_poisson_process(10 * pq.Hz,
+                                                           10 * pq.s, n=20,
+                                                           as_array=True,
+                                                           random_state=0)
+        trains = stgen.homogeneous_poisson_process(10 * pq.Hz, 10 * pq.s,
+                                                   n=20, random_state=0)
+
+        self.assertEqual(offsets.dtype, np.dtype('int64'))
+        self.assertEqual(len(offsets), 21)
+        self.assertEqual(offsets[0], 0)
+        self.assertEqual(offsets[-1], len(times))
+        for train, arr in zip(trains, split_ragged(times, offsets)):
+            assert_array_equal(train.magnitude, arr)
+
+    def test__seed_reproducible(self):
+        res1 = stgen.homogeneous_poisson_process(10 * pq.Hz, 10 * pq.s, n=3,
+                                                 as_array=True,
+                                                 random_state=42)
+        res2 = stgen.homogeneous_poisson_process(10 * pq.Hz, 10 * pq.s, n=3,
+                                                 as_array=True,
+                                                 random_state=42)
+        res3 = stgen.homogeneous_poisson_process(10 * pq.Hz, 10 * pq.s, n=3,
+                                                 as_array=True,
+                                                 random_state=43)
+
+        assert_array_equal(res1[0], res2[0])
+        assert_array_equal(res1[1], res2[1])
+        self.assertFalse(np.array_equal(res1[0], res3[0]))
+
+    def test__random_state_object(self):
+        res1 = stgen.homogeneous_poisson_process(
+            10 * pq.Hz, 10 * pq.s, as_array=True,
+            random_state=np.random.RandomState(1))
+        res2 = stgen.homogeneous_poisson_process(10 * pq.Hz, 10 * pq.s,
+                                                 as_array=True,
+                                                 random_state=1)
+
+        assert_array_equal(res1[0], res2[0])
+
+    def test__rate(self):
+        times, offsets = stgen.homogeneous_poisson_process(20 * pq.Hz,
+                                                           100 * pq.s,
+                                                           n=100,
+                                                           as_array=True,
+                                                           random_state=0)
+
+        rate = len(times) / (100. * 100.)
+        self.assertAlmostEqual(rate, 20., delta=0.5)
+
+    def test__long_trains(self):
+        # the initial guess of the number of intervals must be extended
+        times, offsets = stgen.homogeneous_poisson_process(
+            1000 * pq.Hz, 1 * pq.s, n=500, as_array=True, random_state=0)
+
+        self.assertTrue((times < 1).all())
+        for train in split_ragged(times, offsets):
+            self.assertTrue((np.diff(train) > 0).all())
+
+    def test__dead_time(self):
+        times, offsets = stgen.homogeneous_poisson_process(
+            20 * pq.Hz, 100 * pq.s, n=20, dead_time=10 * pq.ms,
+            as_array=True, random_state=0)
+
+        for train in split_ragged(times, offsets):
+            self.assertTrue((np.diff(train) >= 0.01).all())
+        rate = len(times) / (100. * 20.)
+        self.assertAlmostEqual(rate, 20., delta=1.)
+
+    def test__dead_time_too_long(self):
+        self.assertRaises(ValueError, stgen.homogeneous_poisson_process,
+                          10 * pq.Hz, 10 * pq.s, dead_time=100 * pq.ms)
+
+
+class HomogeneousGammaProcessTestCase(unittest.TestCase):
+    def test__cv(self):
+        times, offsets = stgen.homogeneous_gamma_process(
+            4, 20 * pq.Hz, 100 * pq.s, n=20, as_array=True, random_state=0)
+
+        isis = np.concatenate([np.diff(train)
+                               for train in split_ragged(times, offsets)])
+        self.assertAlmostEqual(isis.std() / isis.mean(), 0.5, delta=0.05)
+        self.assertAlmostEqual(isis.mean(), 0.05, delta=0.002)
+
+    def test__dead_time(self):
+        times, offsets = stgen.homogeneous_gamma_process(
+            2, 20 * pq.Hz, 100 * pq.s, n=20, dead_time=5 * pq.ms,
+            as_array=True, random_state=0)
+
+        isis = np.concatenate([np.diff(train)
+                               for train in split_ragged(times, offsets)])
+        self.assertTrue((isis >= 0.005).all())
+        self.assertAlmostEqual(isis.mean(), 0.05, delta=0.002)
+
+    def test__zero_rate(self):
+        res = stgen.homogeneous_gamma_process(2, 0 * pq.Hz, 10 * pq.s, n=2,
+                                              random_state=0)
+        times, offsets = stgen.homogeneous_poisson_process(
+            0 * pq.Hz, 10 * pq.s, n=3, as_array=True)
+
+        self.assertEqual([len(train) for train in res], [0, 0])
+        self.assertEqual(res[0].t_stop, 10 * pq.s)
+        self.assertEqual(len(times), 0)
+        assert_array_equal(offsets, [0, 0, 0, 0])
+
+    def test__invalid(self):
+        self.assertRaises(ValueError, stgen.homogeneous_gamma_process, 2,
+                          10 * pq.Hz, 1 * pq.s, t_start=2 * pq.s)
+        self.assertRaises(ValueError, stgen.homogeneous_gamma_process, 2,
+                          -10 * pq.Hz, 1 * pq.s)
+
+
+class InhomogeneousPoissonProcessTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rate = AnalogSignal([0., 50., 0., 10.], units='Hz',
+                                 sampling_period=10 * pq.s)
+
+    def test__rate_profile(self):
+        times, offsets = stgen.inhomogeneous_poisson_process(
+            self.rate, n=20, as_array=True, random_state=0)
+
+        self.assertEqual(len(offsets), 21)
+        self.assertEqual(offsets[-1], len(times))
+        counts = np.histogram(times, bins=[0, 10, 20, 30, 40])[0]
+        self.assertEqual(counts[0], 0)
+        self.assertEqual(counts[2], 0)
+        self.assertAlmostEqual(counts[1] / (20 * 10.), 50., delta=2.5)
+        self.assertAlmostEqual(counts[3] / (20 * 10.), 10., delta=1.5)
+
+    def test__spiketrains(self):
+        res = stgen.inhomogeneous_poisson_process(self.rate, n=3,
+                                                  random_state=0)
+
+        self.assertEqual(len(res), 3)
+        for train in res:
+            self.assertEqual(train.t_start, 0 * pq.s)
+            self.assertEqual(train.t_stop, 40 * pq.s)
+
+    def test__dead_time(self):
+        times, offsets = stgen.inhomogeneous_poisson_process(
+            self.rate, n=20, dead_time=30 * pq.ms, as_array=True,
+            random_state=0)
+
+        for train in split_ragged(times, offsets):
+            self.assertTrue((np.diff(train) >= 0.03).all())
+
+    def test__zero_rate(self):
+        rate = AnalogSignal([0., 0.], units='Hz', sampling_period=1 * pq.s)
+        res = stgen.inhomogeneous_poisson_process(rate, n=2, random_state=0)
+
+        self.assertEqual(len(res), 2)
+        self.assertEqual([len(train) for train in res], [0, 0])
+
+    def test__negative_rate(self):
+        rate = AnalogSignal([1., -1.], units='Hz', sampling_period=1 * pq.s)
+        self.assertRaises(ValueError, stgen.inhomogeneous_poisson_process,
+                          rate)
+
+
+class ApplyDeadTimeTestCase(unittest.TestCase):
+    def test__matches_sequential(self):
+        times = np.array([0., .5, 1., 1.2, 1.4, 1.6, 3., 0., .1, .2])
+        offsets = np.array([0, 7, 10])
+
+        res_times, res_offsets = stgen._apply_dead_time(times, offsets, .5)
+
+        assert_array_equal(res_times, [0., .5, 1., 1.6, 3., 0.])
+        assert_array_equal(res_offsets, [0, 5, 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the spike_train_surrogates module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import unittest
+
+from neo.core import SpikeTrain
+import numpy as np
+from numpy.testing import assert_array_almost_equal, assert_array_equal
+import quantities as pq
+
+import elephant.spike_train_surrogates as surr
+from elephant.statistics import fanofactor
+
+
+class SurrogatesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.trains = [SpikeTrain([.1, .25, .5, .9], units='s', t_stop=1.),
+                       SpikeTrain([1100., 1500.], units='ms',
+                                  t_start=1000., t_stop=2000.),
+                       SpikeTrain([], units='s', t_stop=1.)]
+
+    def test__spiketrains(self):
+        res = surr.surrogates(self.trains, n=4, random_state=0)
+
+        self.assertEqual(len(res), 4)
+        for surrogate in res:
+            self.assertEqual(len(surrogate), 3)
+            for train, targ in zip(surrogate, self.trains):
+                self.assertIsInstance(train, SpikeTrain)
+                self.assertEqual(train.units, pq.s)
+                self.assertEqual(train.t_start, targ.t_start)
+                self.assertEqual(train.t_stop, targ.t_stop)
+
+    def test__dither_spikes(self):
+        res = surr.surrogates(self.trains[:1], n=50, dither=20 * pq.ms,
+                              edges=False, random_state=0)
+
+        for surrogate in res:
+            train = surrogate[0].magnitude
+            self.assertEqual(len(train), 4)
+            self.assertTrue((np.diff(train) >= 0).all())
+            self.assertTrue((np.abs(train - self.trains[0].magnitude) <=
+                             .02).all())
+
+    def test__dither_spikes_edges(self):
+        train = SpikeTrain([.001, .5, .999], units='s', t_stop=1.)
+        times, offsets = surr.surrogates([train], n=200, dither=.1 * pq.s,
+                                         output='ragged', random_state=0)
+
+        self.assertTrue((times >= 0).all())
+        self.assertTrue((times <= 1).all())
+        self.assertTrue(len(times) < 600)
+
+    def test__shuffle_isis(self):
+        res = surr.surrogates(self.trains[:1], n=20, method='shuffle_isis',
+                              random_state=0)
+        targ = np.sort(np.diff(np.hstack([0, self.trains[0].magnitude])))
+
+        for surrogate in res:
+            train = surrogate[0].magnitude
+            isis = np.sort(np.diff(np.hstack([0, train])))
+            assert_array_almost_equal(isis, targ)
+            self.assertAlmostEqual(train[-1], .9)
+
+    def test__train_shifting(self):
+        res = surr.surrogates(self.trains, n=20, method='train_shifting',
+                              dither=.3 * pq.s, random_state=0)
+
+        for surrogate in res:
+            for train, targ in zip(surrogate, self.trains):
+                self.assertEqual(len(train), len(targ))
+                self.assertTrue((train >= train.t_start).all())
+                self.assertTrue((train < train.t_stop).all())
+                self.assertTrue((np.diff(train.magnitude) >= 0).all())
+
+    def test__trial_shuffling(self):
+        res = surr.surrogates(self.trains, n=20, method='trial_shuffling',
+                              random_state=0)
+        targs = sorted(tuple(np.round(train.rescale('s').magnitude -
+                                      train.t_start.rescale('s').magnitude,
+                                      9))
+                       for train in self.trains)
+
+        for surrogate in res:
+            trains = sorted(tuple(np.round(train.magnitude -
+                                           train.t_start.magnitude, 9))
+                            for train in surrogate)
+            self.assertEqual(trains, targs)
+
+    def test__trial_shuffling_durations(self):
+        trains = [SpikeTrain([1., 2., 9.], units='s', t_stop=10.),
+                  SpikeTrain([.5], units='s', t_stop=3.)]
+        res = surr.surrogates(trains, n=20, method='trial_shuffling',
+                              random_state=0)
+        times, offsets = surr.surrogates(trains, n=20,
+                                         method='trial_shuffling',
+                                         output='ragged', random_state=0)
+
+        for surrogate in res:
+            for train, targ in zip(surrogate, trains):
+                self.assertEqual(train.t_stop, targ.t_stop)
+                self.assertTrue((train <= train.t_stop).all())
+                self.assertIn(train.magnitude.tolist(),
+                              [[1., 2., 9.], [1., 2.], [.5]])
+        for seg in range(1, 40, 2):
+            self.assertTrue((times[offsets[seg]:offsets[seg+1]] <= 3.).all())
+
+    def test__n_zero(self):
+        res0 = surr.surrogates(self.trains, n=0)
+        times, offsets = surr.surrogates(self.trains, n=0, output='ragged')
+        res1 = surr.surrogates(self.trains, n=0, output='padded')
+
+        self.assertEqual(res0, [])
+        self.assertEqual(len(times), 0)
+        assert_array_equal(offsets, [0])
+        self.assertEqual(res1.shape, (0, 3, 0))
+        self.assertRaises(ValueError, surr.surrogates, self.trains, n=-1)
+
+    def test__ragged_padded(self):
+        trains = surr.surrogates(self.trains, n=3, random_state=0)
+        times, offsets = surr.surrogates(self.trains, n=3, output='ragged',
+                                         random_state=0)
+        padded = surr.surrogates(self.trains, n=3, output='padded',
+                                 random_state=0)
+
+        self.assertEqual(len(offsets), 10)
+        self.assertEqual(padded.shape[:2], (3, 3))
+        for j, surrogate in enumerate(trains):
+            for i, train in enumerate(surrogate):
+                seg = j * 3 + i
+                assert_array_equal(train.magnitude,
+                                   times[offsets[seg]:offsets[seg+1]])
+                row = padded[j, i]
+                assert_array_equal(train.magnitude, row[~np.isnan(row)])
+
+    def test__seed_reproducible(self):
+        res1 = surr.surrogates(self.trains, n=5, output='ragged',
+                               random_state=1)
+        res2 = surr.surrogates(self.trains, n=5, output='ragged',
+                               random_state=1)
+
+        assert_array_equal(res1[0], res2[0])
+        assert_array_equal(res1[1], res2[1])
+
+    def test__processes(self):
+        res = surr.surrogates(self.trains, n=5, output='ragged', processes=2,
+                              random_state=1)
+
+        self.assertEqual(len(res[1]), 16)
+        self.assertEqual(res[1][-1], len(res[0]))
+
+    def test__container(self):
+        res = surr.surrogates({'a': self.trains[:1]}, n=2, random_state=0)
+
+        self.assertEqual(len(res), 2)
+        self.assertEqual(len(res[0]), 1)
+
+    def test__invalid(self):
+        self.assertRaises(ValueError, surr.surrogates, self.trains,
+                          method='spam')
+        self.assertRaises(ValueError, surr.surrogates, self.trains,
+                          output='spam')
+        self.assertRaises(ValueError, surr.surrogates, [])
+
+
+class IterSurrogatesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.trains = [SpikeTrain(np.arange(i + 1) / 10., units='s',
+                                  t_stop=1.) for i in range(5)]
+
+    def test__chunks(self):
+        chunks = list(surr.iter_surrogates(self.trains, n=25, chunk_size=10,
+                                           random_state=0))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        self.assertEqual(len(chunks[0][0]), 5)
+
+    def test__surrogate_statistic(self):
+        res = surr.surrogate_statistic(self.trains, fanofactor, n=25,
+                                       method='shuffle_isis', chunk_size=10,
+                                       random_state=0)
+
+        self.assertEqual(res.shape, (25,))
+        assert_array_almost_equal(res, fanofactor(self.trains))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,7 @@ from numpy.testing.utils import assert_array_almost_equal
 import quantities as pq
 
 import elephant.statistics as es
+from elephant.spike_train_array import RaggedArray, SpikeTrainArray
 
 
 class isi_TestCase(unittest.TestCase):
@@ -301,5 +302,63 @@ class FanoFactorTestCase(unittest.TestCase):
         lst = [self.test_list[0]] * 3
         self.assertEqual(es.fanofactor(lst), 0.0)
 
+class SpikeTrainArrayStatisticsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.trains = [neo.SpikeTrain([.1, .3, .8, 1.], units='s',
+                                      t_stop=2.),
+                       neo.SpikeTrain([], units='s', t_stop=2.),
+                       neo.SpikeTrain([500., 2500.], units='ms',
+                                      t_start=0., t_stop=4000.)]
+        self.arr = SpikeTrainArray.from_spiketrains(self.trains)
+
+    def test__isi(self):
+        res = es.isi(self.arr)
+
+        self.assertIsInstance(res, RaggedArray)
+        self.assertEqual(res.units, pq.s)
+        self.assertEqual(len(res), 3)
+        for intervals, train in zip(res, self.trains):
+            assert_array_almost_equal(intervals,
+                                      es.isi(train).rescale('s'))
+
+    def test__mean_firing_rate(self):
+        res = es.mean_firing_rate(self.arr)
+        targ = [es.mean_firing_rate(train).rescale('1/s').magnitude
+                for train in self.trains]
+
+        self.assertEqual(res.units, 1 / pq.s)
+        assert_array_almost_equal(res.magnitude, targ)
+
+    def test__mean_firing_rate_window(self):
+        res = es.mean_firing_rate(self.arr, t_start=0.2 * pq.s,
+                                  t_stop=1000. * pq.ms)
+
+        assert_array_almost_equal(res.magnitude, [3 / .8, 0., 1 / .8])
+
+    def test__mean_firing_rate_no_units(self):
+        arr = RaggedArray([1., 2., 4.], [0, 2, 3])
+
+        res = es.mean_firing_rate(arr)
+
+        assert_array_almost_equal(res, [1., .25])
+        self.assertRaises(TypeError, es.mean_firing_rate, arr,
+                          t_start=0 * pq.s)
+
+    def test__fanofactor(self):
+        self.assertAlmostEqual(es.fanofactor(self.arr),
+                               es.fanofactor(self.trains))
+
+    def test__cv_isi(self):
+        res = es.cv(es.isi(self.arr))
+        targ = es.cv(es.isi(self.trains[0]).magnitude)
+
+        self.assertAlmostEqual(res[0], targ)
+        self.assertTrue(np.isnan(res[1]))
+        self.assertAlmostEqual(res[2], 0.)
+
+    def test__cv_extra_arguments(self):
+        self.assertRaises(TypeError, es.cv, self.arr, axis=0)
+
+
 if __name__ == '__main__':
     unittest.main()
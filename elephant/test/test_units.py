@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the _units module.
+
+:copyright: Copyright 2014 by the Elephant team, see AUTHORS.txt.
+:license: Modified BSD, see LICENSE.txt for details.
+"""
+
+import unittest
+
+import numpy as np
+from numpy.testing import assert_array_almost_equal
+import quantities as pq
+
+from elephant import _units
+
+
+class RescaleFactorTestCase(unittest.TestCase):
+    def setUp(self):
+        _units._FACTORS.clear()
+        _units._INVERSES.clear()
+
+    def test__rescale_factor(self):
+        self.assertEqual(_units.rescale_factor('s', 'ms'), 1000.)
+        self.assertEqual(_units.rescale_factor(pq.ms, pq.s), .001)
+        self.assertEqual(_units.rescale_factor(pq.s.dimensionality, 's'), 1.)
+
+    def test__rescale_factor__cached(self):
+        _units.rescale_factor(pq.s, pq.ms)
+        key = (pq.s.dimensionality, pq.ms.dimensionality)
+
+        self.assertIn(key, _units._FACTORS)
+        _units._FACTORS[key] = 5.
+        self.assertEqual(_units.rescale_factor(pq.s, pq.ms), 5.)
+
+    def test__rescale_factor__cache_limit(self):
+        for i in range(_units._CACHE_MAX + 1):
+            _units._cache_set(_units._FACTORS, i, 1.)
+
+        self.assertEqual(len(_units._FACTORS), 1)
+
+    def test__rescale_factor__incompatible(self):
+        self.assertRaises(ValueError, _units.rescale_factor, 's', 'm')
+
+    def test__inverse_units(self):
+        self.assertEqual(_units.inverse_units(pq.ms),
+                         (1 / pq.ms).dimensionality)
+
+
+class MagnitudeTestCase(unittest.TestCase):
+    def test__quantity(self):
+        res = _units.magnitude([1., 2.] * pq.s, pq.ms)
+
+        self.assertFalse(isinstance(res, pq.Quantity))
+        assert_array_almost_equal(res, [1000., 2000.])
+
+    def test__same_units__no_copy(self):
+        value = [1., 2.] * pq.ms
+
+        res = _units.magnitude(value, pq.ms)
+
+        self.assertTrue(np.may_share_memory(res, value))
+
+    def test__plain(self):
+        value = np.array([1., 2.])
+
+        self.assertIs(_units.magnitude(value, pq.ms), value)
+
+    def test__inverse_magnitude(self):
+        self.assertAlmostEqual(_units.inverse_magnitude(10 * pq.Hz, pq.ms),
+                               100.)
+        self.assertAlmostEqual(_units.inverse_magnitude(10 * pq.kHz, pq.s),
+                               .0001)
+        self.assertAlmostEqual(_units.inverse_magnitude(10., pq.ms), .1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ install_requires = ['neo>=0.3.3',
                     'quantities>=0.9.0',
                     'scipy>=0.11.0']
 extras_require = {'pandas': ['pandas>=0.14.0'],
+                  'arrow': ['pandas>=0.14.0', 'pyarrow>=0.17.0'],
                   'docs': ['numpydoc==0.5',
                            'sphinx==1.2.2'],
                   'tests': ['nose==1.3.3']}
@@ -21,7 +22,8 @@ setup(
 
     author="Elephant authors and contributors",
     author_email="andrew.davison@unic.cnrs-gif.fr",
-    description="Elephant is a package for analysis of electrophysiology data in Python",
+    description=("Elephant is a package for analysis of "
+                 "electrophysiology data in Python"),
     long_description=long_description,
     license="BSD",
     url='http://neuralensemble.org/elephant',